@@ -8,8 +8,14 @@ import conferencing.routing
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "SignMeet.settings")
 
+django_asgi_app = get_asgi_application()
+
+# Load and warm the sign models off the request path; /healthz/ready reports progress
+from conferencing.services import start_background_warmup
+start_background_warmup()
+
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(conferencing.routing.websocket_urlpatterns)
     ),
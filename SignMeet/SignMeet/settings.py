@@ -78,6 +78,181 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Sign detection micro-batching (see conferencing/batching.py)
+# Requests wait at most SIGN_BATCH_MAX_WAIT_MS for others to join a batch;
+# raise it (or the batch size) for throughput, lower it for latency.
+SIGN_BATCH_MAX_SIZE = 8
+SIGN_BATCH_MAX_WAIT_MS = 10
+SIGN_BATCH_QUEUE_DEPTH = 64
+
+# Threads running SignDetectionConsumer inference off the event loop
+SIGN_WS_INFERENCE_WORKERS = 2
+
+# Per-stream MediaPipe trackers for frames sent with a stream id
+SIGN_TRACKER_MAX_STREAMS = 256
+SIGN_TRACKER_TTL_SECONDS = 30
+
+# Landmark-vector fast path (train with `manage.py train_landmark_classifier`).
+# Frames below SIGN_LANDMARK_CONFIDENCE fall back to the 224x224 CNN.
+SIGN_LANDMARK_MODEL_PATH = "ml_models/landmark_mlp.npz"
+SIGN_LANDMARK_CONFIDENCE = 0.9
+
+# Per-stream letter decoder: a letter is emitted once it wins
+# SIGN_DECODER_MIN_VOTES of the last SIGN_DECODER_WINDOW frames; the same
+# letter repeats only after SIGN_DECODER_IDLE_FRAMES frames without a hand.
+SIGN_DECODER_WINDOW = 6
+SIGN_DECODER_MIN_VOTES = 4
+SIGN_DECODER_MIN_CONFIDENCE = 60.0
+SIGN_DECODER_IDLE_FRAMES = 4
+
+# Frame-change gating: mean absolute difference (0-255) between 16x16
+# grayscale thumbnails below which the previous result is reused.
+# 0 disables gating. Cached results are refreshed after the max age.
+SIGN_FRAME_DIFF_THRESHOLD = 3.0
+SIGN_FRAME_CACHE_MAX_AGE_SECONDS = 2.0
+
+# JPEG frames larger than needed are decoded at 1/2, 1/4 or 1/8 scale while
+# the shorter side stays >= this many pixels.
+SIGN_DECODE_MIN_SIDE = 320
+
+# Inference runtime per model (ml_models/engines.py). backend is one of
+# 'keras', 'savedmodel', 'tflite', 'onnx', 'torchscript' ('pytorch' = eager
+# .pth, wlasl only); optional 'num_threads'. Produce the artifacts with
+# `python manage.py export_models`.
+SIGN_MODEL_ENGINES = {
+    'sign_classifier': {'backend': 'keras', 'path': 'ml_models/best_sign_model.h5'},
+    'wlasl': {
+        'backend': 'pytorch',
+        'path': str(BASE_DIR / 'ml_models' / 'asl_detection' / 'mobilenetv2_asl_trained_improved.pth'),
+    },
+}
+
+# Model registry: heavy models load on first use, or in a background warm-up
+# thread started by asgi.py / wsgi.py (None warms everything registered).
+# /healthz/ready returns 200 only once SIGN_READY_MODELS are loaded and warmed.
+# A model that failed to load (or is absent) is retried on first use after
+# SIGN_MODEL_RETRY_SECONDS.
+SIGN_WARMUP_ON_START = True
+SIGN_WARMUP_MODELS = ['sign_classifier', 'hand_detector', 'landmark_classifier', 'sign_recognizer', 'wlasl']
+SIGN_READY_MODELS = ['sign_classifier', 'hand_detector', 'sign_recognizer']
+SIGN_MODEL_RETRY_SECONDS = 30
+
+# Out-of-process inference: `python manage.py run_inference_service` runs
+# SIGN_INFERENCE_SERVICE_WORKERS processes (ports PORT..PORT+N-1) that own the
+# models. When enabled, web workers load none and hand decoded frames over
+# shared-memory ring slots (SIGN_INFERENCE_SLOTS per web process).
+SIGN_INFERENCE_SERVICE_ENABLED = os.getenv('SIGN_INFERENCE_SERVICE_ENABLED', '0') == '1'
+SIGN_INFERENCE_SERVICE_HOST = '127.0.0.1'
+SIGN_INFERENCE_SERVICE_PORT = 6100
+SIGN_INFERENCE_SERVICE_WORKERS = 2
+SIGN_INFERENCE_SERVICE_AUTHKEY = SECRET_KEY.encode()
+SIGN_INFERENCE_SLOTS = 8
+SIGN_INFERENCE_SLOT_BYTES = 1920 * 1080 * 3
+SIGN_INFERENCE_TIMEOUT_SECONDS = 5.0
+
+# Sense Bot chat: one history per user (Django session or X-Chat-Session-Id),
+# trimmed to the last SENSE_CHAT_MAX_TURNS exchanges and about
+# SENSE_CHAT_MAX_HISTORY_TOKENS tokens, so the prompt size stays flat. Idle
+# sessions expire; the least recently used are evicted past the session or
+# total-size caps.
+SENSE_CHAT_MAX_SESSIONS = 1000
+SENSE_CHAT_SESSION_TTL_SECONDS = 1800
+SENSE_CHAT_MAX_TURNS = 10
+SENSE_CHAT_MAX_HISTORY_TOKENS = 2000
+SENSE_CHAT_MAX_TOTAL_CHARS = 4_000_000
+
+# Chat views are async: at most SENSE_CHAT_MAX_INFLIGHT Gemini calls run at
+# once, a message waits up to SENSE_CHAT_QUEUE_TIMEOUT_SECONDS for a slot
+# before a 503 with Retry-After, and a call that exceeds
+# SENSE_CHAT_TIMEOUT_SECONDS gets a 504. Chat load then never holds the
+# worker threads that sign detection runs on.
+SENSE_CHAT_MAX_INFLIGHT = 8
+SENSE_CHAT_QUEUE_TIMEOUT_SECONDS = 0.5
+SENSE_CHAT_TIMEOUT_SECONDS = 20.0
+SENSE_CHAT_RETRY_AFTER_SECONDS = 2
+
+# Sense Bot FAQ front end: replies are cached by normalized question for
+# SENSE_CHAT_CACHE_TTL_SECONDS, and a question whose BM25 match against the
+# KNOWLEDGE bullets scores at least SENSE_FAQ_MIN_SCORE (0-1), ahead of the
+# runner-up by SENSE_FAQ_MIN_MARGIN, is answered locally. Hit ratio is on
+# /chat/stats/ and in signmeet_chat_replies_total.
+SENSE_FAQ_ENABLED = os.getenv('SENSE_FAQ_ENABLED', '1') == '1'
+SENSE_FAQ_MIN_SCORE = 0.6
+SENSE_FAQ_MIN_MARGIN = 0.08
+SENSE_CHAT_CACHE_SIZE = 2048
+SENSE_CHAT_CACHE_TTL_SECONDS = 3600
+
+# TTS audio store, keyed by a hash of (text, source/target language, voice):
+# a memory tier in front of a disk tier under TTS_CACHE_DIR, each
+# byte-capped with LRU eviction; disk clips unused for
+# TTS_CACHE_DISK_TTL_SECONDS are deleted. Clips are served by that hash
+# (with Range support) and it is their ETag. process_caption also inlines
+# clips up to TTS_INLINE_MAX_BYTES. Hit ratio and bytes saved are on
+# /api/tts/stats/.
+MEDIA_ROOT = BASE_DIR / 'media'
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', str(MEDIA_ROOT / 'tts'))
+TTS_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+TTS_CACHE_DISK_BYTES = 512 * 1024 * 1024
+TTS_CACHE_DISK_TTL_SECONDS = 7 * 24 * 3600
+TTS_INLINE_MAX_BYTES = 16 * 1024
+TTS_HTTP_MAX_AGE_SECONDS = 86400
+
+# Multi-sentence TTS is split into chunks of up to TTS_CHUNK_CHARS (the first
+# sentence alone, so audio starts early) and synthesized on a pool of
+# TTS_SYNTH_WORKERS threads, at most TTS_CHUNK_PARALLELISM chunks per request.
+# /api/dynamic_tts/ streams the chunks in order as they are ready.
+TTS_CHUNK_CHARS = 200
+TTS_CHUNK_PARALLELISM = 3
+TTS_SYNTH_WORKERS = 8
+
+# TTS engine per language (conferencing/tts_backends.py): 'gtts' (network),
+# 'espeak' (local espeak-ng + lameenc) or 'stub' (silent clips, no network).
+# Keys are language codes ('pt-br', then 'pt') or 'default'. With a
+# 'fallback', a primary that errors or exceeds 'budget_seconds' is replaced
+# by the fallback and skipped for 'cooldown_seconds'. The fallback is only
+# used if its dependencies are installed (espeak: espeak-ng and lameenc);
+# otherwise the primary runs alone. TTS_BACKEND=stub with
+# TRANSLATION_BACKEND=identity runs the TTS endpoints offline.
+TTS_BACKEND = os.getenv('TTS_BACKEND', 'gtts')
+TTS_BACKENDS = {
+    'default': {'backend': TTS_BACKEND, 'fallback': 'espeak', 'budget_seconds': 1.5, 'cooldown_seconds': 30},
+}
+
+# Translation (googletrans): results cached per (text, source, dest) for
+# TRANSLATION_CACHE_TTL_SECONDS; cache misses for one language go upstream
+# joined into requests of up to TRANSLATION_MAX_BATCH_CHARS, through a pool
+# of TRANSLATION_POOL_SIZE reused clients. TRANSLATION_BACKEND is
+# 'googletrans' or 'identity' (text returned untranslated, no network).
+TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND', 'googletrans')
+TRANSLATION_CACHE_SIZE = 10000
+TRANSLATION_CACHE_TTL_SECONDS = 86400
+TRANSLATION_MAX_BATCH_CHARS = 4500
+TRANSLATION_POOL_SIZE = 4
+
+# Room fan-out (/ws/sign/<room>/, see conferencing/rooms.py): signs and
+# captions published to a room within SIGN_ROOM_TICK_SECONDS go out as one
+# group message; longer ticks mean fewer messages but later captions.
+SIGN_ROOM_TICK_SECONDS = 0.1
+SIGN_ROOM_MAX_TEXT_CHARS = 200
+
+# Logging: key=value messages on stderr. Per-frame/per-message lines are
+# DEBUG, so the default INFO level keeps the hot path quiet; set
+# SIGNMEET_LOG_LEVEL=DEBUG to see them. Metrics are served at /metrics.
+SIGNMEET_LOG_LEVEL = os.getenv('SIGNMEET_LOG_LEVEL', 'INFO')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'keyvalue': {'format': 'ts=%(asctime)s level=%(levelname)s logger=%(name)s msg="%(message)s"'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'keyvalue'},
+    },
+    'loggers': {
+        'conferencing': {'handlers': ['console'], 'level': SIGNMEET_LOG_LEVEL, 'propagate': False},
+        'ml_models': {'handlers': ['console'], 'level': SIGNMEET_LOG_LEVEL, 'propagate': False},
+    },
+}
 
  
 # Allowed hosts for development
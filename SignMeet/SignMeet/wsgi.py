@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SignMeet.settings')
 
 application = get_wsgi_application()
+
+# Load and warm the sign models off the request path; /healthz/ready reports progress
+from conferencing.services import start_background_warmup
+start_background_warmup()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: legacy PIL preprocessing vs ml_models.preprocessing.
+
+Run from the SignMeet directory:
+
+    python benchmarks/bench_preprocessing.py [--repeat 500]
+
+Only needs NumPy, Pillow and OpenCV (no models are loaded).
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ml_models.preprocessing import (  # noqa: E402
+    crop_square_resize, imagenet_chw, landmark_bbox, to_unit_float,
+)
+
+
+# --- Legacy paths, as they were in conferencing/views.py and wlasl_detection.py ---
+def squarify_image(pil_img):
+    width, height = pil_img.size
+    new_size = max(width, height)
+    new_im = Image.new("RGB", (new_size, new_size), (0, 0, 0))
+    new_im.paste(pil_img, ((new_size - width) // 2, (new_size - height) // 2))
+    return new_im
+
+
+def legacy_keras(frame_rgb, points):
+    original_pil_image = Image.fromarray(frame_rgb).convert('RGB')
+    img_height, img_width, _ = frame_rgb.shape
+    x_coords = [x * img_width for x in points[:, 0]]
+    y_coords = [y * img_height for y in points[:, 1]]
+    padding = 20
+    x_min = max(0, int(min(x_coords)) - padding)
+    y_min = max(0, int(min(y_coords)) - padding)
+    x_max = min(img_width, int(max(x_coords)) + padding)
+    y_max = min(img_height, int(max(y_coords)) + padding)
+    cropped = original_pil_image.crop((x_min, y_min, x_max, y_max))
+    square = squarify_image(cropped).resize((224, 224))
+    img_array = np.asarray(square, dtype=np.float32)  # img_to_array
+    return np.expand_dims(img_array / 255.0, axis=0)
+
+
+def legacy_imagenet(frame):
+    frame_resized = cv2.resize(frame, (224, 224), interpolation=cv2.INTER_AREA)
+    mean = np.array([0.485, 0.456, 0.406])
+    std = np.array([0.229, 0.224, 0.225])
+    return (frame_resized.astype(np.float32) / 255.0 - mean) / std
+
+
+# --- New paths ---
+def shared_keras(frame_rgb, points):
+    h, w, _ = frame_rgb.shape
+    return to_unit_float(crop_square_resize(frame_rgb, landmark_bbox(points, w, h), 224))
+
+
+def shared_imagenet(frame):
+    return imagenet_chw(frame, 224)
+
+
+def timeit(fn, args, repeat):
+    for _ in range(10):
+        fn(*args)
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        samples[i] = time.perf_counter() - started
+    return np.percentile(samples, 50) * 1e6, np.percentile(samples, 95) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Landmarks spread over a hand-sized box in the middle of the frame
+    points = np.column_stack([rng.uniform(0.35, 0.6, 21), rng.uniform(0.3, 0.7, 21)]).astype(np.float32)
+
+    print(f"{'case':<34}{'legacy p50':>12}{'new p50':>12}{'speedup':>9}   (us, p95 in brackets)")
+    for side in (224, 480, 720):
+        frame = rng.integers(0, 256, (side, side, 3), dtype=np.uint8)
+        for name, legacy, shared, fn_args in (
+            ('crop/square/resize/[0,1]', legacy_keras, shared_keras, (frame, points)),
+            ('resize/imagenet-normalize', legacy_imagenet, shared_imagenet, (frame,)),
+        ):
+            old50, old95 = timeit(legacy, fn_args, args.repeat)
+            new50, new95 = timeit(shared, fn_args, args.repeat)
+            print(
+                f"{name + f' @{side}':<34}{old50:>8.1f} [{old95:.0f}]{new50:>8.1f} [{new95:.0f}]"
+                f"{old50 / new50:>8.1f}x"
+            )
+
+    # JPEG decode: full vs reduced scale for a 1280x720 camera frame
+    frame = rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+    frame = cv2.GaussianBlur(frame, (0, 0), 3)
+    encoded = cv2.imencode('.jpg', frame)[1]
+    full50, full95 = timeit(cv2.imdecode, (encoded, cv2.IMREAD_COLOR), args.repeat // 5 or 1)
+    red50, red95 = timeit(cv2.imdecode, (encoded, cv2.IMREAD_REDUCED_COLOR_2), args.repeat // 5 or 1)
+    print(f"{'jpeg decode 1280x720 full vs 1/2':<34}{full50:>8.1f} [{full95:.0f}]{red50:>8.1f} [{red95:.0f}]"
+          f"{full50 / red50:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+Stage-level benchmark of the detect_sign path.
+
+Run from the SignMeet directory:
+
+    python benchmarks/run_benchmarks.py [--out benchmarks/results/$(git rev-parse --short HEAD).json]
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+
+Times each stage separately (base64 decode, PIL/cv2 image decode, MediaPipe
+`process`, crop/squarify/resize, classifier predict, JSON encode) on
+synthetic frames and ml_models/asl_detection/A_test.jpg at several
+resolutions, plus the classifier at several batch sizes. Every case is
+warmed up first and reports p50/p95/p99 latency and throughput. MediaPipe
+and the classifier are skipped (and listed as skipped) when unavailable.
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from conferencing.decoding import decode_image_bytes  # noqa: E402
+from ml_models.pipeline import LandmarkCrop  # noqa: E402
+from ml_models.preprocessing import to_unit_float  # noqa: E402
+
+SAMPLE_IMAGE = os.path.join(ROOT, 'ml_models', 'asl_detection', 'A_test.jpg')
+RESOLUTIONS = ((320, 240), (640, 480), (1280, 720))
+
+
+def measure(fn, args=(), repeat=200, warmup=10, items=1):
+    """p50/p95/p99 in ms and throughput (items/s) over `repeat` timed calls."""
+    for _ in range(warmup):
+        fn(*args)
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        samples[i] = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(samples, (50, 95, 99)) * 1000.0
+    return {
+        'p50_ms': round(float(p50), 4),
+        'p95_ms': round(float(p95), 4),
+        'p99_ms': round(float(p99), 4),
+        'mean_ms': round(float(samples.mean() * 1000.0), 4),
+        'throughput_per_s': round(items / float(samples.mean()), 2),
+        'repeat': repeat,
+    }
+
+
+# --- Inputs ---
+def synthetic_frame(width, height, seed=0):
+    # Blurred noise compresses like a camera frame rather than pure noise
+    noise = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 3)
+
+
+def sample_frame(width, height):
+    image = cv2.imread(SAMPLE_IMAGE)
+    if image is None:
+        return None
+    return cv2.resize(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), (width, height), interpolation=cv2.INTER_AREA)
+
+
+def frames():
+    for width, height in RESOLUTIONS:
+        yield f"synthetic@{width}x{height}", synthetic_frame(width, height)
+        frame = sample_frame(width, height)
+        if frame is not None:
+            yield f"A_test@{width}x{height}", frame
+
+
+def centre_landmarks():
+    """21 landmarks spread over a hand-sized box, for frames MediaPipe finds no hand in."""
+    rng = np.random.default_rng(0)
+    return np.column_stack([
+        rng.uniform(0.35, 0.6, 21), rng.uniform(0.3, 0.7, 21), np.zeros(21),
+    ]).astype(np.float32)
+
+
+# --- Optional heavy stages ---
+def load_hands():
+    try:
+        import mediapipe as mp
+    except ImportError as e:
+        return None, f"mediapipe not installed ({e})"
+    return mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1, min_detection_confidence=0.5), None
+
+
+def load_classifier(backend, path):
+    if not os.path.exists(path):
+        return None, f"model not found: {path}"
+    try:
+        from ml_models.engines import load_engine
+        return load_engine(backend, path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def decode_pil(data):
+    from PIL import Image
+    return np.asarray(Image.open(io.BytesIO(data)).convert('RGB'))
+
+
+# --- Runner ---
+def run(args):
+    results = {'stages': {}, 'skipped': {}}
+
+    def record(stage, case, stats):
+        results['stages'].setdefault(stage, {})[case] = stats
+        print(f"  {stage:<20}{case:<26}p50 {stats['p50_ms']:>9.3f}  p95 {stats['p95_ms']:>9.3f}  "
+              f"p99 {stats['p99_ms']:>9.3f} ms  {stats['throughput_per_s']:>10.1f}/s")
+
+    hands, reason = load_hands()
+    if hands is None:
+        results['skipped']['mediapipe_process'] = reason
+    classifier, reason = load_classifier(args.backend, args.model)
+    if classifier is None:
+        results['skipped']['classifier_predict'] = reason
+
+    crop = LandmarkCrop(size=224, padding=20)
+    repeat = args.repeat
+    for case, frame in frames():
+        print(case)
+        jpeg = cv2.imencode('.jpg', cv2.cvtColor(frame, cv2.COLOR_RGB2BGR), [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+        data_url = 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode()
+
+        record('base64_decode', case, measure(lambda: base64.b64decode(data_url.split(';base64,', 1)[1]), repeat=repeat))
+        record('pil_decode', case, measure(decode_pil, (jpeg,), repeat=repeat))
+        record('cv2_decode', case, measure(decode_image_bytes, (jpeg,), repeat=repeat))
+        record('cv2_decode_reduced', case, measure(decode_image_bytes, (jpeg, 224), repeat=repeat))
+
+        points = centre_landmarks()
+        if hands is not None:
+            record('mediapipe_process', case, measure(hands.process, (frame,), repeat=max(1, repeat // 4)))
+            detected = hands.process(frame).multi_hand_landmarks
+            if detected:
+                points = np.array([(lm.x, lm.y, lm.z) for lm in detected[0].landmark], dtype=np.float32)
+        record('crop_resize', case, measure(lambda: to_unit_float(crop(frame, points)), repeat=repeat))
+
+        response = {'label': 'A', 'confidence': 97.31, 'path': 'cnn', 'cached': False,
+                    'emit': 'A', 'state': 'holding'}
+        record('json_encode', case, measure(json.dumps, (response,), repeat=repeat))
+
+    if classifier is not None:
+        print(f"classifier ({args.backend}: {args.model})")
+        sample = to_unit_float(crop(synthetic_frame(640, 480), centre_landmarks())).copy()
+        for batch_size in args.batch_sizes:
+            batch = np.repeat(sample[np.newaxis], batch_size, axis=0)
+            record('classifier_predict', f"batch={batch_size}",
+                   measure(classifier.predict_batch, (batch,), repeat=max(1, repeat // 4), warmup=3, items=batch_size))
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(old_path, new_path):
+    """Print the p50 ratio (new / old) for every stage and case present in both runs."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old['environment'].get('commit')} -> {new['environment'].get('commit')}  (p50 ms, new/old)")
+    for stage, cases in new['stages'].items():
+        for case, stats in cases.items():
+            before = old['stages'].get(stage, {}).get(case)
+            if before:
+                ratio = stats['p50_ms'] / before['p50_ms'] if before['p50_ms'] else float('nan')
+                print(f"  {stage:<20}{case:<26}{before['p50_ms']:>9.3f} -> {stats['p50_ms']:>9.3f}  {ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='Timed calls per case')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--backend', default='keras', help='Inference backend (ml_models/engines.py)')
+    parser.add_argument('--model', default=os.path.join(ROOT, 'ml_models', 'best_sign_model.h5'))
+    parser.add_argument('--out', help='Write the results as JSON to this path')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Diff two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = {'environment': environment(), **run(args)}
+    for stage, reason in results['skipped'].items():
+        print(f"skipped {stage}: {reason}")
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
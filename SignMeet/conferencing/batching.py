@@ -0,0 +1,134 @@
+# SignMeet/conferencing/batching.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class BatchQueueFull(Exception):
+    """Raised when the scheduler already holds `max_queue_depth` pending samples."""
+
+
+class BatchScheduler:
+    """
+    Micro-batching front for a model's predict call.
+
+    Callers submit one preprocessed sample at a time; a single worker thread
+    collects samples until either `max_batch_size` is reached or the oldest
+    sample has waited `max_wait_ms`, runs one batched forward pass and hands
+    every caller its own row of the output.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait_ms=10, max_queue_depth=64, name="model"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue_depth = max(1, int(max_queue_depth))
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=self.max_queue_depth)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._samples = 0
+        self._rejected = 0
+        self._errors = 0
+        self._full_batches = 0
+        self._wait_seconds = 0.0
+        self._predict_seconds = 0.0
+        self._max_batch_seen = 0
+
+    # --- Public API ---
+    def submit(self, sample):
+        """Queue a single sample (no batch axis) and return a Future for its output row."""
+        self._ensure_worker()
+        future = Future()
+        try:
+            self._queue.put_nowait((sample, future, time.monotonic()))
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            raise BatchQueueFull(f"{self.name} batch queue is full ({self.max_queue_depth} pending)")
+        return future
+
+    def predict(self, sample, timeout=None):
+        """Blocking helper: submit a sample and wait for its prediction."""
+        return self.submit(sample).result(timeout=timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            batches = self._batches
+            samples = self._samples
+            return {
+                'name': self.name,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': round(self.max_wait * 1000.0, 3),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_depth': self._queue.qsize(),
+                'batches': batches,
+                'samples': samples,
+                'rejected': self._rejected,
+                'errors': self._errors,
+                'full_batches': self._full_batches,
+                'max_batch_seen': self._max_batch_seen,
+                'avg_batch_size': round(samples / batches, 3) if batches else 0.0,
+                'avg_queue_wait_ms': round(self._wait_seconds * 1000.0 / samples, 3) if samples else 0.0,
+                'avg_predict_ms': round(self._predict_seconds * 1000.0 / batches, 3) if batches else 0.0,
+            }
+
+    # --- Worker ---
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name=f"{self.name}-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # Deadline passed: still drain whatever is already queued.
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            started = time.monotonic()
+            try:
+                inputs = np.stack([sample for sample, _, _ in batch])
+                outputs = self.predict_fn(inputs)
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finished = time.monotonic()
+
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+
+            with self._stats_lock:
+                self._batches += 1
+                self._samples += len(batch)
+                self._predict_seconds += finished - started
+                self._wait_seconds += sum(started - queued_at for _, _, queued_at in batch)
+                self._max_batch_seen = max(self._max_batch_seen, len(batch))
+                if len(batch) == self.max_batch_size:
+                    self._full_batches += 1
@@ -0,0 +1,40 @@
+# SignMeet/conferencing/caching.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Key -> value, LRU-bounded with a TTL. Used for chat replies
+    (normalized question -> reply) and translations
+    ((text, source, dest) -> translation).
+    """
+
+    def __init__(self, max_entries=2048, ttl_seconds=3600):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
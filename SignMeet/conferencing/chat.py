@@ -0,0 +1,349 @@
+# SignMeet/conferencing/chat.py
+import asyncio
+import threading
+from collections import deque
+from contextlib import aclosing, asynccontextmanager
+
+from .metrics import CHAT_ERRORS, CHAT_HISTORY_CHARS, CHAT_INFLIGHT, CHAT_SESSIONS, track_outbound
+from .streams import StreamStore
+
+# Rough English average; only used to keep prompts under a budget
+CHARS_PER_TOKEN = 4
+
+
+class LoopSafeSemaphore:
+    """
+    An asyncio-style semaphore that may be shared by coroutines on different
+    event loops. Under WSGI, async views run through async_to_sync on one
+    loop per request, so an asyncio.Lock/Semaphore created at import fails
+    ("bound to a different event loop"). Here a threading.Lock guards the
+    count, and each waiter is woken on its own loop with
+    call_soon_threadsafe.
+
+        async with semaphore: ...
+        await semaphore.acquire(timeout=0.5)   # asyncio.TimeoutError on expiry
+    """
+
+    def __init__(self, value=1):
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters = deque()  # (loop, future), first come first served
+
+    def locked(self):
+        return self._value == 0
+
+    async def acquire(self, timeout=None):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        future = waiter[1]
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    queued = True
+                except ValueError:
+                    queued = False
+            if not queued and future.done() and not future.cancelled():
+                # Granted just as we gave up: pass the slot on
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, future)
+                    return
+                except RuntimeError:
+                    # That waiter's loop has closed; try the next one
+                    continue
+            self._value += 1
+
+    def _wake(self, future):
+        # Runs on the waiter's loop; a waiter that gave up meanwhile hands the slot on
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class ChatHistory:
+    """
+    One user's conversation with Sense Bot, kept to at most `max_turns`
+    user/bot exchanges and `max_tokens` (approximate) of text. The oldest
+    exchanges are dropped first, so the prompt sent upstream stays bounded
+    however long the session lives.
+    """
+
+    def __init__(self, max_turns=10, max_tokens=2000):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.turns = deque()  # (user_text, bot_text)
+        self.chars = 0
+        # Serializes one user's messages, whichever event loop each arrives on
+        self.lock = LoopSafeSemaphore(1)
+
+    def contents(self, message):
+        """Gemini `contents` for the next request: trimmed history + the new message."""
+        contents = []
+        for user_text, bot_text in self.turns:
+            contents.append({'role': 'user', 'parts': [user_text]})
+            contents.append({'role': 'model', 'parts': [bot_text]})
+        contents.append({'role': 'user', 'parts': [message]})
+        return contents
+
+    def append(self, user_text, bot_text):
+        self.turns.append((user_text, bot_text))
+        self.chars += len(user_text) + len(bot_text)
+        while self.turns and (
+            len(self.turns) > self.max_turns or self.chars > self.max_tokens * CHARS_PER_TOKEN
+        ):
+            self.drop_oldest()
+
+    def drop_oldest(self):
+        user_text, bot_text = self.turns.popleft()
+        self.chars -= len(user_text) + len(bot_text)
+
+    def clear(self):
+        self.turns.clear()
+        self.chars = 0
+
+
+class ChatBusy(Exception):
+    """Every upstream slot stayed taken for the whole queue wait."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Sense Bot is busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ChatTimeout(Exception):
+    """Gemini did not answer within the per-call deadline."""
+
+
+class UpstreamLimiter:
+    """
+    Caps concurrent Gemini calls at `max_inflight`. A caller waits at most
+    `queue_timeout` seconds for a slot before ChatBusy, and each call gets
+    `timeout` seconds in total before ChatTimeout, so a slow upstream
+    costs a bounded number of pending coroutines instead of worker threads.
+    Slots are shared across event loops (see LoopSafeSemaphore).
+    """
+
+    def __init__(self, max_inflight=8, queue_timeout=0.5, timeout=20.0, retry_after=2):
+        self.max_inflight = max(1, int(max_inflight))
+        self.queue_timeout = float(queue_timeout)
+        self.timeout = float(timeout)
+        self.retry_after = int(retry_after)
+        self._semaphore = LoopSafeSemaphore(self.max_inflight)
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._rejected = 0
+        self._timeouts = 0
+        CHAT_INFLIGHT.set_function(lambda: self._inflight)
+
+    @asynccontextmanager
+    async def slot(self):
+        try:
+            await self._semaphore.acquire(self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._rejected += 1
+            CHAT_ERRORS.labels(reason='busy').inc()
+            raise ChatBusy(self.retry_after) from None
+        with self._lock:
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._inflight -= 1
+            self._semaphore.release()
+
+    async def call(self, awaitable_factory):
+        """Await `awaitable_factory()` in a slot, within the deadline."""
+        async with self.slot():
+            try:
+                return await asyncio.wait_for(awaitable_factory(), self.timeout)
+            except asyncio.TimeoutError:
+                self._record_timeout()
+                raise ChatTimeout(f"no reply from Gemini within {self.timeout:g}s") from None
+
+    async def stream(self, chunks_factory):
+        """Iterate the async iterator from `chunks_factory()` in a slot; `timeout` covers the whole stream."""
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout
+            try:
+                chunks = await asyncio.wait_for(chunks_factory(), deadline - loop.time())
+                iterator = chunks.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), deadline - loop.time())
+                    except StopAsyncIteration:
+                        return
+                    yield chunk
+            except asyncio.TimeoutError:
+                self._record_timeout()
+                raise ChatTimeout(f"no complete reply from Gemini within {self.timeout:g}s") from None
+
+    def _record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+        CHAT_ERRORS.labels(reason='timeout').inc()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_inflight': self.max_inflight,
+                'inflight': self._inflight,
+                'queue_timeout_s': self.queue_timeout,
+                'timeout_s': self.timeout,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+            }
+
+
+class ChatSessionStore:
+    """
+    Per-user chat histories keyed by session id, served from the event loop.
+
+    Sessions live in a StreamStore (LRU + idle TTL); each history carries a
+    LoopSafeSemaphore, so concurrent messages from the same user are serialized
+    while different users never wait on each other. Gemini is called through
+    its async API via `limiter` (an UpstreamLimiter). After every reply,
+    least recently used sessions are evicted until all histories together
+    fit in `max_total_chars`.
+
+    With a `faq` (conferencing.faq.FaqAnswerer), the first message of a
+    conversation is answered from its cache or knowledge index when
+    possible, else through its shared, cached upstream call. Follow-ups
+    carry history, so they always go to Gemini. Local answers still join
+    the history so follow-up questions keep their context.
+    """
+
+    def __init__(self, max_sessions=1000, ttl_seconds=1800, max_turns=10, max_tokens=2000,
+                 max_total_chars=4_000_000, faq=None, limiter=None):
+        self.max_total_chars = max_total_chars
+        self.faq = faq
+        self.limiter = limiter or UpstreamLimiter()
+        self.sessions = StreamStore(
+            factory=lambda: ChatHistory(max_turns=max_turns, max_tokens=max_tokens),
+            max_streams=max_sessions,
+            ttl_seconds=ttl_seconds,
+            name='chat_sessions',
+        )
+        self._stats_lock = threading.Lock()
+        self._messages = 0
+        self._evicted_memory = 0
+        CHAT_SESSIONS.set_function(lambda: len(self.sessions))
+        CHAT_HISTORY_CHARS.set_function(self.total_chars)
+
+    async def send(self, session_id, message, model):
+        """Send `message` with the session's trimmed history to `model`; returns the reply text."""
+        history = self.sessions.get(session_id)
+        async with history.lock:
+            reply = await self._reply(history, message, model)
+            history.append(message, reply)
+        self._finish(session_id)
+        return reply
+
+    async def _reply(self, history, message, model):
+        async def generate():
+            with track_outbound('gemini'):
+                response = await self.limiter.call(lambda: model.generate_content_async(history.contents(message)))
+            return response.text
+
+        if self.faq is None:
+            return await generate()
+        if history.turns:
+            # The reply depends on the conversation, not the question alone
+            self.faq.record_upstream()
+            return await generate()
+        local = self.faq.lookup(message)
+        if local is not None:
+            return local[0]
+        return await self.faq.fetch(message, generate)
+
+    async def stream(self, session_id, message, model):
+        """
+        Like send(), but an async generator of reply pieces as Gemini
+        produces them (a local FAQ answer arrives as one piece). The session
+        stays locked until the generator finishes or is closed; a reply
+        abandoned halfway is not added to the history.
+        """
+        history = self.sessions.get(session_id)
+        async with history.lock:
+            context_free = not history.turns
+            local = self.faq.lookup(message) if self.faq is not None and context_free else None
+            if local is not None:
+                reply = local[0]
+                yield reply
+            else:
+                if self.faq is not None:
+                    self.faq.record_upstream()
+                parts = []
+                # aclosing: if this generator is closed early, release the upstream slot now
+                with track_outbound('gemini'):
+                    async with aclosing(self.limiter.stream(
+                        lambda: model.generate_content_async(history.contents(message), stream=True)
+                    )) as chunks:
+                        async for chunk in chunks:
+                            if chunk.text:
+                                parts.append(chunk.text)
+                                yield chunk.text
+                reply = ''.join(parts)
+                if self.faq is not None and context_free:
+                    self.faq.remember(message, reply)
+            history.append(message, reply)
+        self._finish(session_id)
+
+    def _finish(self, session_id):
+        with self._stats_lock:
+            self._messages += 1
+        self._enforce_memory_cap(keep=session_id)
+
+    def reset(self, session_id):
+        self.sessions.discard(session_id)
+
+    def total_chars(self):
+        return sum(history.chars for history in self.sessions.values())
+
+    def _enforce_memory_cap(self, keep):
+        total = self.total_chars()
+        while total > self.max_total_chars and self.sessions.evict_lru(keep=keep):
+            with self._stats_lock:
+                self._evicted_memory += 1
+            total = self.total_chars()
+        if total > self.max_total_chars:
+            # Only the current session is left and it alone is over the cap
+            history = self.sessions.get(keep)
+            while history.turns and history.chars > self.max_total_chars:
+                history.drop_oldest()
+
+    def stats(self):
+        with self._stats_lock:
+            messages, evicted_memory = self._messages, self._evicted_memory
+        return {
+            **self.sessions.stats(),
+            'messages': messages,
+            'total_chars': self.total_chars(),
+            'max_total_chars': self.max_total_chars,
+            'evicted_memory': evicted_memory,
+            'upstream': self.limiter.stats(),
+            'faq': self.faq.stats() if self.faq else None,
+        }
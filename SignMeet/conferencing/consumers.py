@@ -1,28 +1,175 @@
 # SignMeet/conferencing/consumers.py
 import sys
 import os
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
 
 # Add the signmeet directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from ml_models.asl_detection.wlasl_detection import detect_signs_from_bytes
+from ml_models.pipeline import raw_frame_decoder
+from .gating import FrameChangeGate, GateStats
+from .inference_service import InferenceServiceError
+from .metrics import ROOM_SOCKETS, SIGN_PREDICTIONS, WEBSOCKET_FRAMES, WEBSOCKETS_OPEN
+from .rooms import KINDS, group_name, participant_name, room_broadcaster
+from .services import inference_service_enabled, registry
+
+logger = logging.getLogger(__name__)
+
+# Shared, bounded pool for the (synchronous) PyTorch forward pass, so inference
+# never runs on the ASGI event loop. Each connection has at most one frame in
+# flight, so the pool's backlog is bounded by the number of open sockets.
+inference_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'SIGN_WS_INFERENCE_WORKERS', 2),
+    thread_name_prefix='sign-ws-inference',
+)
+
+# Frame-change gating across all sign detection sockets
+frame_gate_stats = GateStats(name='websockets')
+
+
+# Raw 229x229x3 frames sent by the client (same decode stage as wlasl_detection)
+decode_wlasl_frame = raw_frame_decoder((229, 229, 3))
+
+
+def _detect_signs(frame, gate):
+    # Runs on the executor, so the first frame (not the import) pays for loading PyTorch
+    if inference_service_enabled():
+        return _detect_signs_remote(frame, gate)
+    wlasl = registry.get('wlasl')
+    if wlasl is None:
+        return "[Error]"
+    return wlasl.detect_signs_from_bytes(frame, gate)
+
+
+def _detect_signs_remote(bytes_data, gate):
+    """Same contract as detect_signs_from_bytes, with the model in the worker pool."""
+    try:
+        frame = decode_wlasl_frame(bytes_data)
+    except ValueError as e:
+        logger.warning("invalid websocket frame error=%s", e)
+        return "[Error]"
+    client = registry.get('inference_service')
+    try:
+        translation, _ = gate.run(frame, lambda f: client.run('wlasl', f))
+    except InferenceServiceError as e:
+        logger.warning("inference service error=%s", e)
+        translation = "[Error]"
+    if translation == "[Error]":
+        gate.reset()
+    return translation
+
 
 class SignDetectionConsumer(AsyncWebsocketConsumer):
     async def connect(self):
+        # Single-slot mailbox: newest frame wins while one is being processed
+        self.pending_frame = None
+        self.drain_task = None
+        self.counters = {'received': 0, 'processed': 0, 'dropped': 0, 'errors': 0}
+        # One frame in flight per connection, so the gate needs no lock
+        self.frame_gate = FrameChangeGate(
+            threshold=getattr(settings, 'SIGN_FRAME_DIFF_THRESHOLD', 3.0),
+            max_age=getattr(settings, 'SIGN_FRAME_CACHE_MAX_AGE_SECONDS', 2.0),
+            stats=frame_gate_stats,
+        )
         await self.accept()
-        print("WebSocket connected for sign detection")
+        WEBSOCKETS_OPEN.inc()
+        logger.info("sign websocket connected channel=%s", self.channel_name)
 
     async def disconnect(self, close_code):
-        print("WebSocket disconnected")
+        if self.pending_frame is not None:
+            self.pending_frame = None
+            self.counters['dropped'] += 1
+            WEBSOCKET_FRAMES.labels(outcome='dropped').inc()
+        if self.drain_task is not None and not self.drain_task.done():
+            self.drain_task.cancel()
+        WEBSOCKETS_OPEN.dec()
+        logger.info("sign websocket disconnected code=%s counters=%s", close_code, self.counters)
 
     async def receive(self, text_data=None, bytes_data=None):
         if bytes_data:
+            self.counters['received'] += 1
+            if self.pending_frame is not None:
+                # An older frame is still waiting; replace it instead of queueing
+                self.counters['dropped'] += 1
+                WEBSOCKET_FRAMES.labels(outcome='dropped').inc()
+            self.pending_frame = bytes_data
+            if self.drain_task is None or self.drain_task.done():
+                self.drain_task = asyncio.ensure_future(self.drain_mailbox())
+        elif text_data == 'stats':
+            await self.send(text_data=json.dumps({
+                'type': 'stats',
+                **self.counters,
+                'frame_gate': frame_gate_stats.stats(),
+            }))
+
+    async def drain_mailbox(self):
+        loop = asyncio.get_running_loop()
+        while self.pending_frame is not None:
+            frame, self.pending_frame = self.pending_frame, None
             try:
-                print(f"Received bytes data length: {len(bytes_data)}")
-                translation = detect_signs_from_bytes(bytes_data)
-                await self.send(text_data=translation)
-                print(f"Predicted sign: {translation}")
+                translation = await loop.run_in_executor(
+                    inference_executor, _detect_signs, frame, self.frame_gate
+                )
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                print(f"Error in SignDetectionConsumer: {e}")
-                await self.send(text_data="[Error]")
\ No newline at end of file
+                self.counters['errors'] += 1
+                WEBSOCKET_FRAMES.labels(outcome='error').inc()
+                logger.exception("error in SignDetectionConsumer")
+                await self.send(text_data="[Error]")
+                continue
+            self.counters['processed'] += 1
+            WEBSOCKET_FRAMES.labels(outcome='processed').inc()
+            SIGN_PREDICTIONS.labels(pipeline='websocket', label=translation).inc()
+            logger.debug("websocket frame translation=%s", translation)
+            await self.send(text_data=translation)
+
+
+class RoomSignConsumer(AsyncWebsocketConsumer):
+    """
+    /ws/sign/<room>/: receives the room's coalesced sign and caption batches
+    (see rooms.py). Clients may also publish with
+    {"kind": "sign" | "caption", "text": ...}; the name shown is the
+    connection's signed-in user or session guest id, not client input.
+    """
+
+    async def connect(self):
+        self.room = self.scope['url_route']['kwargs']['room_name']
+        self.group = group_name(self.room)
+        if self.group is None:
+            await self.close()
+            return
+        session = self.scope.get('session')
+        self.participant = participant_name(
+            self.scope.get('user'), getattr(session, 'session_key', None), self.channel_name,
+        )
+        room_broadcaster.attach()
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+        ROOM_SOCKETS.inc()
+        logger.info("room websocket connected room=%s channel=%s", self.room, self.channel_name)
+
+    async def disconnect(self, close_code):
+        if self.group is None:
+            return
+        await self.channel_layer.group_discard(self.group, self.channel_name)
+        ROOM_SOCKETS.dec()
+        logger.info("room websocket disconnected room=%s code=%s", self.room, close_code)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            event = json.loads(text_data or '')
+            kind, text = event['kind'], event['text']
+        except (ValueError, TypeError, KeyError):
+            return
+        if kind in KINDS and isinstance(text, str):
+            room_broadcaster.publish(self.room, kind, self.participant, text)
+
+    async def room_batch(self, event):
+        # Encoded once per tick by the broadcaster, forwarded as-is
+        await self.send(text_data=event['payload'])
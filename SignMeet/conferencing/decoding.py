@@ -0,0 +1,109 @@
+# SignMeet/conferencing/decoding.py
+import base64
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from ml_models.preprocessing import jpeg_size, reduced_decode_flag
+
+# Decoded frames are written into one reusable RGB buffer per thread, so the
+# array returned by the decode_* helpers is only valid until the next decode
+# on the same thread. Copy it if it has to outlive the request.
+_local = threading.local()
+
+_stats_lock = threading.Lock()
+_stats = {
+    'data_url': {'frames': 0, 'errors': 0, 'bytes_in': 0, 'decode_seconds': 0.0},
+    'binary': {'frames': 0, 'errors': 0, 'bytes_in': 0, 'decode_seconds': 0.0},
+}
+
+
+class FrameDecodeError(ValueError):
+    """Raised when an uploaded frame cannot be decoded into an image."""
+
+
+def _frame_buffer(shape):
+    buf = getattr(_local, 'frame', None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        _local.frame = buf
+    return buf
+
+
+def _record(path, bytes_in, started, ok=True):
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        entry = _stats[path]
+        entry['bytes_in'] += bytes_in
+        if ok:
+            entry['frames'] += 1
+            entry['decode_seconds'] += elapsed
+        else:
+            entry['errors'] += 1
+
+
+def _decode_rgb(encoded, min_side=None):
+    """
+    Decode JPEG/WebP/PNG bytes into the thread's reusable RGB buffer.
+    With `min_side`, large JPEGs are decoded at 1/2, 1/4 or 1/8 scale as long
+    as the shorter side stays >= min_side (much cheaper than full decode).
+    """
+    flag = cv2.IMREAD_COLOR
+    if min_side:
+        size = jpeg_size(encoded)
+        if size:
+            flag = reduced_decode_flag(size[0], size[1], min_side)
+    bgr = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), flag)
+    if bgr is None:
+        raise FrameDecodeError('Could not decode image data')
+    frame = _frame_buffer(bgr.shape)
+    cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=frame)
+    return frame
+
+
+def decode_image_bytes(data, min_side=None):
+    """Decode a raw JPEG/WebP request body (bytes or memoryview) to an RGB array."""
+    started = time.perf_counter()
+    if not data:
+        _record('binary', 0, started, ok=False)
+        raise FrameDecodeError('Empty image body')
+    try:
+        frame = _decode_rgb(data, min_side)
+    except FrameDecodeError:
+        _record('binary', len(data), started, ok=False)
+        raise
+    _record('binary', len(data), started)
+    return frame
+
+
+def decode_data_url(image_data, min_side=None):
+    """Decode a `data:image/...;base64,` string (legacy canvas.toDataURL clients)."""
+    started = time.perf_counter()
+    try:
+        _, imgstr = image_data.split(';base64,')
+        frame = _decode_rgb(base64.b64decode(imgstr), min_side)
+    except (ValueError, TypeError) as e:
+        _record('data_url', len(image_data), started, ok=False)
+        if isinstance(e, FrameDecodeError):
+            raise
+        raise FrameDecodeError(f'Invalid data URL: {e}') from e
+    _record('data_url', len(image_data), started)
+    return frame
+
+
+def decode_stats():
+    """Per-path totals plus averages, for the stats endpoint."""
+    with _stats_lock:
+        report = {}
+        for path, entry in _stats.items():
+            frames = entry['frames']
+            report[path] = {
+                'frames': frames,
+                'errors': entry['errors'],
+                'bytes_in': entry['bytes_in'],
+                'avg_bytes_in': round(entry['bytes_in'] / frames, 1) if frames else 0.0,
+                'avg_decode_ms': round(entry['decode_seconds'] * 1000.0 / frames, 3) if frames else 0.0,
+            }
+        return report
@@ -0,0 +1,275 @@
+# SignMeet/conferencing/faq.py
+"""
+Local answers for Sense Bot, checked before calling Gemini for a message
+without conversation context (follow-ups always go upstream):
+
+    question -> normalized -> reply cache -> BM25 over KNOWLEDGE bullets -> Gemini
+
+The bot may only answer from the KNOWLEDGE section of its instructions, so
+a question that clearly matches one bullet is answered with that bullet
+directly. Context-free Gemini replies (first message of a conversation) are
+cached by normalized question, and identical questions asked at the same
+time share one upstream call.
+"""
+import asyncio
+import re
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from .caching import TTLCache
+from .metrics import CHAT_REPLIES
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared call whose leader was cancelled; followers retry."""
+
+
+# Question words and fillers that say nothing about which bullet is meant
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i if in into is it its me my of on or our so
+that the their them then there this to up us via was we what when where which who why will with
+you your please sense hi hello hey
+""".split())
+
+
+def _stem(word):
+    # Just enough folding that "share", "shares", "sharing" and "recordings" meet
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 4:
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def normalize_question(text):
+    """Cache key: lowercase words only, so "How do I share my screen?" == "how do i share my screen"."""
+    return ' '.join(_WORD.findall(text.lower()))
+
+
+def parse_knowledge(instructions):
+    """
+    (section, topic, text) for every "- Topic: text" bullet after
+    "### KNOWLEDGE ###". Bullets without a short "Topic:" prefix get topic ''.
+    """
+    _, _, knowledge = instructions.partition('### KNOWLEDGE ###')
+    entries, section = [], ''
+    for line in knowledge.splitlines():
+        line = line.strip()
+        if line.startswith('####'):
+            section = re.sub(r'^[#\s\W]+', '', line).strip()
+        elif line.startswith('- '):
+            text = line[2:].replace('**', '').strip()
+            topic, sep, rest = text.partition(': ')
+            if sep and len(topic.split()) <= 5:
+                entries.append((section, topic, rest))
+            else:
+                entries.append((section, '', text))
+    return entries
+
+
+class KnowledgeIndex:
+    """
+    Okapi BM25 over KNOWLEDGE bullets as dense NumPy arrays (a few dozen
+    documents, so a full term-document matrix is tiny).
+
+    `best(question)` returns (entry, confidence, runner_up), where
+    confidence is the top score divided by the best score any single
+    document could reach for those query terms. Query words missing from
+    the knowledge count at the highest idf, so off-topic questions stay low.
+    """
+
+    def __init__(self, entries, k1=1.2, b=0.75, topic_weight=2):
+        self.entries = list(entries)
+        self.k1 = k1
+        docs = [
+            tokenize(section) + tokenize(topic) * topic_weight + tokenize(text)
+            for section, topic, text in self.entries
+        ]
+        self.vocabulary = {term: i for i, term in enumerate(sorted({t for doc in docs for t in doc}))}
+
+        tf = np.zeros((len(docs), len(self.vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            for term in doc:
+                tf[row, self.vocabulary[term]] += 1
+        lengths = tf.sum(axis=1, keepdims=True)
+        df = np.count_nonzero(tf, axis=0)
+        self.idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        self.max_idf = float(self.idf.max()) if len(self.idf) else 0.0
+        # Per-term BM25 weights, precomputed so a query is one column sum
+        norm = k1 * (1 - b + b * lengths / max(float(lengths.mean()), 1.0))
+        self.weights = self.idf * tf * (k1 + 1) / (tf + norm)
+
+    @classmethod
+    def from_instructions(cls, instructions, **kwargs):
+        return cls(parse_knowledge(instructions), **kwargs)
+
+    def scores(self, question):
+        """Raw BM25 score of every entry and the best score possible for this question."""
+        terms = tokenize(question)
+        columns = [self.vocabulary[t] for t in terms if t in self.vocabulary]
+        ceiling = (self.k1 + 1) * (
+            float(self.idf[columns].sum()) + self.max_idf * (len(terms) - len(columns))
+        )
+        if not columns:
+            return np.zeros(len(self.entries), dtype=np.float32), ceiling
+        return self.weights[:, columns].sum(axis=1), ceiling
+
+    def best(self, question):
+        if not self.entries:
+            return None, 0.0, 0.0
+        scores, ceiling = self.scores(question)
+        if ceiling <= 0:
+            return None, 0.0, 0.0
+        order = np.argsort(scores)[::-1]
+        top = float(scores[order[0]]) / ceiling
+        runner_up = float(scores[order[1]]) / ceiling if len(order) > 1 else 0.0
+        return self.entries[order[0]], top, runner_up
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class FaqAnswerer:
+    """
+    Reply cache + knowledge index + request coalescing for Sense Bot.
+
+        local = faq.lookup(question)        # (reply, 'cache' | 'index') or None
+        reply = await faq.fetch(question, call)   # context-free upstream call, shared and cached
+
+    An index match is used only when its confidence reaches `min_score` and
+    beats the runner-up by `min_margin`, so vague questions still go to
+    Gemini.
+    """
+
+    def __init__(self, index, min_score=0.6, min_margin=0.08, cache=None):
+        self.index = index
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.cache = cache or TTLCache()
+
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._cache_hits = 0
+        self._index_hits = 0
+        self._upstream = 0
+        self._coalesced = 0
+
+    def lookup(self, question):
+        key = normalize_question(question)
+        reply = self.cache.get(key)
+        source = 'cache'
+        if reply is None:
+            reply = self.answer_from_index(question)
+            source = 'index'
+            if reply is not None:
+                self.cache.put(key, reply)
+        with self._lock:
+            self._lookups += 1
+            if reply is not None:
+                if source == 'cache':
+                    self._cache_hits += 1
+                else:
+                    self._index_hits += 1
+        if reply is None:
+            return None
+        CHAT_REPLIES.labels(source=source).inc()
+        return reply, source
+
+    def answer_from_index(self, question):
+        entry, score, runner_up = self.index.best(question)
+        if entry is None or score < self.min_score or score - runner_up < self.min_margin:
+            return None
+        section, topic, text = entry
+        return f"{topic}: {text}" if topic else text
+
+    async def fetch(self, question, call):
+        """
+        Await `call()` for a question asked without prior context. Concurrent
+        identical questions wait for the first caller's reply instead of
+        making their own call; the reply is cached for later ones. The shared
+        result is a concurrent.futures.Future, so callers on different event
+        loops (one per request under WSGI) can wait on it. If the first caller
+        is cancelled (its client went away), a waiting caller takes over.
+        """
+        key = normalize_question(question)
+        while True:
+            with self._lock:
+                pending = self._inflight.get(key)
+                leader = pending is None
+                if leader:
+                    pending = self._inflight[key] = Future()
+                    self._upstream += 1
+                else:
+                    self._coalesced += 1
+
+            if leader:
+                return await self._lead(key, pending, call)
+            CHAT_REPLIES.labels(source='coalesced').inc()
+            try:
+                # shield: a follower giving up must not cancel the shared call
+                return await asyncio.shield(asyncio.wrap_future(pending))
+            except _LeaderCancelled:
+                continue
+
+    async def _lead(self, key, pending, call):
+        try:
+            reply = await call()
+        except asyncio.CancelledError:
+            # Not the followers' failure: wake them to retry, one as the new leader
+            self._settle(key, pending, error=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._settle(key, pending, error=e)
+            raise
+        self.cache.put(key, reply)
+        self._settle(key, pending, reply=reply)
+        CHAT_REPLIES.labels(source='gemini').inc()
+        return reply
+
+    def _settle(self, key, pending, reply=None, error=None):
+        # Leave _inflight first, so a woken follower that retries starts a new call
+        with self._lock:
+            del self._inflight[key]
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(reply)
+
+    def remember(self, question, reply):
+        """Cache a context-free reply obtained outside fetch() (e.g. streamed)."""
+        self.cache.put(normalize_question(question), reply)
+
+    def record_upstream(self):
+        """Count a Gemini call that carried conversation history (never cached or shared)."""
+        with self._lock:
+            self._upstream += 1
+        CHAT_REPLIES.labels(source='gemini').inc()
+
+    def stats(self):
+        with self._lock:
+            lookups, cache_hits, index_hits = self._lookups, self._cache_hits, self._index_hits
+            upstream, coalesced = self._upstream, self._coalesced
+        hits = cache_hits + index_hits
+        return {
+            'entries': len(self.index),
+            'cached_replies': len(self.cache),
+            'questions': lookups,
+            'cache_hits': cache_hits,
+            'index_hits': index_hits,
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+            'upstream_calls': upstream,
+            'coalesced': coalesced,
+        }
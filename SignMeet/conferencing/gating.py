@@ -0,0 +1,103 @@
+# SignMeet/conferencing/gating.py
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+def frame_signature(frame, size=16):
+    """Tiny grayscale thumbnail used to decide whether a frame changed."""
+    small = cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        # Channel mean rather than a colour conversion, so RGB and BGR frames
+        # produce the same signature.
+        small = small.mean(axis=2)
+    return small.astype(np.float32)
+
+
+class GateStats:
+    """Hit/miss counters shared by every gate of one kind (HTTP streams, WebSockets)."""
+
+    def __init__(self, name='frame_gate'):
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.gate_seconds = 0.0
+        self.inference_seconds = 0.0
+
+    def record_hit(self, gate_seconds):
+        with self._lock:
+            self.hits += 1
+            self.gate_seconds += gate_seconds
+
+    def record_miss(self, gate_seconds, inference_seconds):
+        with self._lock:
+            self.misses += 1
+            self.gate_seconds += gate_seconds
+            self.inference_seconds += inference_seconds
+
+    def stats(self):
+        with self._lock:
+            frames = self.hits + self.misses
+            avg_inference = self.inference_seconds / self.misses if self.misses else 0.0
+            return {
+                'name': self.name,
+                'frames': frames,
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'hit_ratio': round(self.hits / frames, 4) if frames else 0.0,
+                'avg_gate_ms': round(self.gate_seconds * 1000.0 / frames, 4) if frames else 0.0,
+                'avg_inference_ms': round(avg_inference * 1000.0, 3),
+                # Estimate: every hit skipped one average full pass
+                'cpu_saved_ms': round(self.hits * avg_inference * 1000.0, 1),
+            }
+
+
+class FrameChangeGate:
+    """
+    Per-stream cache of the last classified frame.
+
+    A new frame whose downsampled grayscale thumbnail differs from the last
+    classified one by at most `threshold` (mean absolute difference, 0-255
+    scale) reuses the cached result instead of running MediaPipe and the
+    classifier. Results older than `max_age` seconds are always refreshed.
+    Not thread-safe: callers hold the stream's lock or process one frame at a
+    time per stream.
+    """
+
+    def __init__(self, threshold=3.0, max_age=2.0, size=16, stats=None):
+        self.threshold = float(threshold)
+        self.max_age = float(max_age)
+        self.size = int(size)
+        self.stats = stats or GateStats()
+
+        self._signature = None
+        self._result = None
+        self._cached_at = 0.0
+
+    def run(self, frame, compute):
+        """Return (result, cached): the cached result if the frame is unchanged, else compute(frame)."""
+        started = time.perf_counter()
+        signature = frame_signature(frame, self.size)
+        if (
+            self.threshold > 0
+            and self._signature is not None
+            and time.monotonic() - self._cached_at <= self.max_age
+            and float(np.abs(signature - self._signature).mean()) <= self.threshold
+        ):
+            self.stats.record_hit(time.perf_counter() - started)
+            return self._result, True
+
+        gated = time.perf_counter()
+        result = compute(frame)
+        self.stats.record_miss(gated - started, time.perf_counter() - gated)
+        self._signature = signature
+        self._result = result
+        self._cached_at = time.monotonic()
+        return result, False
+
+    def reset(self):
+        self._signature = None
+        self._result = None
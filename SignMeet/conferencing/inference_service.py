@@ -0,0 +1,331 @@
+# SignMeet/conferencing/inference_service.py
+"""
+Out-of-process inference: `manage.py run_inference_service` starts N worker
+processes that own the models; web workers keep none loaded and send frames
+through an InferenceClient.
+
+Frames never go through pickle. Each client process creates one
+`multiprocessing.shared_memory` block split into fixed-size ring slots,
+copies the frame into a free slot and sends only
+(task, shm name, offset, shape, dtype, stream id, generation) over a
+`multiprocessing.connection` socket. The worker copies the frame out of the
+slot, runs the task and sends back the (small) result.
+
+Each slot starts with the generation of the frame written into it. A client
+that gives up on a reply reuses the slot straight away; the worker checks
+the generation after its copy and drops a request whose slot was
+overwritten, so a late request never runs on another caller's frame.
+
+Requests with a stream id always go to the same worker, so per-stream state
+(MediaPipe trackers) stays in one process; the rest are spread round-robin.
+"""
+import atexit
+import itertools
+import logging
+import queue
+import threading
+import zlib
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from .batching import BatchQueueFull
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceServiceError(Exception):
+    """The inference service could not be reached or failed the request."""
+
+
+class InferenceServiceBusy(InferenceServiceError):
+    """No free ring slot, or the worker's batch queue is full."""
+
+
+def worker_addresses(host, port, workers):
+    """Worker i listens on (host, port + i)."""
+    return [(host, port + i) for i in range(workers)]
+
+
+# --- Client side (web workers) ---
+# Slot header: the generation (uint64) of the frame currently in the slot
+SLOT_HEADER_BYTES = 8
+
+
+def slot_generation(buf, offset):
+    """The generation stored in the header in front of the frame at `offset`."""
+    return int(np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=offset - SLOT_HEADER_BYTES)[0])
+
+
+class FrameRing:
+    """
+    A client-owned shared memory block split into `slots` slots, each a
+    generation header followed by up to `slot_bytes` of frame.
+    """
+
+    def __init__(self, slots=8, slot_bytes=1920 * 1080 * 3):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * (SLOT_HEADER_BYTES + slot_bytes))
+        self._generations = itertools.count(1)
+        self._free = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def acquire(self, timeout):
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise InferenceServiceBusy(f"All {self.slots} frame slots are in use")
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    def write(self, slot, frame):
+        """Copy `frame` into `slot`; returns (byte offset of the frame, its generation)."""
+        frame = np.ascontiguousarray(frame)
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds the {self.slot_bytes}-byte slot")
+        offset = slot * (SLOT_HEADER_BYTES + self.slot_bytes) + SLOT_HEADER_BYTES
+        generation = next(self._generations)
+        # Header first: a worker still copying the previous frame then sees a new generation
+        np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf, offset=offset - SLOT_HEADER_BYTES)[0] = generation
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf, offset=offset)
+        np.copyto(view, frame)
+        return offset, generation
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class InferenceClient:
+    """
+    Thread-safe client for the worker pool. `run(task, frame, stream_id)`
+    blocks until the worker replies; connections are pooled per worker.
+    """
+
+    def __init__(self, addresses, authkey, slots=8, slot_bytes=1920 * 1080 * 3, timeout=5.0):
+        self.addresses = list(addresses)
+        self.authkey = authkey
+        self.timeout = timeout
+        self.ring = FrameRing(slots=slots, slot_bytes=slot_bytes)
+        self._idle = [queue.LifoQueue() for _ in self.addresses]
+        self._round_robin = itertools.count()
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._busy = 0
+        atexit.register(self.close)
+
+    def _worker_for(self, stream_id):
+        if stream_id:
+            return zlib.crc32(str(stream_id).encode()) % len(self.addresses)
+        return next(self._round_robin) % len(self.addresses)
+
+    def _pooled(self, index):
+        try:
+            return self._idle[index].get_nowait()
+        except queue.Empty:
+            return None
+
+    def _connect(self, index):
+        try:
+            return Client(self.addresses[index], authkey=self.authkey)
+        except OSError as e:
+            raise InferenceServiceError(f"Inference worker {self.addresses[index]} unreachable: {e}")
+
+    def _drop_idle(self, index):
+        while (conn := self._pooled(index)) is not None:
+            conn.close()
+
+    def _call(self, index, message):
+        conn = self._pooled(index)
+        if conn is not None:
+            try:
+                return self._exchange(index, conn, message)
+            except (EOFError, OSError):
+                # The pooled connection went stale (e.g. the worker restarted),
+                # and so have its idle siblings: retry once on a new one
+                self._drop_idle(index)
+        try:
+            return self._exchange(index, self._connect(index), message)
+        except (EOFError, OSError) as e:
+            raise InferenceServiceError(f"Inference worker {self.addresses[index]} dropped the connection: {e}")
+
+    def _exchange(self, index, conn, message):
+        try:
+            conn.send(message)
+            if not conn.poll(self.timeout):
+                raise InferenceServiceError(f"Inference worker {self.addresses[index]} timed out")
+            reply = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+        self._idle[index].put(conn)
+        return reply
+
+    def run(self, task, frame, stream_id=None):
+        """Run `task` ('sign' or 'wlasl') on one frame in the worker pool."""
+        try:
+            slot = self.ring.acquire(self.timeout)
+        except InferenceServiceBusy:
+            with self._stats_lock:
+                self._busy += 1
+            raise
+        try:
+            offset, generation = self.ring.write(slot, frame)
+            message = (task, self.ring.name, offset, frame.shape, frame.dtype.str, stream_id, generation)
+            status, payload = self._call(self._worker_for(stream_id), message)
+        except InferenceServiceError:
+            with self._stats_lock:
+                self._errors += 1
+            raise
+        finally:
+            # Safe even after a timeout: the worker drops the request if it
+            # finds the slot's generation changed after copying the frame
+            self.ring.release(slot)
+
+        with self._stats_lock:
+            self._requests += 1
+            if status == 'busy':
+                self._busy += 1
+            elif status == 'error':
+                self._errors += 1
+        if status == 'busy':
+            raise InferenceServiceBusy(payload)
+        if status == 'error':
+            raise InferenceServiceError(payload)
+        return payload
+
+    def ping(self):
+        """Round-trip every worker; returns their model readiness."""
+        return [self._call(i, ('ping',))[1] for i in range(len(self.addresses))]
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'workers': [f"{host}:{port}" for host, port in self.addresses],
+                'slots': self.ring.slots,
+                'slot_bytes': self.ring.slot_bytes,
+                'free_slots': self.ring._free.qsize(),
+                'requests': self._requests,
+                'errors': self._errors,
+                'busy': self._busy,
+            }
+
+    def close(self):
+        for index in range(len(self._idle)):
+            self._drop_idle(index)
+        self.ring.close()
+
+
+# --- Worker side (run_inference_service) ---
+def _attach(name):
+    """Attach to a client's ring without letting this process unlink it on exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: no track flag, unregister from the resource tracker instead
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+class InferenceWorker:
+    """
+    One worker process: accepts client connections on `address` and runs
+    `tasks[name](frame, stream_id)` for each request, one thread per
+    connection (the models' own locks and batchers serialize inference).
+    """
+
+    def __init__(self, address, authkey, tasks, ready=None):
+        self.address = address
+        self.authkey = authkey
+        self.tasks = tasks
+        self.ready = ready or (lambda: True)
+        self._segments = {}
+        self._segments_lock = threading.Lock()
+
+    def _open_segment(self, name):
+        """Map a client's ring, shared (and reference counted) across its connections."""
+        with self._segments_lock:
+            shm, users = self._segments.get(name, (None, 0))
+            if shm is None:
+                shm = _attach(name)
+            self._segments[name] = (shm, users + 1)
+            return shm
+
+    def _close_segment(self, name):
+        with self._segments_lock:
+            shm, users = self._segments[name]
+            if users > 1:
+                self._segments[name] = (shm, users - 1)
+                return
+            del self._segments[name]
+        shm.close()
+
+    def serve_forever(self):
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info("inference worker listening address=%s:%s", *self.address)
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError as e:
+                    # Failed handshake (wrong authkey) or aborted connect
+                    logger.warning("inference worker rejected a connection error=%s", e)
+                    continue
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        segments = {}
+        try:
+            with conn:
+                while True:
+                    message = conn.recv()
+                    if message[0] == 'ping':
+                        conn.send(('ok', self.ready()))
+                        continue
+                    task, shm_name, offset, shape, dtype, stream_id, generation = message
+                    if shm_name not in segments:
+                        try:
+                            segments[shm_name] = self._open_segment(shm_name)
+                        except OSError as e:
+                            conn.send(('error', f"Cannot attach frame ring {shm_name}: {e}"))
+                            continue
+                    buf = segments[shm_name].buf
+                    frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=buf, offset=offset).copy()
+                    if slot_generation(buf, offset) != generation:
+                        # The client timed out and reused the slot while we were behind
+                        logger.warning("inference worker dropped a stale frame task=%s stream=%s", task, stream_id)
+                        conn.send(('error', "Frame slot was reused before the worker read it"))
+                        continue
+                    conn.send(self._handle(task, frame, stream_id))
+        except (EOFError, OSError):
+            # Client closed the connection (or gave up waiting for the reply)
+            pass
+        finally:
+            # The client process may be gone; drop our mapping of its ring
+            for name in segments:
+                self._close_segment(name)
+
+    def _handle(self, task, frame, stream_id):
+        fn = self.tasks.get(task)
+        if fn is None:
+            return 'error', f"Unknown task '{task}'"
+        try:
+            return 'ok', fn(frame, stream_id)
+        except BatchQueueFull as e:
+            return 'busy', str(e)
+        except Exception as e:
+            logger.exception("inference worker task failed task=%s", task)
+            return 'error', f"{type(e).__name__}: {e}"
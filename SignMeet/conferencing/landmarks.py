@@ -0,0 +1,98 @@
+# SignMeet/conferencing/landmarks.py
+import threading
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+
+
+def landmark_array(hand_landmarks):
+    """MediaPipe NormalizedLandmarkList -> (21, 3) float32 array of x, y, z."""
+    return np.array(
+        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32
+    )
+
+
+def normalize_landmarks(points):
+    """
+    Wrist-relative, scale-normalized feature vectors.
+
+    `points` is (21, 3) or (N, 21, 3). Every landmark is translated so the
+    wrist sits at the origin and divided by the largest wrist distance in
+    the x/y plane, which removes hand position and distance to the camera.
+    Returns (63,) or (N, 63) float32.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    relative = points - points[..., WRIST:WRIST + 1, :]
+    scale = np.linalg.norm(relative[..., :2], axis=-1).max(axis=-1)
+    scale = np.maximum(scale, 1e-6)[..., None, None]
+    features = relative / scale
+    return features.reshape(features.shape[:-2] + (NUM_LANDMARKS * 3,))
+
+
+class LandmarkClassifier:
+    """
+    Tiny NumPy MLP over normalized landmark vectors.
+
+    Weights come from an .npz written by `manage.py train_landmark_classifier`:
+    `W0, b0, W1, b1, ...` (ReLU between layers, softmax at the end) plus a
+    `classes` array. Predictions at or above `threshold` are trusted; lower
+    ones should fall back to the image CNN.
+    """
+
+    def __init__(self, weights, biases, classes, threshold=0.9):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.classes = [str(c) for c in classes]
+        self.threshold = float(threshold)
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._accepted = 0
+
+    @classmethod
+    def from_npz(cls, path, threshold=0.9):
+        data = np.load(path, allow_pickle=False)
+        layers = sorted(
+            int(key[1:]) for key in data.files if key.startswith('W') and key[1:].isdigit()
+        )
+        weights = [data[f'W{i}'] for i in layers]
+        biases = [data[f'b{i}'] for i in layers]
+        return cls(weights, biases, data['classes'], threshold=threshold)
+
+    def predict_proba(self, features):
+        """(63,) or (N, 63) features -> (classes,) or (N, classes) probabilities."""
+        x = np.asarray(features, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w + b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        x = x - x.max(axis=-1, keepdims=True)
+        np.exp(x, out=x)
+        x /= x.sum(axis=-1, keepdims=True)
+        return x
+
+    def classify(self, features):
+        """Return (label, confidence, accepted) for a single feature vector."""
+        probs = self.predict_proba(features)
+        index = int(np.argmax(probs))
+        confidence = float(probs[index])
+        accepted = confidence >= self.threshold
+        with self._lock:
+            self._calls += 1
+            if accepted:
+                self._accepted += 1
+        return self.classes[index], confidence, accepted
+
+    def stats(self):
+        with self._lock:
+            return {
+                'threshold': self.threshold,
+                'classes': len(self.classes),
+                'calls': self._calls,
+                'fast_path_hits': self._accepted,
+                'cnn_fallbacks': self._calls - self._accepted,
+                'hit_rate': round(self._accepted / self._calls, 4) if self._calls else 0.0,
+            }
@@ -0,0 +1,131 @@
+import os
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_models.engines import load_engine
+
+# Default sources: the artifacts the project trains today
+SOURCES = {
+    'sign_classifier': ('keras', 'ml_models/best_sign_model.h5', (224, 224, 3)),
+    'wlasl': (
+        'pytorch',
+        os.path.join('ml_models', 'asl_detection', 'mobilenetv2_asl_trained_improved.pth'),
+        (3, 224, 224),
+    ),
+}
+
+TARGETS = {
+    'keras': ('savedmodel', 'tflite', 'onnx'),
+    'pytorch': ('torchscript', 'onnx'),
+}
+
+EXTENSIONS = {'savedmodel': '', 'tflite': '.tflite', 'onnx': '.onnx', 'torchscript': '.pt'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the trained sign models (.h5 / .pth) to SavedModel, TFLite, ONNX or "
+        "TorchScript, check the outputs against the source model and print the "
+        "SIGN_MODEL_ENGINES entry to use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(SOURCES), help='Which model to export')
+        parser.add_argument('--to', nargs='+', required=True,
+                            choices=sorted(EXTENSIONS), help='Target formats')
+        parser.add_argument('--source', help='Override the source .h5/.pth path')
+        parser.add_argument('--out-dir', default=os.path.join('ml_models', 'exported'))
+        parser.add_argument('--opset', type=int, default=17, help='ONNX opset version')
+
+    def handle(self, *args, **options):
+        name = options['model']
+        kind, default_path, input_shape = SOURCES[name]
+        source = options['source'] or default_path
+        if not os.path.exists(source):
+            raise CommandError(f"Source model not found: {source}")
+
+        unsupported = [t for t in options['to'] if t not in TARGETS[kind]]
+        if unsupported:
+            raise CommandError(
+                f"{name} is a {kind} model; it can be exported to {', '.join(TARGETS[kind])}, "
+                f"not {', '.join(unsupported)}"
+            )
+
+        os.makedirs(options['out_dir'], exist_ok=True)
+        sample = np.random.default_rng(0).random((4,) + input_shape, dtype=np.float32)
+
+        if kind == 'keras':
+            from tensorflow.keras.models import load_model
+            model = load_model(source, compile=False)
+            reference = np.asarray(model.predict_on_batch(sample))
+        else:
+            import torch
+            from ml_models.asl_detection.architectures import build_mobilenet_v2
+            model = build_mobilenet_v2(source)
+            with torch.inference_mode():
+                reference = model(torch.from_numpy(sample)).numpy()
+
+        for target in options['to']:
+            out = os.path.join(options['out_dir'], f"{name}{EXTENSIONS[target]}")
+            if target == 'savedmodel':
+                out = os.path.join(options['out_dir'], f"{name}_savedmodel")
+            started = time.perf_counter()
+            getattr(self, f"_{kind}_to_{target}")(model, out, input_shape, options)
+            self.stdout.write(f"{name} -> {target}: {out} ({time.perf_counter() - started:.1f}s)")
+            self._verify(target, out, sample, reference)
+            self.stdout.write(
+                f"    SIGN_MODEL_ENGINES['{name}'] = {{'backend': '{target}', 'path': '{out}'}}"
+            )
+
+    # --- Keras sources ---
+    def _keras_to_savedmodel(self, model, out, input_shape, options):
+        if hasattr(model, 'export'):
+            model.export(out)
+        else:
+            import tensorflow as tf
+            tf.saved_model.save(model, out)
+
+    def _keras_to_tflite(self, model, out, input_shape, options):
+        import tensorflow as tf
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        with open(out, 'wb') as f:
+            f.write(converter.convert())
+
+    def _keras_to_onnx(self, model, out, input_shape, options):
+        import tensorflow as tf
+        import tf2onnx
+        signature = [tf.TensorSpec((None,) + input_shape, tf.float32, name='input')]
+        tf2onnx.convert.from_keras(model, input_signature=signature, opset=options['opset'], output_path=out)
+
+    # --- PyTorch sources ---
+    def _pytorch_to_torchscript(self, model, out, input_shape, options):
+        import torch
+        example = torch.zeros((1,) + input_shape)
+        with torch.no_grad():
+            traced = torch.jit.freeze(torch.jit.trace(model, example))
+        traced.save(out)
+
+    def _pytorch_to_onnx(self, model, out, input_shape, options):
+        import torch
+        torch.onnx.export(
+            model, torch.zeros((1,) + input_shape), out,
+            input_names=['input'], output_names=['logits'],
+            dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+            opset_version=options['opset'],
+        )
+
+    def _verify(self, target, out, sample, reference):
+        engine = load_engine(target, out)
+        engine.predict_batch(sample)  # warm-up
+        started = time.perf_counter()
+        result = engine.predict_batch(sample)
+        elapsed = (time.perf_counter() - started) * 1000.0
+        diff = float(np.abs(result - reference).max())
+        same_top1 = bool((result.argmax(axis=1) == reference.argmax(axis=1)).all())
+        style = self.style.SUCCESS if same_top1 else self.style.WARNING
+        self.stdout.write(style(
+            f"    verified: max |diff| {diff:.2e}, top-1 {'matches' if same_top1 else 'DIFFERS'}, "
+            f"batch of {len(sample)} in {elapsed:.1f} ms"
+        ))
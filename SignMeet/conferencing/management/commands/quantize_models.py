@@ -0,0 +1,264 @@
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_models.engines import TorchModuleEngine, load_engine
+from ml_models.preprocessing import imagenet_chw, to_unit_float
+
+from .export_models import SOURCES
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def _rss_bytes():
+    """Current resident set size (Linux /proc), or None where unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _artifact_bytes(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path) for name in files
+        )
+    return os.path.getsize(path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Produce INT8 (dynamic and static) variants of a sign model from a calibration "
+        "folder, evaluate them on the test split used by testing.py and reject any "
+        "variant whose top-1 accuracy drops by more than --max-accuracy-drop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(SOURCES), help='Which model to quantize')
+        parser.add_argument('--calibration-dir', required=True,
+                            help='Images used to calibrate static quantization (searched recursively)')
+        parser.add_argument('--test-dir', required=True,
+                            help='Test split, one sub-folder per class (ImageFolder layout, as in testing.py)')
+        parser.add_argument('--mode', nargs='+', choices=['dynamic', 'static'], default=['dynamic', 'static'])
+        parser.add_argument('--source', help='Override the source .h5/.pth path')
+        parser.add_argument('--max-accuracy-drop', type=float, default=0.01,
+                            help='Largest allowed top-1 drop (absolute, 0.01 = one point)')
+        parser.add_argument('--calibration-samples', type=int, default=200)
+        parser.add_argument('--latency-runs', type=int, default=50)
+        parser.add_argument('--out-dir', default=os.path.join('ml_models', 'quantized'))
+
+    def handle(self, *args, **options):
+        name = options['model']
+        kind, default_path, input_shape = SOURCES[name]
+        source = options['source'] or default_path
+        for path in (source, options['calibration_dir'], options['test_dir']):
+            if not os.path.exists(path):
+                raise CommandError(f"Not found: {path}")
+        os.makedirs(options['out_dir'], exist_ok=True)
+
+        self.name = name
+        test_x, test_y = self._load_test_split(options['test_dir'])
+        calibration = self._load_calibration(options['calibration_dir'], options['calibration_samples'])
+        self.stdout.write(f"{len(test_x)} test images, {len(calibration)} calibration images")
+
+        rss_before = _rss_bytes()
+        baseline_engine, source_model = self._load_source(kind, source)
+        baseline = self._measure('fp32', baseline_engine, source, test_x, test_y, options, rss_before)
+
+        report = {'model': name, 'source': source, 'max_accuracy_drop': options['max_accuracy_drop'],
+                  'fp32': baseline, 'variants': {}}
+        for mode in options['mode']:
+            out = getattr(self, f"_{kind}_{mode}")(source_model, source, calibration, options)
+            rss_before = _rss_bytes()
+            engine = load_engine(self._backend_for(out), out)
+            result = self._measure(f"int8-{mode}", engine, out, test_x, test_y, options, rss_before)
+            drop = baseline['accuracy'] - result['accuracy']
+            result['accuracy_drop'] = round(drop, 4)
+            result['latency_speedup'] = round(baseline['p50_ms'] / result['p50_ms'], 2) if result['p50_ms'] else None
+            result['size_ratio'] = round(result['artifact_bytes'] / baseline['artifact_bytes'], 3)
+            result['accepted'] = drop <= options['max_accuracy_drop']
+            if not result['accepted']:
+                self._remove(out)
+                self.stdout.write(self.style.ERROR(
+                    f"  REJECTED int8-{mode}: top-1 dropped {drop:.4f} > {options['max_accuracy_drop']}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"  accepted int8-{mode}: {out} "
+                    f"(SIGN_MODEL_ENGINES['{name}'] = {{'backend': '{self._backend_for(out)}', 'path': '{out}'}})"
+                ))
+            report['variants'][mode] = result
+
+        report_path = os.path.join(options['out_dir'], f"{name}_quantization_report.json")
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Report written to {report_path}")
+
+        if not any(v['accepted'] for v in report['variants'].values()):
+            raise CommandError("Every INT8 variant failed the accuracy gate.")
+
+    # --- Data ---
+    def _preprocess(self, rgb):
+        if self.name == 'sign_classifier':
+            resized = cv2.resize(rgb, (224, 224), interpolation=cv2.INTER_AREA)
+            return to_unit_float(resized).copy()
+        return imagenet_chw(rgb, size=224).copy()
+
+    def _read(self, path):
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        return self._preprocess(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+    def _load_test_split(self, test_dir):
+        # Same convention as torchvision ImageFolder: sorted class folders -> label index
+        classes = sorted(d for d in os.listdir(test_dir) if os.path.isdir(os.path.join(test_dir, d)))
+        if not classes:
+            raise CommandError(f"No class folders in {test_dir}")
+        xs, ys = [], []
+        for label, cls in enumerate(classes):
+            folder = os.path.join(test_dir, cls)
+            for fname in sorted(os.listdir(folder)):
+                if fname.lower().endswith(IMAGE_EXTENSIONS):
+                    x = self._read(os.path.join(folder, fname))
+                    if x is not None:
+                        xs.append(x)
+                        ys.append(label)
+        return np.stack(xs), np.array(ys)
+
+    def _load_calibration(self, calibration_dir, limit):
+        paths = sorted(
+            os.path.join(root, f)
+            for root, _, files in os.walk(calibration_dir)
+            for f in files if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        rng = np.random.default_rng(0)
+        if len(paths) > limit:
+            paths = list(rng.choice(paths, size=limit, replace=False))
+        samples = [x for x in (self._read(p) for p in paths) if x is not None]
+        if not samples:
+            raise CommandError(f"No readable calibration images in {calibration_dir}")
+        return np.stack(samples)
+
+    # --- Evaluation ---
+    def _measure(self, label, engine, path, test_x, test_y, options, rss_before):
+        correct = 0
+        for start in range(0, len(test_x), 32):
+            preds = engine.predict_batch(test_x[start:start + 32])
+            correct += int((preds.argmax(axis=1) == test_y[start:start + 32]).sum())
+        accuracy = correct / len(test_x)
+
+        single = test_x[:1]
+        engine.predict_batch(single)  # warm-up
+        timings = []
+        for _ in range(options['latency_runs']):
+            started = time.perf_counter()
+            engine.predict_batch(single)
+            timings.append((time.perf_counter() - started) * 1000.0)
+        rss_after = _rss_bytes()
+
+        result = {
+            'path': path,
+            'accuracy': round(accuracy, 4),
+            'p50_ms': round(float(np.percentile(timings, 50)), 3),
+            'p95_ms': round(float(np.percentile(timings, 95)), 3),
+            'artifact_bytes': _artifact_bytes(path),
+            'rss_delta_bytes': (rss_after - rss_before) if rss_before and rss_after else None,
+        }
+        self.stdout.write(
+            f"{label:>12}: top-1 {result['accuracy']:.4f}  p50 {result['p50_ms']:.2f} ms  "
+            f"p95 {result['p95_ms']:.2f} ms  size {result['artifact_bytes'] / 1e6:.1f} MB"
+        )
+        return result
+
+    def _load_source(self, kind, source):
+        if kind == 'keras':
+            engine = load_engine('keras', source)
+            return engine, engine.model
+        from ml_models.asl_detection.architectures import build_mobilenet_v2
+        module = build_mobilenet_v2(source)
+        return TorchModuleEngine(module, path=source), module
+
+    @staticmethod
+    def _backend_for(path):
+        return 'tflite' if path.endswith('.tflite') else 'onnx'
+
+    @staticmethod
+    def _remove(path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # --- Keras -> TFLite INT8 ---
+    def _keras_dynamic(self, model, source, calibration, options):
+        import tensorflow as tf
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        return self._write(converter.convert(), options, 'int8_dynamic.tflite')
+
+    def _keras_static(self, model, source, calibration, options):
+        import tensorflow as tf
+
+        def representative_dataset():
+            for sample in calibration:
+                yield [sample[np.newaxis].astype(np.float32)]
+
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+        return self._write(converter.convert(), options, 'int8_static.tflite')
+
+    def _write(self, payload, options, suffix):
+        out = os.path.join(options['out_dir'], f"{self.name}_{suffix}")
+        with open(out, 'wb') as f:
+            f.write(payload)
+        return out
+
+    # --- PyTorch -> ONNX -> ONNX Runtime INT8 ---
+    def _fp32_onnx(self, module, source, options):
+        import torch
+        out = os.path.join(options['out_dir'], f"{self.name}_fp32.onnx")
+        # Reuse an earlier export only if it is newer than the source weights
+        if not os.path.exists(out) or os.path.getmtime(out) < os.path.getmtime(source):
+            torch.onnx.export(
+                module, torch.zeros((1, 3, 224, 224)), out,
+                input_names=['input'], output_names=['logits'],
+                dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+                opset_version=17,
+            )
+        return out
+
+    def _pytorch_dynamic(self, module, source, calibration, options):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        out = os.path.join(options['out_dir'], f"{self.name}_int8_dynamic.onnx")
+        quantize_dynamic(self._fp32_onnx(module, source, options), out, weight_type=QuantType.QInt8)
+        return out
+
+    def _pytorch_static(self, module, source, calibration, options):
+        from onnxruntime.quantization import (
+            CalibrationDataReader, QuantFormat, QuantType, quantize_static,
+        )
+
+        class _Reader(CalibrationDataReader):
+            def __init__(self):
+                self._samples = iter(calibration)
+
+            def get_next(self):
+                sample = next(self._samples, None)
+                return None if sample is None else {'input': sample[np.newaxis].astype(np.float32)}
+
+        out = os.path.join(options['out_dir'], f"{self.name}_int8_static.onnx")
+        quantize_static(
+            self._fp32_onnx(module, source, options), out, _Reader(),
+            quant_format=QuantFormat.QDQ, per_channel=True,
+            activation_type=QuantType.QInt8, weight_type=QuantType.QInt8,
+        )
+        return out
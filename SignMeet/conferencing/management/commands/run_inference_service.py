@@ -0,0 +1,94 @@
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from conferencing.inference_service import worker_addresses
+
+
+def _tasks():
+    from conferencing.services import registry
+
+    def sign(frame, stream_id):
+        return registry.get('sign_recognizer').recognize(frame, stream_id)
+
+    def wlasl(frame, stream_id):
+        return registry.get('wlasl').detect_sign(frame)
+
+    return {
+        # Hand detection + landmark/CNN classification (HTTP detect_sign views)
+        'sign': sign,
+        # MobileNetV2 on raw 229x229x3 frames (SignDetectionConsumer)
+        'wlasl': wlasl,
+    }
+
+
+def _worker_main(address, authkey, warmup_models):
+    # Spawned process: configure Django before touching the models
+    import django
+    django.setup()
+
+    from conferencing.inference_service import InferenceWorker
+    from conferencing.services import local_ready_models, registry
+
+    required = local_ready_models()
+    registry.warm_up_in_background(warmup_models)
+    worker = InferenceWorker(
+        address, authkey, _tasks(), ready=lambda: registry.is_ready(required)
+    )
+    worker.serve_forever()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the sign inference worker pool. Each worker process loads the models once "
+        "and serves web workers (SIGN_INFERENCE_SERVICE_ENABLED=1) over shared-memory "
+        "frame slots, so web and inference capacity scale independently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=getattr(settings, 'SIGN_INFERENCE_SERVICE_WORKERS', 2))
+        parser.add_argument('--host', default=getattr(settings, 'SIGN_INFERENCE_SERVICE_HOST', '127.0.0.1'))
+        parser.add_argument('--port', type=int, default=getattr(settings, 'SIGN_INFERENCE_SERVICE_PORT', 6100),
+                            help='Worker i listens on port + i')
+
+    def handle(self, *args, **options):
+        # spawn, not fork: TensorFlow/MediaPipe/PyTorch are not fork-safe once threads exist
+        context = multiprocessing.get_context('spawn')
+        authkey = settings.SIGN_INFERENCE_SERVICE_AUTHKEY
+        warmup_models = getattr(settings, 'SIGN_WARMUP_MODELS', None)
+        addresses = worker_addresses(options['host'], options['port'], options['workers'])
+
+        def start(address):
+            process = context.Process(
+                target=_worker_main, args=(address, authkey, warmup_models),
+                name=f"sign-inference-{address[1]}", daemon=True,
+            )
+            process.start()
+            return process
+
+        processes = {address: start(address) for address in addresses}
+        self.stdout.write(self.style.SUCCESS(
+            f"Started {len(processes)} inference workers on "
+            + ", ".join(f"{host}:{port}" for host, port in addresses)
+        ))
+
+        try:
+            while True:
+                time.sleep(1.0)
+                for address, process in processes.items():
+                    if not process.is_alive():
+                        self.stdout.write(self.style.WARNING(
+                            f"Inference worker {address[0]}:{address[1]} exited "
+                            f"(code {process.exitcode}), restarting"
+                        ))
+                        processes[address] = start(address)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping inference workers")
+        finally:
+            for process in processes.values():
+                process.terminate()
+            for process in processes.values():
+                process.join(timeout=5)
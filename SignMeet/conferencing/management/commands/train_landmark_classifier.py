@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from conferencing.landmarks import landmark_array, normalize_landmarks
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+class Command(BaseCommand):
+    help = (
+        "Train the landmark-vector fast-path classifier from a folder of labelled "
+        "hand images (one sub-folder per class) and save it as an .npz."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('data_dir', help='Folder containing one sub-folder of images per class')
+        parser.add_argument(
+            '--out',
+            default=getattr(settings, 'SIGN_LANDMARK_MODEL_PATH', 'ml_models/landmark_mlp.npz'),
+            help='Where to write the .npz weights',
+        )
+        parser.add_argument('--hidden', type=int, nargs='+', default=[64, 32], help='Hidden layer sizes')
+        parser.add_argument('--max-per-class', type=int, default=None, help='Cap images read per class')
+        parser.add_argument('--test-size', type=float, default=0.2, help='Held-out fraction for the report')
+
+    def handle(self, *args, **options):
+        import cv2
+        import mediapipe as mp
+        from sklearn.model_selection import train_test_split
+        from sklearn.neural_network import MLPClassifier
+
+        data_dir = options['data_dir']
+        if not os.path.isdir(data_dir):
+            raise CommandError(f"Data folder not found: {data_dir}")
+
+        classes = sorted(
+            name for name in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, name))
+        )
+        if len(classes) < 3:
+            raise CommandError("Need at least three class folders to train a softmax classifier.")
+
+        points, labels, skipped = [], [], 0
+        with mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1, min_detection_confidence=0.5) as hands:
+            for label in classes:
+                class_dir = os.path.join(data_dir, label)
+                files = sorted(f for f in os.listdir(class_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+                if options['max_per_class']:
+                    files = files[:options['max_per_class']]
+                for name in files:
+                    image = cv2.imread(os.path.join(class_dir, name))
+                    if image is None:
+                        skipped += 1
+                        continue
+                    results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+                    if not results.multi_hand_landmarks:
+                        skipped += 1
+                        continue
+                    points.append(landmark_array(results.multi_hand_landmarks[0]))
+                    labels.append(label)
+                self.stdout.write(f"{label}: {labels.count(label)} samples")
+
+        if not points:
+            raise CommandError("No hands were detected in the training images.")
+        self.stdout.write(f"Extracted {len(points)} landmark sets ({skipped} images skipped)")
+
+        features = normalize_landmarks(np.stack(points))
+        labels = np.array(labels)
+        x_train, x_test, y_train, y_test = train_test_split(
+            features, labels, test_size=options['test_size'], stratify=labels, random_state=0
+        )
+
+        mlp = MLPClassifier(hidden_layer_sizes=tuple(options['hidden']), max_iter=500, random_state=0)
+        mlp.fit(x_train, y_train)
+        self.stdout.write(f"Held-out accuracy: {mlp.score(x_test, y_test):.4f}")
+
+        arrays = {'classes': np.array(mlp.classes_, dtype=str)}
+        for i, (w, b) in enumerate(zip(mlp.coefs_, mlp.intercepts_)):
+            arrays[f'W{i}'] = w.astype(np.float32)
+            arrays[f'b{i}'] = b.astype(np.float32)
+
+        out = options['out']
+        os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+        np.savez(out, **arrays)
+        self.stdout.write(self.style.SUCCESS(f"Landmark classifier saved to {out}"))
@@ -0,0 +1,308 @@
+# SignMeet/conferencing/metrics.py
+"""
+Minimal in-process metrics in the Prometheus text exposition format.
+
+    REQUESTS = Counter('signmeet_requests_total', 'Requests.', ['endpoint'])
+    REQUESTS.labels(endpoint='detect_sign').inc()
+
+    with LATENCY.labels(stage='decode').time():
+        ...
+
+Each labelled child is a few floats behind its own lock, so recording is a
+dict lookup plus a locked add. `render()` produces the /metrics body.
+"""
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond stages to multi-second API calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics = []
+_metrics_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        with _metrics_lock:
+            _metrics.append(self)
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        # Unlabelled metrics record on their single child directly
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self):
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            yield from child.samples(self.name, self.labelnames, key)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return '\n'.join(lines)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self._value += amount
+
+    def samples(self, name, labelnames, key):
+        yield name, _format_labels(labelnames, key), self._value
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function):
+        """Read the value from `function()` at scrape time (e.g. a queue depth)."""
+        self._function = function
+
+    def samples(self, name, labelnames, key):
+        value = self._value
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except Exception:
+                value = math.nan
+        yield name, _format_labels(labelnames, key), value
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._default().dec(amount)
+
+    def set_function(self, function):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._upper_bounds = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def samples(self, name, labelnames, key):
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = 0
+        for bound, count in zip(self._upper_bounds + (math.inf,), counts):
+            cumulative += count
+            yield f"{name}_bucket", _format_labels(labelnames, key, [('le', _format_value(bound))]), cumulative
+        yield f"{name}_sum", _format_labels(labelnames, key), total
+        yield f"{name}_count", _format_labels(labelnames, key), cumulative
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+def render():
+    """Every registered metric in Prometheus text format (version 0.0.4)."""
+    with _metrics_lock:
+        metrics = list(_metrics)
+    return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+# --- Sign recognition ---
+SIGN_STAGE_SECONDS = Histogram(
+    'signmeet_sign_stage_seconds', 'Latency of each sign pipeline stage.', ['pipeline', 'stage'],
+)
+SIGN_REQUEST_SECONDS = Histogram(
+    'signmeet_sign_request_seconds', 'End-to-end latency of sign detection requests.', ['endpoint'],
+)
+SIGN_PREDICTIONS = Counter(
+    'signmeet_sign_predictions_total',
+    "Sign results by label, including 'No Hand', 'Unknown' and 'Uncertain'.",
+    ['pipeline', 'label'],
+)
+SIGN_ERRORS = Counter('signmeet_sign_errors_total', 'Failed sign detections.', ['source', 'reason'])
+SIGN_QUEUE_DEPTH = Gauge('signmeet_sign_queue_depth', 'Samples waiting in a micro-batch queue.', ['queue'])
+SIGN_ACTIVE_STREAMS = Gauge('signmeet_sign_active_streams', 'Per-stream state objects held.', ['store'])
+WEBSOCKETS_OPEN = Gauge('signmeet_websockets_open', 'Open sign detection WebSockets.')
+WEBSOCKET_FRAMES = Counter('signmeet_websocket_frames_total', 'WebSocket frames by outcome.', ['outcome'])
+
+# --- Sense Bot chat ---
+CHAT_SESSIONS = Gauge('signmeet_chat_sessions', 'Chat histories held in memory.')
+CHAT_HISTORY_CHARS = Gauge('signmeet_chat_history_chars', 'Characters held across all chat histories.')
+CHAT_REPLIES = Counter(
+    'signmeet_chat_replies_total',
+    "Chat replies by source: 'cache', 'index', 'coalesced' (shared a call) or 'gemini'.",
+    ['source'],
+)
+CHAT_INFLIGHT = Gauge('signmeet_chat_upstream_inflight', 'Gemini calls in flight.')
+CHAT_ERRORS = Counter('signmeet_chat_errors_total', "Failed chat replies ('busy', 'timeout', 'upstream').", ['reason'])
+CHAT_REPLY_SECONDS = Histogram('signmeet_chat_reply_seconds', 'Time to the complete chat reply.', ['endpoint'])
+CHAT_FIRST_TOKEN_SECONDS = Histogram(
+    'signmeet_chat_first_token_seconds', 'Time from a streaming chat request to its first reply chunk.',
+)
+
+# --- Text-to-speech ---
+TTS_CACHE_REQUESTS = Counter(
+    'signmeet_tts_cache_requests_total', "TTS cache lookups ('memory_hit', 'disk_hit', 'miss').", ['result'],
+)
+TTS_CACHE_BYTES_SAVED = Counter('signmeet_tts_cache_bytes_saved_total', 'MP3 bytes served from the TTS cache.')
+TTS_FIRST_BYTE_SECONDS = Histogram(
+    'signmeet_tts_first_byte_seconds', "Time from a TTS request to its first audio byte ('buffered', 'streamed').",
+    ['mode'],
+)
+TTS_FALLBACKS = Counter(
+    'signmeet_tts_fallbacks_total', "Clips spoken by the fallback engine ('timeout', 'error', 'cooldown').",
+    ['backend', 'reason'],
+)
+TTS_CACHE_BYTES = Gauge('signmeet_tts_cache_bytes', 'MP3 bytes held per TTS cache tier.', ['tier'])
+
+# --- Translation ---
+TRANSLATION_CACHE_REQUESTS = Counter(
+    'signmeet_translation_cache_requests_total', "Strings looked up in the translation cache ('hit', 'miss').",
+    ['result'],
+)
+
+# --- Room fan-out ---
+ROOM_SOCKETS = Gauge('signmeet_room_sockets_open', 'Open room broadcast WebSockets.')
+ROOM_EVENTS = Counter('signmeet_room_events_total', "Events published to rooms ('sign', 'caption').", ['kind'])
+ROOM_BATCHES = Counter('signmeet_room_batches_total', "Coalesced room group sends ('sent', 'error').", ['outcome'])
+
+# --- Outbound API calls (Gemini, gTTS, googletrans) ---
+OUTBOUND_SECONDS = Histogram(
+    'signmeet_outbound_request_seconds', 'Latency of calls to external APIs.', ['service', 'outcome'],
+)
+
+
+def observe_latency(histogram):
+    """View decorator (sync or async): record each call's duration on a histogram child."""
+
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                with histogram.time():
+                    return await view(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with histogram.time():
+                return view(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def track_outbound(service):
+    """Time an outbound call; outcome is 'ok' or 'error' depending on whether it raised."""
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        OUTBOUND_SECONDS.labels(service=service, outcome=outcome).observe(time.perf_counter() - started)
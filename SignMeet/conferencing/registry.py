@@ -0,0 +1,128 @@
+# SignMeet/conferencing/registry.py
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Entry states reported by /healthz/ready
+NOT_LOADED = 'not_loaded'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class _Entry:
+    def __init__(self, name, loader, warmup):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.lock = threading.Lock()
+        self.value = None
+        self.state = NOT_LOADED
+        self.error = None
+        self.load_ms = None
+        self.warmup_ms = None
+        self.retry_at = 0.0
+
+
+class ModelRegistry:
+    """
+    Named heavy dependencies (models, SDK clients) built on first use.
+
+    `register(name, loader, warmup)` only records how to build something;
+    `get(name)` runs the loader once (other callers wait on the entry lock)
+    and then the optional `warmup(value)`, e.g. a dummy inference that
+    triggers graph tracing. A loader that raises leaves the entry FAILED and
+    `get` returns None, so callers keep their "model not loaded" handling.
+    A loader that returns None (an optional model that is absent, or a
+    dependency that failed) leaves it NOT_LOADED. Either way the next `get`
+    after `retry_seconds` tries again, so a model that appears later, or a
+    transient failure at start-up, does not need a restart.
+    """
+
+    def __init__(self, retry_seconds=30.0):
+        self.retry_seconds = float(retry_seconds)
+        self._entries = {}
+        self._warmup_thread = None
+
+    def register(self, name, loader, warmup=None):
+        self._entries[name] = _Entry(name, loader, warmup)
+
+    def get(self, name):
+        entry = self._entries[name]
+        if entry.state == READY:
+            return entry.value
+        with entry.lock:
+            if entry.state != READY and time.monotonic() >= entry.retry_at:
+                self._load(entry)
+            return entry.value
+
+    def peek(self, name):
+        """The loaded value, or None, without triggering a load."""
+        entry = self._entries.get(name)
+        return entry.value if entry is not None and entry.state == READY else None
+
+    def _load(self, entry):
+        entry.state = LOADING
+        started = time.perf_counter()
+        try:
+            value = entry.loader()
+        except Exception as e:
+            entry.state = FAILED
+            entry.error = f"{type(e).__name__}: {e}"
+            entry.retry_at = time.monotonic() + self.retry_seconds
+            logger.error("could not load model=%s error=%s retry_in=%ss", entry.name, entry.error, self.retry_seconds)
+            return
+        if value is None:
+            entry.state = NOT_LOADED
+            entry.error = None
+            entry.retry_at = time.monotonic() + self.retry_seconds
+            logger.info("model not available model=%s retry_in=%ss", entry.name, self.retry_seconds)
+            return
+        entry.load_ms = round((time.perf_counter() - started) * 1000.0, 1)
+
+        if entry.warmup is not None:
+            started = time.perf_counter()
+            try:
+                entry.warmup(value)
+            except Exception as e:
+                # A failed warm-up still leaves a usable model
+                logger.warning("warm-up failed model=%s error=%s", entry.name, e)
+            entry.warmup_ms = round((time.perf_counter() - started) * 1000.0, 1)
+
+        entry.value = value
+        entry.error = None
+        entry.state = READY
+        logger.info("model ready model=%s load_ms=%s warmup_ms=%s", entry.name, entry.load_ms, entry.warmup_ms)
+
+    def warm_up(self, names=None):
+        """Load (and warm) the given entries, or all registered ones."""
+        for name in names or list(self._entries):
+            if name in self._entries:
+                self.get(name)
+
+    def warm_up_in_background(self, names=None):
+        """Start warm-up on a daemon thread (once per process) and return it."""
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(
+                target=self.warm_up, args=(names,), name='model-warmup', daemon=True
+            )
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def is_ready(self, names):
+        return all(
+            name in self._entries and self._entries[name].state == READY for name in names
+        )
+
+    def status(self):
+        return {
+            name: {
+                'state': entry.state,
+                'load_ms': entry.load_ms,
+                'warmup_ms': entry.warmup_ms,
+                'error': entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
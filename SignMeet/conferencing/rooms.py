@@ -0,0 +1,160 @@
+# SignMeet/conferencing/rooms.py
+"""
+Room-wide fan-out of recognized signs and captions over Channels groups.
+
+    room_broadcaster.publish('team-standup', 'sign', 'alice', 'A')
+
+Events are buffered per room and flushed once per `tick_seconds` as a
+single group_send, so a burst of detections costs one channel-layer
+message per room per tick, whatever the number of participants. Every
+socket in the group (RoomSignConsumer) forwards the same pre-encoded
+payload:
+
+    {"s": 17, "e": [["alice", "s", "HI"], ["bob", "c", "see you at ten"]]}
+
+`s` is the room's batch sequence number; each `e` entry is
+[user, kind, text] with kind 's' (sign) or 'c' (caption). Within a tick a
+user's sign letters are concatenated and a caption replaces the previous
+one, since captions are re-sent as they grow. Publishers are named by the
+server (participant_name), never by text the client sends.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import secrets
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from .metrics import ROOM_BATCHES, ROOM_EVENTS
+
+logger = logging.getLogger(__name__)
+
+KINDS = {'sign': 's', 'caption': 'c'}
+
+# Channels group names allow ASCII letters, digits, '-', '_' and '.', under 100 chars
+_ROOM_NAME = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def group_name(room):
+    """Channels group for `room`, or None if the room name is not usable."""
+    if not room or not _ROOM_NAME.match(room):
+        return None
+    return f'sign_room.{room}'
+
+
+def participant_name(user=None, session_key=None, fallback=None):
+    """
+    Name shown for a publisher: the signed-in username, else a guest id
+    derived from the session key (or `fallback`, e.g. a stream id), so one
+    participant cannot publish under another's name.
+    """
+    if user is not None and getattr(user, 'is_authenticated', False):
+        return user.get_username()
+    seed = session_key or fallback or secrets.token_hex(8)
+    return 'guest-' + hashlib.sha256(str(seed).encode()).hexdigest()[:8]
+
+
+class RoomBroadcaster:
+    """
+    Per-process coalescing publisher. `publish()` is thread-safe and may be
+    called from sync views; flushes run on the server's event loop (captured
+    from the first async caller). Without a running loop (e.g. under WSGI)
+    each publish is sent straight away instead of being coalesced.
+    """
+
+    def __init__(self, tick_seconds=0.1, max_text_chars=200):
+        self.tick_seconds = float(tick_seconds)
+        self.max_text_chars = int(max_text_chars)
+        self._loop = None
+        self._lock = threading.Lock()
+        self._pending = {}  # room -> {(user, kind): [user, kind, text]}
+        self._sequence = {}  # room -> last batch number
+        self._events = 0
+        self._batches = 0
+        self._entries = 0
+        self._failures = 0
+
+    def attach(self):
+        """Call from async code (e.g. a consumer's connect) to run flushes on this loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def publish(self, room, kind, user, text):
+        """Queue one event for the room's next tick; False if the room or kind is invalid."""
+        if group_name(room) is None or kind not in KINDS or not text:
+            return False
+        code = KINDS[kind]
+        user = str(user or 'guest')[:64]
+        text = str(text)
+        with self._lock:
+            events = self._pending.get(room)
+            first = events is None
+            if first:
+                events = self._pending[room] = {}
+            entry = events.get((user, code))
+            if entry is not None and code == 's':
+                entry[2] = (entry[2] + text)[-self.max_text_chars:]
+            else:
+                events[(user, code)] = [user, code, text[:self.max_text_chars]]
+            self._events += 1
+        ROOM_EVENTS.labels(kind=kind).inc()
+        if first:
+            self._schedule(room)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tick_seconds': self.tick_seconds,
+                'rooms_pending': len(self._pending),
+                'rooms_seen': len(self._sequence),
+                'events': self._events,
+                'batches': self._batches,
+                'entries_sent': self._entries,
+                'failures': self._failures,
+            }
+
+    # --- Internals ---
+    def _schedule(self, room):
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            # No event loop to tick on: send this event right away
+            async_to_sync(self._flush)(room)
+            return
+        loop.call_soon_threadsafe(loop.call_later, self.tick_seconds, self._start_flush, room)
+
+    def _start_flush(self, room):
+        asyncio.ensure_future(self._flush(room))
+
+    async def _flush(self, room):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        with self._lock:
+            events = self._pending.pop(room, None)
+            if not events:
+                return
+            sequence = self._sequence[room] = self._sequence.get(room, 0) + 1
+        payload = json.dumps({'s': sequence, 'e': list(events.values())}, separators=(',', ':'), ensure_ascii=False)
+        try:
+            await get_channel_layer().group_send(group_name(room), {'type': 'room.batch', 'payload': payload})
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            ROOM_BATCHES.labels(outcome='error').inc()
+            logger.warning("room broadcast failed room=%s events=%d error=%s", room, len(events), e)
+            return
+        with self._lock:
+            self._batches += 1
+            self._entries += len(events)
+        ROOM_BATCHES.labels(outcome='sent').inc()
+        logger.debug("room broadcast room=%s seq=%d events=%d", room, sequence, len(events))
+
+
+room_broadcaster = RoomBroadcaster(
+    tick_seconds=getattr(settings, 'SIGN_ROOM_TICK_SECONDS', 0.1),
+    max_text_chars=getattr(settings, 'SIGN_ROOM_MAX_TEXT_CHARS', 200),
+)
@@ -6,4 +6,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path('/sign_detection', consumers.SignDetectionConsumer.as_asgi()),
+    re_path(r'^ws/sign/(?P<room_name>[A-Za-z0-9_-]+)/$', consumers.RoomSignConsumer.as_asgi()),
 ]
\ No newline at end of file
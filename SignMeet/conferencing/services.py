@@ -0,0 +1,254 @@
+# SignMeet/conferencing/services.py
+"""
+Heavy dependencies for sign detection, registered lazily.
+
+Nothing here imports TensorFlow, MediaPipe or PyTorch at module import;
+each loader runs on first `registry.get(name)` or during the background
+warm-up started from asgi.py / wsgi.py.
+"""
+import importlib
+import logging
+import os
+
+import numpy as np
+from django.conf import settings
+
+from .batching import BatchScheduler
+from .decoding import decode_image_bytes
+from .landmarks import LandmarkClassifier, landmark_array, normalize_landmarks
+from .metrics import SIGN_ACTIVE_STREAMS, SIGN_QUEUE_DEPTH, SIGN_STAGE_SECONDS
+from .registry import ModelRegistry
+from .streams import StreamStore
+from ml_models.engines import configured_engine
+from ml_models.pipeline import LandmarkCrop, SignRecognizer, Top1
+from ml_models.preprocessing import to_unit_float
+
+logger = logging.getLogger(__name__)
+
+registry = ModelRegistry(retry_seconds=getattr(settings, 'SIGN_MODEL_RETRY_SECONDS', 30.0))
+
+
+def observe_stage(pipeline, stage, seconds):
+    """SignRecognizer observer: per-stage latency histograms on /metrics."""
+    SIGN_STAGE_SECONDS.labels(pipeline=pipeline, stage=stage).observe(seconds)
+
+# Labels of the 224x224 sign classifier
+CLASS_NAMES = [
+    '1', '2', '3', '4', '5', '6', '7', '8', '9',
+    'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J',
+    'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T',
+    'U', 'V', 'W', 'X', 'Y', 'Z'
+]
+
+# Default classifier artifact; the runtime (Keras .h5, SavedModel, TFLite, ONNX
+# Runtime, TorchScript) comes from settings.SIGN_MODEL_ENGINES['sign_classifier'].
+MODEL_PATH = "ml_models/best_sign_model.h5"
+
+
+# --- Keras/ONNX/... sign classifier behind the micro-batcher ---
+def _load_sign_classifier():
+    engine = configured_engine('sign_classifier', {'backend': 'keras', 'path': MODEL_PATH})
+    logger.info("sign classifier loaded engine=%r", engine)
+    # Batch concurrent detect_sign requests into one forward pass
+    scheduler = BatchScheduler(
+        engine.predict_batch,
+        max_batch_size=getattr(settings, 'SIGN_BATCH_MAX_SIZE', 8),
+        max_wait_ms=getattr(settings, 'SIGN_BATCH_MAX_WAIT_MS', 10),
+        max_queue_depth=getattr(settings, 'SIGN_BATCH_QUEUE_DEPTH', 64),
+        name='sign_classifier',
+    )
+    SIGN_QUEUE_DEPTH.labels(queue='sign_classifier').set_function(lambda: scheduler.stats()['queue_depth'])
+    return scheduler
+
+
+def _warm_sign_classifier(scheduler):
+    scheduler.predict(np.zeros((224, 224, 3), dtype=np.float32))
+
+
+registry.register('sign_classifier', _load_sign_classifier, warmup=_warm_sign_classifier)
+
+
+# --- MediaPipe hands ---
+def new_hand_tracker(static_image_mode=False):
+    """
+    A MediaPipe Hands graph. static_image_mode=True runs palm detection on
+    every frame (single images); False tracks landmarks across a stream.
+    max_num_hands=1 because we only care about one sign at a time.
+    """
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=1,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+    )
+
+
+def _warm_hand_detector(detector):
+    detector.process(np.zeros((224, 224, 3), dtype=np.uint8))
+
+
+registry.register('hand_detector', lambda: new_hand_tracker(static_image_mode=True), warmup=_warm_hand_detector)
+
+# Streaming mode: one tracking (static_image_mode=False) Hands graph per client
+# stream, so MediaPipe reuses the previous frame's landmarks instead of running
+# palm detection every frame. Idle streams are evicted (LRU + TTL).
+hand_trackers = StreamStore(
+    factory=lambda: new_hand_tracker(static_image_mode=False),
+    max_streams=getattr(settings, 'SIGN_TRACKER_MAX_STREAMS', 256),
+    ttl_seconds=getattr(settings, 'SIGN_TRACKER_TTL_SECONDS', 30),
+    on_evict=lambda tracker: tracker.close(),
+    name='hand_trackers',
+)
+SIGN_ACTIVE_STREAMS.labels(store='hand_trackers').set_function(lambda: len(hand_trackers))
+
+
+class MediaPipeHandStage:
+    """detect_hand stage: per-stream tracker when a stream id is given, else the static detector."""
+
+    def __init__(self, detector, trackers):
+        self.detector = detector
+        self.trackers = trackers
+
+    def __call__(self, frame, stream_id=None):
+        # MediaPipe expects RGB images, which the decoders provide
+        if stream_id:
+            with self.trackers.acquire(stream_id) as tracker:
+                results = tracker.process(frame)
+        else:
+            results = self.detector.process(frame)
+        if not results.multi_hand_landmarks:
+            return None
+        return landmark_array(results.multi_hand_landmarks[0])  # (21, 3) normalized x, y, z
+
+
+# --- Landmark-vector fast path (optional) ---
+def _load_landmark_classifier():
+    path = getattr(settings, 'SIGN_LANDMARK_MODEL_PATH', 'ml_models/landmark_mlp.npz')
+    if not os.path.exists(path):
+        logger.info("no landmark classifier at %s, every frame uses the CNN", path)
+        return None
+    return LandmarkClassifier.from_npz(path, threshold=getattr(settings, 'SIGN_LANDMARK_CONFIDENCE', 0.9))
+
+
+registry.register('landmark_classifier', _load_landmark_classifier)
+
+
+def landmark_fast_path(classifier):
+    """fast_path stage: answer confident frames from the landmark vector alone."""
+
+    def fast_path(points):
+        label, confidence, accepted = classifier.classify(normalize_landmarks(points))
+        if not accepted:
+            return None
+        return {'label': label, 'confidence': round(confidence * 100, 2), 'path': 'landmark'}
+
+    return fast_path
+
+
+def scheduled_classify(scheduler):
+    """classify stage that submits every row to the micro-batcher, so rows from
+    concurrent requests share forward passes."""
+
+    def classify(batch):
+        futures = [scheduler.submit(sample) for sample in batch]
+        return np.stack([future.result() for future in futures])
+
+    return classify
+
+
+# --- The HTTP sign pipeline: MediaPipe -> landmark MLP or 224x224 CNN ---
+def _load_sign_recognizer():
+    scheduler = registry.get('sign_classifier')
+    detector = registry.get('hand_detector')
+    if scheduler is None or detector is None:
+        return None
+    landmark_classifier = registry.get('landmark_classifier')
+    return SignRecognizer(
+        decode=lambda data: decode_image_bytes(data, getattr(settings, 'SIGN_DECODE_MIN_SIDE', 320)),
+        detect_hand=MediaPipeHandStage(detector, hand_trackers),
+        fast_path=landmark_fast_path(landmark_classifier) if landmark_classifier else None,
+        crop=LandmarkCrop(size=224, padding=20),
+        preprocess=to_unit_float,  # float32 in [0, 1], (224, 224, 3)
+        classify=scheduled_classify(scheduler),
+        postprocess=Top1(CLASS_NAMES, path='cnn'),
+        name='sign_classifier',
+        observer=observe_stage,
+    )
+
+
+registry.register('sign_recognizer', _load_sign_recognizer)
+
+
+# --- MobileNetV2 WebSocket pipeline (imports PyTorch) ---
+def _load_wlasl():
+    module = importlib.import_module('ml_models.asl_detection.wlasl_detection')
+    module.recognizer.observer = observe_stage
+    return module
+
+
+def _warm_wlasl(module):
+    module.recognizer.recognize(np.zeros((229, 229, 3), dtype=np.uint8))
+
+
+registry.register('wlasl', _load_wlasl, warmup=_warm_wlasl)
+
+
+# --- Out-of-process inference (manage.py run_inference_service) ---
+def inference_service_enabled():
+    return getattr(settings, 'SIGN_INFERENCE_SERVICE_ENABLED', False)
+
+
+def _load_inference_client():
+    if not inference_service_enabled():
+        return None
+    from .inference_service import InferenceClient, worker_addresses
+    return InferenceClient(
+        worker_addresses(
+            getattr(settings, 'SIGN_INFERENCE_SERVICE_HOST', '127.0.0.1'),
+            getattr(settings, 'SIGN_INFERENCE_SERVICE_PORT', 6100),
+            getattr(settings, 'SIGN_INFERENCE_SERVICE_WORKERS', 2),
+        ),
+        authkey=settings.SIGN_INFERENCE_SERVICE_AUTHKEY,
+        slots=getattr(settings, 'SIGN_INFERENCE_SLOTS', 8),
+        slot_bytes=getattr(settings, 'SIGN_INFERENCE_SLOT_BYTES', 1920 * 1080 * 3),
+        timeout=getattr(settings, 'SIGN_INFERENCE_TIMEOUT_SECONDS', 5.0),
+    )
+
+
+registry.register('inference_service', _load_inference_client, warmup=lambda client: client.ping())
+
+
+def local_ready_models():
+    return getattr(settings, 'SIGN_READY_MODELS', ['sign_classifier', 'hand_detector', 'sign_recognizer'])
+
+
+def readiness():
+    """
+    (ready, required) for /healthz/ready. With the inference service enabled
+    this process loads no models; it is ready once every worker answers a
+    ping with its own models warmed.
+    """
+    if inference_service_enabled():
+        required = ['inference_service']
+        client = registry.peek('inference_service')
+        if client is None:
+            return False, required
+        try:
+            return all(client.ping()), required
+        except Exception:
+            return False, required
+    required = local_ready_models()
+    return registry.is_ready(required), required
+
+
+def start_background_warmup():
+    """Warm the configured models on a daemon thread (called by asgi.py / wsgi.py)."""
+    if not getattr(settings, 'SIGN_WARMUP_ON_START', True):
+        return None
+    if inference_service_enabled():
+        # Models live in the worker pool; only connect to it
+        return registry.warm_up_in_background(['inference_service'])
+    # Modules that register further loaders (e.g. the Gemini client)
+    importlib.import_module('conferencing.views')
+    return registry.warm_up_in_background(getattr(settings, 'SIGN_WARMUP_MODELS', None))
@@ -0,0 +1,71 @@
+# SignMeet/conferencing/smoothing.py
+from collections import Counter, deque
+
+# Per-frame labels that mean "no letter in this frame"
+BLANK_LABELS = ('No Hand', 'Unknown')
+
+# Decoder states reported to the client
+STATE_IDLE = 'idle'        # no hand in view: no new letter is possible
+STATE_PENDING = 'pending'  # collecting votes, nothing stable yet
+STATE_HOLDING = 'holding'  # a letter is stable and was already emitted
+
+
+class SignDecoder:
+    """
+    Turns a stream of per-frame (label, confidence) pairs into letters.
+
+    The last `window` predictions are kept in a ring buffer. A label becomes
+    stable once it holds `min_votes` of them with a mean confidence of at
+    least `min_confidence` (percent, as in the detect_sign response), and is
+    emitted exactly once. The same letter is only emitted again after the
+    hand has left the frame for `idle_frames` frames, or another letter has
+    been emitted in between (hysteresis against flicker).
+    """
+
+    def __init__(self, window=6, min_votes=4, min_confidence=60.0, idle_frames=4):
+        self.window = max(1, int(window))
+        self.min_votes = max(1, min(int(min_votes), self.window))
+        self.min_confidence = float(min_confidence)
+        self.idle_frames = max(1, int(idle_frames))
+
+        self.history = deque(maxlen=self.window)
+        self.last_emitted = None
+        self.blank_run = 0
+
+    def reset(self):
+        self.history.clear()
+        self.last_emitted = None
+        self.blank_run = 0
+
+    def update(self, label, confidence):
+        """Feed one frame's prediction; returns {'emit': letter or None, 'state': ...}."""
+        if label is None or label in BLANK_LABELS:
+            self.history.append((None, 0.0))
+            self.blank_run += 1
+            if self.blank_run >= self.idle_frames:
+                # Hand is gone: forget old votes and allow the same letter again
+                if self.blank_run == self.idle_frames:
+                    self.history.clear()
+                self.last_emitted = None
+                return {'emit': None, 'state': STATE_IDLE}
+        else:
+            self.history.append((label, float(confidence)))
+            self.blank_run = 0
+
+        votes = Counter(lbl for lbl, _ in self.history if lbl is not None)
+        if not votes:
+            return {'emit': None, 'state': STATE_PENDING}
+
+        top, count = votes.most_common(1)[0]
+        if count < self.min_votes:
+            return {'emit': None, 'state': STATE_PENDING}
+
+        mean_confidence = sum(conf for lbl, conf in self.history if lbl == top) / count
+        if mean_confidence < self.min_confidence:
+            return {'emit': None, 'state': STATE_PENDING}
+
+        if top == self.last_emitted:
+            return {'emit': None, 'state': STATE_HOLDING}
+
+        self.last_emitted = top
+        return {'emit': top, 'state': STATE_HOLDING}
@@ -55,6 +55,96 @@ document.addEventListener('DOMContentLoaded', () => {
 
         chatWindow.appendChild(messageDiv);
         chatWindow.scrollTop = chatWindow.scrollHeight; // Auto-scroll to bottom
+        return p;
+    }
+
+    // --- Non-streaming fallback (one JSON reply) ---
+    async function sendMessage(message) {
+        const response = await fetch('/chat/send_message/', { // This URL must match your urls.py
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrftoken
+            },
+            body: JSON.stringify({ message: message })
+        });
+
+        if (!response.ok) {
+            throw new Error('Network response was not ok.');
+        }
+
+        const data = await response.json();
+
+        // Display bot's reply
+        if (data.reply) {
+            addMessage(data.reply, 'bot');
+        } else if (data.error) {
+            addMessage(`Error: ${data.error}`, 'bot');
+        }
+    }
+
+    // --- Streaming reply (Server-Sent Events over a POST response) ---
+    // Returns false if streaming is unavailable, so the caller can fall back.
+    async function streamMessage(message) {
+        const response = await fetch('/chat/stream/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream',
+                'X-CSRFToken': csrftoken
+            },
+            body: JSON.stringify({ message: message })
+        });
+        if (response.status === 503 || response.status === 504) {
+            // Saturated or timed out upstream: retrying right away would not help
+            const data = await response.json();
+            addMessage(`Error: ${data.error}`, 'bot');
+            return true;
+        }
+        if (!response.ok || !response.body) {
+            return false;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let bubble = null;
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                let payload = '';
+                rawEvent.split('\n').forEach((line) => {
+                    if (line.startsWith('event: ')) eventName = line.slice(7);
+                    else if (line.startsWith('data: ')) payload += line.slice(6);
+                });
+                const data = JSON.parse(payload);
+
+                if (eventName === 'error') {
+                    addMessage(`Error: ${data.error}`, 'bot');
+                } else if (eventName === 'done') {
+                    if (!bubble && data.reply) addMessage(data.reply, 'bot');
+                } else if (data.delta) {
+                    // 3. Grow the bot's reply as chunks arrive
+                    if (!bubble) {
+                        bubble = addMessage(data.delta, 'bot');
+                    } else {
+                        bubble.textContent += data.delta;
+                        chatWindow.scrollTop = chatWindow.scrollHeight;
+                    }
+                }
+            }
+        }
+        return true;
     }
 
     // --- Handle Form Submission (Sending a message) ---
@@ -68,29 +158,11 @@ document.addEventListener('DOMContentLoaded', () => {
         messageInput.value = '';
 
         try {
-            // 2. Send message to Django backend
-            const response = await fetch('/chat/send_message/', { // This URL must match your urls.py
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': csrftoken
-                },
-                body: JSON.stringify({ message: message })
-            });
-
-            if (!response.ok) {
-                throw new Error('Network response was not ok.');
-            }
-
-            const data = await response.json();
-
-            // 3. Display bot's reply
-            if (data.reply) {
-                addMessage(data.reply, 'bot');
-            } else if (data.error) {
-                addMessage(`Error: ${data.error}`, 'bot');
+            // 2. Send message to Django backend, streaming when the server supports it
+            const streamed = await streamMessage(message);
+            if (!streamed) {
+                await sendMessage(message);
             }
-
         } catch (error) {
             console.error('Error:', error);
             addMessage('Error: Could not connect to the server.', 'bot');
@@ -0,0 +1,153 @@
+# SignMeet/conferencing/streams.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class _StreamSlot:
+    __slots__ = ('value', 'lock', 'last_used')
+
+    def __init__(self, value):
+        self.value = value
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class StreamStore:
+    """
+    Bounded per-stream state keyed by a client stream/session id.
+
+    Values are built on first use by `factory()`. The least recently used
+    stream is evicted once `max_streams` is exceeded, and streams idle for
+    longer than `ttl_seconds` are evicted on the next access. `on_evict(value)`
+    runs (outside the store lock, holding the stream's own lock) so resources
+    such as MediaPipe graphs can be closed.
+    """
+
+    def __init__(self, factory, max_streams=256, ttl_seconds=60, on_evict=None, name='streams'):
+        self.factory = factory
+        self.max_streams = max(1, int(max_streams))
+        self.ttl_seconds = float(ttl_seconds)
+        self.on_evict = on_evict
+        self.name = name
+
+        self._slots = OrderedDict()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+
+    @contextmanager
+    def acquire(self, stream_id):
+        """Yield the stream's value while holding its per-stream lock."""
+        slot = self._slot(stream_id)
+        with slot.lock:
+            yield slot.value
+
+    def get(self, stream_id):
+        """Return the stream's value without locking it (for thread-safe values)."""
+        return self._slot(stream_id).value
+
+    def discard(self, stream_id):
+        with self._lock:
+            slot = self._slots.pop(stream_id, None)
+        if slot is not None:
+            self._close([slot])
+
+    def sweep(self):
+        """Evict idle streams; returns how many were removed."""
+        with self._lock:
+            expired = self._pop_expired(time.monotonic())
+        self._close(expired)
+        return len(expired)
+
+    def evict_lru(self, keep=None):
+        """Evict the least recently used stream other than `keep`; False if none is left."""
+        with self._lock:
+            for stream_id in self._slots:
+                if stream_id != keep:
+                    slot = self._slots.pop(stream_id)
+                    self._evicted_lru += 1
+                    break
+            else:
+                return False
+        self._close([slot])
+        return True
+
+    def values(self):
+        """Snapshot of the current values, least recently used first."""
+        with self._lock:
+            return [slot.value for slot in self._slots.values()]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name': self.name,
+                'active': len(self._slots),
+                'max_streams': self.max_streams,
+                'ttl_seconds': self.ttl_seconds,
+                'created': self._created,
+                'evicted_lru': self._evicted_lru,
+                'evicted_ttl': self._evicted_ttl,
+            }
+
+    # --- Internals ---
+    def _slot(self, stream_id):
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_expired(time.monotonic()))
+            slot = self._touch(stream_id)
+        if slot is None:
+            # Build outside the store lock: factories may be slow (graph setup).
+            fresh = _StreamSlot(self.factory())
+            with self._lock:
+                slot = self._touch(stream_id)
+                if slot is None:
+                    slot = fresh
+                    self._slots[stream_id] = slot
+                    self._created += 1
+                    while len(self._slots) > self.max_streams:
+                        _, oldest = self._slots.popitem(last=False)
+                        evicted.append(oldest)
+                        self._evicted_lru += 1
+                else:
+                    # Another request created the stream first; drop ours.
+                    evicted.append(fresh)
+        self._close(evicted)
+        return slot
+
+    def _touch(self, stream_id):
+        slot = self._slots.get(stream_id)
+        if slot is not None:
+            self._slots.move_to_end(stream_id)
+            slot.last_used = time.monotonic()
+        return slot
+
+    def _pop_expired(self, now):
+        # Slots are kept in last-used order, so expired ones sit at the front.
+        expired = []
+        while self._slots:
+            stream_id, slot = next(iter(self._slots.items()))
+            if now - slot.last_used < self.ttl_seconds:
+                break
+            del self._slots[stream_id]
+            expired.append(slot)
+            self._evicted_ttl += 1
+        return expired
+
+    def _close(self, slots):
+        if not self.on_evict:
+            return
+        for slot in slots:
+            with slot.lock:
+                try:
+                    self.on_evict(slot.value)
+                except Exception as e:
+                    logger.warning("error closing stream state store=%s error=%s", self.name, e)
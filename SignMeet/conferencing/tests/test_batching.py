@@ -0,0 +1,69 @@
+import threading
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from conferencing.batching import BatchQueueFull, BatchScheduler
+
+
+class GatedModel:
+    """predict_fn that records batch sizes and blocks until released."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        self.started.set()
+        self.release.wait(5)
+        return inputs * 10
+
+
+class BatchSchedulerTests(SimpleTestCase):
+    def test_each_caller_gets_its_own_row(self):
+        scheduler = BatchScheduler(lambda inputs: inputs.sum(axis=1), max_batch_size=4, max_wait_ms=20)
+        futures = [scheduler.submit(np.array([i, i])) for i in range(6)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [0, 2, 4, 6, 8, 10])
+        self.assertEqual(scheduler.stats()['samples'], 6)
+
+    def test_samples_queued_during_a_pass_share_the_next_batch(self):
+        model = GatedModel()
+        scheduler = BatchScheduler(model, max_batch_size=3, max_wait_ms=0)
+        first = scheduler.submit(np.array([1]))
+        self.assertTrue(model.started.wait(5))
+        rest = [scheduler.submit(np.array([i])) for i in range(2, 6)]
+        model.release.set()
+
+        self.assertEqual(first.result(timeout=5), [10])
+        self.assertEqual([f.result(timeout=5)[0] for f in rest], [20, 30, 40, 50])
+        self.assertEqual(model.batch_sizes, [1, 3, 1])
+        stats = scheduler.stats()
+        self.assertEqual((stats['batches'], stats['full_batches'], stats['max_batch_seen']), (3, 1, 3))
+
+    def test_rejects_when_queue_is_full(self):
+        model = GatedModel()
+        scheduler = BatchScheduler(model, max_batch_size=1, max_queue_depth=2)
+        scheduler.submit(np.array([1]))
+        self.assertTrue(model.started.wait(5))
+        scheduler.submit(np.array([2]))
+        scheduler.submit(np.array([3]))
+        with self.assertRaises(BatchQueueFull):
+            scheduler.submit(np.array([4]))
+        model.release.set()
+        self.assertEqual(scheduler.stats()['rejected'], 1)
+
+    def test_predict_error_fails_the_whole_batch(self):
+        def broken(inputs):
+            raise RuntimeError('model crashed')
+
+        scheduler = BatchScheduler(broken, max_batch_size=2, max_wait_ms=50)
+        futures = [scheduler.submit(np.array([i])) for i in range(2)]
+        for future in futures:
+            with self.assertRaisesMessage(RuntimeError, 'model crashed'):
+                future.result(timeout=5)
+        self.assertEqual(scheduler.stats()['errors'], 1)
+        # The worker survives and serves the next batch
+        scheduler.predict_fn = lambda inputs: inputs
+        self.assertEqual(scheduler.predict(np.array([7]), timeout=5), [7])
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from conferencing.caching import TTLCache
+
+
+class TTLCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(ttl_seconds=10)
+        with mock.patch('conferencing.caching.time.monotonic', return_value=100.0):
+            cache.put('a', 1)
+        with mock.patch('conferencing.caching.time.monotonic', return_value=109.9):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('conferencing.caching.time.monotonic', return_value=110.0):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase
+
+from conferencing import views
+from conferencing.chat import ChatBusy, ChatSessionStore, LoopSafeSemaphore, UpstreamLimiter
+from conferencing.faq import FaqAnswerer, KnowledgeIndex
+
+INSTRUCTIONS = """
+### KNOWLEDGE ###
+---
+#### GENERAL
+- Screen sharing: Click Share Screen in the bottom toolbar.
+- Recording: Host → Click Record to save the meeting to the cloud.
+---
+"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Answers with a numbered reply and records the prompts it was sent."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def generate_content_async(self, contents, stream=False):
+        self.calls.append(contents)
+        await asyncio.sleep(self.delay)
+        reply = f"reply {len(self.calls)}"
+        if not stream:
+            return FakeResponse(reply)
+
+        async def chunks():
+            for word in reply.split(' '):
+                yield FakeResponse(word + ' ')
+        return chunks()
+
+
+def make_store(**kwargs):
+    faq = FaqAnswerer(KnowledgeIndex.from_instructions(INSTRUCTIONS))
+    return ChatSessionStore(faq=faq, limiter=UpstreamLimiter(queue_timeout=1, timeout=5), **kwargs)
+
+
+class ChatFaqTests(SimpleTestCase):
+    def test_first_message_answered_from_knowledge_index(self):
+        store, model = make_store(), FakeModel()
+        reply = asyncio.run(store.send('a', 'How do I share my screen?', model))
+        self.assertIn('Share Screen', reply)
+        self.assertEqual(model.calls, [])
+
+    def test_follow_up_skips_cache_and_calls_gemini(self):
+        store, model = make_store(), FakeModel()
+
+        async def scenario():
+            # Session "a" caches a context-free reply to "tell me a joke"
+            await store.send('a', 'tell me a joke', model)
+            # Session "b" asks the same thing mid-conversation
+            await store.send('b', 'How do I share my screen?', model)
+            return await store.send('b', 'tell me a joke', model)
+
+        reply = asyncio.run(scenario())
+        self.assertEqual(reply, 'reply 2')
+        self.assertEqual(len(model.calls), 2)
+        self.assertEqual(len(model.calls[1]), 3)  # history (2 entries) + the new message
+
+    def test_streamed_follow_up_skips_cache(self):
+        store, model = make_store(), FakeModel()
+
+        async def scenario():
+            await store.send('a', 'tell me a joke', model)
+            await store.send('b', 'How do I share my screen?', model)
+            return ''.join([piece async for piece in store.stream('b', 'tell me a joke', model)])
+
+        self.assertEqual(asyncio.run(scenario()).strip(), 'reply 2')
+        self.assertEqual(len(model.calls), 2)
+
+    def test_closing_a_stream_early_releases_the_upstream_slot(self):
+        store, model = make_store(), FakeModel()
+
+        async def scenario():
+            chunks = store.stream('a', 'tell me a joke', model)
+            first = await chunks.__anext__()
+            inflight = store.limiter.stats()['inflight']
+            await chunks.aclose()
+            return first, inflight, store.limiter.stats()['inflight']
+
+        self.assertEqual(asyncio.run(scenario()), ('reply ', 1, 0))
+
+    def test_cancelled_leader_hands_the_call_to_a_follower(self):
+        faq = FaqAnswerer(KnowledgeIndex.from_instructions(INSTRUCTIONS))
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return f"reply {len(calls)}"
+
+        async def scenario():
+            leader = asyncio.ensure_future(faq.fetch('tell me a joke', call))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(faq.fetch('Tell me a joke!', call))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(scenario()), 'reply 2')
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(faq.cache.get('tell me a joke'), 'reply 2')
+
+
+def run_on_separate_loops(*coroutine_factories):
+    """
+    Run each coroutine on its own thread and event loop at the same time,
+    as async views do under WSGI (async_to_sync, one loop per request).
+    Returns their results (or exceptions) in order.
+    """
+    results = [None] * len(coroutine_factories)
+
+    def worker(i, factory):
+        try:
+            results[i] = asyncio.run(asyncio.wait_for(factory(), 5))
+        except BaseException as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i, f)) for i, f in enumerate(coroutine_factories)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+class CrossLoopTests(SimpleTestCase):
+    def test_identical_first_questions_share_one_call(self):
+        store, model = make_store(), FakeModel(delay=0.2)
+        results = run_on_separate_loops(
+            lambda: store.send('a', 'tell me a joke', model),
+            lambda: store.send('b', 'Tell me a joke!', model),
+        )
+        self.assertEqual(results, ['reply 1', 'reply 1'])
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(store.faq.stats()['coalesced'], 1)
+
+    def test_messages_in_one_session_are_serialized(self):
+        store, model = make_store(), FakeModel(delay=0.1)
+        results = run_on_separate_loops(
+            lambda: store.send('a', 'first question', model),
+            lambda: store.send('a', 'second question', model),
+        )
+        self.assertEqual(sorted(results), ['reply 1', 'reply 2'])
+        # The second call saw the first exchange in its history
+        self.assertEqual(sorted(len(contents) for contents in model.calls), [1, 3])
+        self.assertEqual(len(store.sessions.get('a').turns), 2)
+
+    def test_limiter_rejects_when_full_and_frees_slots(self):
+        limiter = UpstreamLimiter(max_inflight=1, queue_timeout=0.05, timeout=5)
+
+        async def hold():
+            return await limiter.call(lambda: asyncio.sleep(0.3, 'done'))
+
+        results = run_on_separate_loops(hold, hold)
+        self.assertEqual(sorted(map(type, results), key=str), sorted([str, ChatBusy], key=str))
+        self.assertEqual(limiter.stats()['inflight'], 0)
+        self.assertEqual(run_on_separate_loops(hold), ['done'])
+
+
+class LoopSafeSemaphoreTests(SimpleTestCase):
+    def test_timed_out_waiter_does_not_leak_the_slot(self):
+        semaphore = LoopSafeSemaphore(1)
+
+        async def scenario():
+            await semaphore.acquire()
+            with self.assertRaises(asyncio.TimeoutError):
+                await semaphore.acquire(timeout=0.01)
+            semaphore.release()
+            await semaphore.acquire(timeout=0.1)
+            semaphore.release()
+
+        asyncio.run(scenario())
+        self.assertFalse(semaphore.locked())
+
+    def test_waiter_on_another_loop_is_woken(self):
+        semaphore = LoopSafeSemaphore(1)
+        order = []
+
+        async def holder():
+            async with semaphore:
+                order.append('holder')
+                await asyncio.sleep(0.1)
+
+        async def waiter():
+            await asyncio.sleep(0.02)
+            async with semaphore:
+                order.append('waiter')
+
+        run_on_separate_loops(holder, waiter)
+        self.assertEqual(order, ['holder', 'waiter'])
+        self.assertFalse(semaphore.locked())
+
+
+class ChatSessionIdTests(SimpleTestCase):
+    def _request(self, session_key, user=None, **headers):
+        request = RequestFactory().post('/chat/send_message/', headers=headers)
+        request.session = SimpleNamespace(session_key=session_key, save=lambda: None)
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_guests_are_keyed_by_their_session(self):
+        self.assertEqual(views._chat_session_id(self._request('s1'), {}), 's1')
+
+    def test_client_id_is_namespaced_under_the_caller(self):
+        mine = views._chat_session_id(self._request('s1', X_Chat_Session_Id='shared'), {})
+        theirs = views._chat_session_id(self._request('s2'), {'session_id': 'shared'})
+        self.assertEqual((mine, theirs), ('s1:shared', 's2:shared'))
+
+    def test_signed_in_users_are_keyed_by_pk(self):
+        user = SimpleNamespace(is_authenticated=True, pk=7)
+        self.assertEqual(views._chat_session_id(self._request('s1', user=user), {'session_id': 'a'}), 'user-7:a')
@@ -0,0 +1,61 @@
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from conferencing.gating import FrameChangeGate, GateStats
+
+
+def frame(value, shape=(64, 64, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+class FrameChangeGateTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 100.0
+        clock = mock.patch('conferencing.gating.time.monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.calls = []
+        self.gate = FrameChangeGate(threshold=3.0, max_age=2.0, stats=GateStats())
+
+    def compute(self, f):
+        self.calls.append(f)
+        return {'label': f'L{len(self.calls)}'}
+
+    def test_unchanged_frame_reuses_result(self):
+        first, cached = self.gate.run(frame(100), self.compute)
+        self.assertFalse(cached)
+        second, cached = self.gate.run(frame(102), self.compute)
+        self.assertTrue(cached)
+        self.assertIs(second, first)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_changed_frame_is_recomputed(self):
+        self.gate.run(frame(100), self.compute)
+        result, cached = self.gate.run(frame(110), self.compute)
+        self.assertEqual((result, cached), ({'label': 'L2'}, False))
+
+    def test_local_change_counts(self):
+        self.gate.run(frame(100), self.compute)
+        moved = frame(100)
+        moved[:32, :32] = 255  # a hand entering one quadrant
+        self.assertFalse(self.gate.run(moved, self.compute)[1])
+
+    def test_old_result_is_refreshed(self):
+        self.gate.run(frame(100), self.compute)
+        self.now += 2.5
+        self.assertFalse(self.gate.run(frame(100), self.compute)[1])
+
+    def test_zero_threshold_disables_gating(self):
+        gate = FrameChangeGate(threshold=0)
+        gate.run(frame(100), self.compute)
+        self.assertFalse(gate.run(frame(100), self.compute)[1])
+
+    def test_reset_and_stats(self):
+        self.gate.run(frame(100), self.compute)
+        self.gate.run(frame(100), self.compute)
+        self.gate.reset()
+        self.assertFalse(self.gate.run(frame(100), self.compute)[1])
+        stats = self.gate.stats.stats()
+        self.assertEqual((stats['frames'], stats['cache_hits'], stats['hit_ratio']), (3, 1, 0.3333))
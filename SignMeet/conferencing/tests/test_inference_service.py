@@ -0,0 +1,121 @@
+import threading
+from multiprocessing import Pipe
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from conferencing.inference_service import (
+    FrameRing, InferenceClient, InferenceServiceError, InferenceWorker, slot_generation,
+)
+
+
+class FrameRingTests(SimpleTestCase):
+    def setUp(self):
+        self.ring = FrameRing(slots=2, slot_bytes=64)
+        self.addCleanup(self.ring.close)
+
+    def test_write_tags_slot_with_new_generation(self):
+        frame = np.arange(12, dtype=np.uint8).reshape(2, 2, 3)
+        offset, first = self.ring.write(1, frame)
+        self.assertEqual(slot_generation(self.ring.shm.buf, offset), first)
+        stored = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.ring.shm.buf, offset=offset)
+        np.testing.assert_array_equal(stored, frame)
+
+        _, second = self.ring.write(1, frame)
+        self.assertGreater(second, first)
+        self.assertEqual(slot_generation(self.ring.shm.buf, offset), second)
+
+    def test_rejects_frames_larger_than_a_slot(self):
+        with self.assertRaises(ValueError):
+            self.ring.write(0, np.zeros(65, dtype=np.uint8))
+
+
+class InferenceClientTests(SimpleTestCase):
+    def setUp(self):
+        self.client = InferenceClient([('127.0.0.1', 6100)], b'key', slots=1, slot_bytes=64)
+        self.addCleanup(self.client.close)
+
+    def _conn(self, reply=None, error=None):
+        conn = mock.Mock()
+        conn.poll.return_value = True
+        if error is not None:
+            conn.recv.side_effect = error
+        else:
+            conn.recv.return_value = reply
+        return conn
+
+    def test_stale_pooled_connection_is_retried_on_a_fresh_one(self):
+        stale, other_stale = self._conn(error=EOFError()), self._conn(error=EOFError())
+        self.client._idle[0].put(other_stale)
+        self.client._idle[0].put(stale)
+        fresh = self._conn(reply=('ok', True))
+        with mock.patch('conferencing.inference_service.Client', return_value=fresh) as connect:
+            self.assertEqual(self.client.ping(), [True])
+        connect.assert_called_once()
+        stale.close.assert_called_once()
+        other_stale.close.assert_called_once()
+        self.assertIs(self.client._idle[0].get_nowait(), fresh)
+
+    def test_gives_up_after_one_retry(self):
+        self.client._idle[0].put(self._conn(error=EOFError()))
+        with mock.patch('conferencing.inference_service.Client', return_value=self._conn(error=OSError('reset'))):
+            with self.assertRaises(InferenceServiceError):
+                self.client.ping()
+        self.assertTrue(self.client._idle[0].empty())
+
+    def test_timeout_is_not_retried(self):
+        slow = self._conn()
+        slow.poll.return_value = False
+        self.client._idle[0].put(slow)
+        with mock.patch('conferencing.inference_service.Client') as connect:
+            with self.assertRaisesRegex(InferenceServiceError, 'timed out'):
+                self.client.ping()
+        connect.assert_not_called()
+        slow.close.assert_called_once()
+
+
+class InferenceWorkerTests(SimpleTestCase):
+    def setUp(self):
+        self.ring = FrameRing(slots=1, slot_bytes=64)
+        self.addCleanup(self.ring.close)
+        self.seen = []
+        # Same process: map the client's ring directly instead of attaching to it by name
+        attach = mock.patch('conferencing.inference_service._attach',
+                            lambda name: SimpleNamespace(buf=self.ring.shm.buf, close=lambda: None))
+        attach.start()
+        self.addCleanup(attach.stop)
+        worker = InferenceWorker(('127.0.0.1', 0), b'key', {'sign': self._task})
+        self.client_conn, worker_conn = Pipe()
+        self.thread = threading.Thread(target=worker._serve, args=(worker_conn,), daemon=True)
+        self.thread.start()
+        self.addCleanup(self._stop)
+
+    def _stop(self):
+        self.client_conn.close()
+        self.thread.join(timeout=2)
+
+    def _task(self, frame, stream_id):
+        self.seen.append((stream_id, frame.copy()))
+        return int(frame.sum())
+
+    def _request(self, frame, generation, offset, stream_id='a'):
+        self.client_conn.send(('sign', self.ring.name, offset, frame.shape, frame.dtype.str, stream_id, generation))
+        return self.client_conn.recv()
+
+    def test_runs_task_on_current_frame(self):
+        frame = np.full((4, 4), 2, dtype=np.uint8)
+        offset, generation = self.ring.write(0, frame)
+        self.assertEqual(self._request(frame, generation, offset), ('ok', 32))
+        self.assertEqual(len(self.seen), 1)
+
+    def test_drops_request_whose_slot_was_reused(self):
+        # A client timed out on `stale` and reused the slot for another stream's frame
+        stale = np.full((4, 4), 1, dtype=np.uint8)
+        offset, stale_generation = self.ring.write(0, stale)
+        self.ring.write(0, np.full((4, 4), 9, dtype=np.uint8))
+
+        status, _ = self._request(stale, stale_generation, offset)
+        self.assertEqual(status, 'error')
+        self.assertEqual(self.seen, [])
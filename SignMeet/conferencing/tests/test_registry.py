@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from conferencing.registry import FAILED, NOT_LOADED, READY, ModelRegistry
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def test_failed_load_is_retried_after_backoff(self):
+        outcomes = [RuntimeError('no gpu'), 'model']
+
+        def loader():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        registry = ModelRegistry(retry_seconds=30)
+        registry.register('m', loader)
+        with mock.patch('conferencing.registry.time.monotonic', return_value=100.0):
+            self.assertIsNone(registry.get('m'))
+        self.assertEqual(registry.status()['m']['state'], FAILED)
+        with mock.patch('conferencing.registry.time.monotonic', return_value=129.0):
+            self.assertIsNone(registry.get('m'))
+        self.assertEqual(len(outcomes), 1)
+        with mock.patch('conferencing.registry.time.monotonic', return_value=130.0):
+            self.assertEqual(registry.get('m'), 'model')
+        self.assertEqual(registry.status()['m'], {'state': READY, 'load_ms': mock.ANY, 'warmup_ms': None, 'error': None})
+
+    def test_loader_returning_none_is_not_ready(self):
+        calls = []
+        warmup = mock.Mock()
+
+        def loader():
+            calls.append(1)
+            return None if len(calls) == 1 else 'model'
+
+        registry = ModelRegistry(retry_seconds=30)
+        registry.register('m', loader, warmup=warmup)
+        with mock.patch('conferencing.registry.time.monotonic', return_value=100.0):
+            self.assertIsNone(registry.get('m'))
+            self.assertIsNone(registry.get('m'))
+        self.assertEqual(registry.status()['m']['state'], NOT_LOADED)
+        self.assertFalse(registry.is_ready(['m']))
+        self.assertEqual(len(calls), 1)
+        warmup.assert_not_called()
+        with mock.patch('conferencing.registry.time.monotonic', return_value=130.0):
+            self.assertEqual(registry.get('m'), 'model')
+        self.assertTrue(registry.is_ready(['m']))
+        warmup.assert_called_once_with('model')
@@ -0,0 +1,101 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from conferencing import routing
+from conferencing.rooms import RoomBroadcaster, group_name, participant_name
+
+IN_MEMORY_LAYER = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+class ScopeUser:
+    """Puts `user` in the scope, as AuthMiddlewareStack would."""
+
+    def __init__(self, app, user=None):
+        self.app = app
+        self.user = user
+
+    async def __call__(self, scope, receive, send):
+        if self.user is not None:
+            scope = dict(scope, user=self.user)
+        return await self.app(scope, receive, send)
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class RoomSocketTests(SimpleTestCase):
+    def setUp(self):
+        self.broadcaster = RoomBroadcaster(tick_seconds=0.02)
+        patcher = mock.patch('conferencing.consumers.room_broadcaster', self.broadcaster)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _socket(self, room='team-1', user=None):
+        app = ScopeUser(URLRouter(routing.websocket_urlpatterns), user)
+        return WebsocketCommunicator(app, f'/ws/sign/{room}/')
+
+    def test_burst_is_one_batch_for_every_socket(self):
+        async def scenario():
+            a, b, other = self._socket(), self._socket(), self._socket('team-2')
+            for socket in (a, b, other):
+                self.assertTrue((await socket.connect())[0])
+            for letter in 'HI':
+                self.broadcaster.publish('team-1', 'sign', 'alice', letter)
+            self.broadcaster.publish('team-1', 'caption', 'bob', 'see')
+            self.broadcaster.publish('team-1', 'caption', 'bob', 'see you')
+            first, second = await a.receive_from(1), await b.receive_from(1)
+            self.assertTrue(await a.receive_nothing(0.1))
+            self.assertTrue(await other.receive_nothing(0.05))
+            for socket in (a, b, other):
+                await socket.disconnect()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, second)
+        self.assertEqual(json.loads(first), {'s': 1, 'e': [['alice', 's', 'HI'], ['bob', 'c', 'see you']]})
+        self.assertEqual(self.broadcaster.stats()['batches'], 1)
+
+    def test_client_cannot_choose_its_name_or_kind(self):
+        async def scenario():
+            socket = self._socket()
+            await socket.connect()
+            await socket.send_to(text_data=json.dumps({'kind': 'announcement', 'text': 'x'}))
+            await socket.send_to(text_data=json.dumps({'kind': 'caption', 'text': 'hi', 'user': 'alice'}))
+            message = json.loads(await socket.receive_from(1))
+            await socket.disconnect()
+            return message
+
+        [[user, kind, text]] = asyncio.run(scenario())['e']
+        self.assertEqual((kind, text), ('c', 'hi'))
+        self.assertTrue(user.startswith('guest-'))
+        self.assertEqual(self.broadcaster.stats()['events'], 1)
+
+    def test_signed_in_user_publishes_under_username(self):
+        user = SimpleNamespace(is_authenticated=True, get_username=lambda: 'carol')
+
+        async def scenario():
+            socket = self._socket(user=user)
+            await socket.connect()
+            await socket.send_to(text_data=json.dumps({'kind': 'sign', 'text': 'A', 'user': 'alice'}))
+            message = json.loads(await socket.receive_from(1))
+            await socket.disconnect()
+            return message
+
+        self.assertEqual(asyncio.run(scenario())['e'], [['carol', 's', 'A']])
+
+    def test_invalid_room_names_are_rejected(self):
+        self.assertIsNone(group_name('bad.room'))
+        self.assertIsNone(group_name('x' * 65))
+        self.assertFalse(self.broadcaster.publish('bad room', 'sign', 'alice', 'A'))
+        self.assertFalse(self.broadcaster.publish('team-1', 'shout', 'alice', 'A'))
+
+
+class ParticipantNameTests(SimpleTestCase):
+    def test_guest_ids_are_stable_per_session(self):
+        self.assertEqual(participant_name(session_key='s1'), participant_name(session_key='s1'))
+        self.assertNotEqual(participant_name(session_key='s1'), participant_name(session_key='s2'))
+        self.assertNotEqual(participant_name(fallback='alice'), 'alice')
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from conferencing.smoothing import STATE_HOLDING, STATE_IDLE, STATE_PENDING, SignDecoder
+
+
+class SignDecoderTests(SimpleTestCase):
+    def setUp(self):
+        self.decoder = SignDecoder(window=6, min_votes=4, min_confidence=60.0, idle_frames=3)
+
+    def feed(self, *frames):
+        """Emitted letters for (label, confidence) frames, in order."""
+        return [r['emit'] for r in (self.decoder.update(*frame) for frame in frames) if r['emit']]
+
+    def test_letter_emitted_once_after_enough_votes(self):
+        results = [self.decoder.update('A', 90) for _ in range(6)]
+        self.assertEqual([r['emit'] for r in results], [None, None, None, 'A', None, None])
+        self.assertEqual([r['state'] for r in results[2:5]], [STATE_PENDING, STATE_HOLDING, STATE_HOLDING])
+
+    def test_flicker_does_not_emit(self):
+        self.assertEqual(self.feed(('A', 90), ('B', 90), ('A', 90), ('B', 90), ('A', 90), ('B', 90)), [])
+
+    def test_low_confidence_does_not_emit(self):
+        self.assertEqual(self.feed(*[('A', 40)] * 6), [])
+
+    def test_brief_gap_does_not_repeat_the_letter(self):
+        letters = self.feed(*[('A', 90)] * 4, ('No Hand', 0), ('No Hand', 0), *[('A', 90)] * 4)
+        self.assertEqual(letters, ['A'])
+
+    def test_hand_leaving_allows_the_same_letter_again(self):
+        self.feed(*[('A', 90)] * 4)
+        # A short gap keeps the letter's votes
+        self.assertEqual(self.decoder.update('No Hand', 0)['state'], STATE_HOLDING)
+        self.decoder.update('No Hand', 0)
+        self.assertEqual(self.decoder.update('No Hand', 0)['state'], STATE_IDLE)
+        self.assertEqual(self.feed(*[('A', 90)] * 4), ['A'])
+
+    def test_another_letter_in_between_allows_a_repeat(self):
+        letters = self.feed(*[('A', 90)] * 4, *[('B', 90)] * 6, *[('A', 90)] * 6)
+        self.assertEqual(letters, ['A', 'B', 'A'])
+
+    def test_reset_forgets_votes(self):
+        self.feed(*[('A', 90)] * 3)
+        self.decoder.reset()
+        self.assertEqual(self.feed(('A', 90)), [])
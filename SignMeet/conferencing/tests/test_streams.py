@@ -0,0 +1,66 @@
+from itertools import count
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from conferencing.streams import StreamStore
+
+
+class StreamStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        clock = mock.patch('conferencing.streams.time.monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.closed = []
+        ids = count()
+        self.store = StreamStore(
+            factory=lambda: {'id': next(ids)}, max_streams=2, ttl_seconds=30, on_evict=self.closed.append,
+        )
+
+    def test_value_is_reused_per_stream(self):
+        with self.store.acquire('a') as first:
+            pass
+        self.assertIs(self.store.get('a'), first)
+        self.assertEqual(self.store.stats()['created'], 1)
+
+    def test_least_recently_used_stream_is_evicted(self):
+        a = self.store.get('a')
+        b = self.store.get('b')
+        self.store.get('a')
+        self.store.get('c')
+        self.assertEqual(self.closed, [b])
+        self.assertIs(self.store.get('a'), a)
+        self.assertEqual(self.store.stats()['evicted_lru'], 1)
+
+    def test_idle_streams_expire(self):
+        a = self.store.get('a')
+        self.now += 20
+        b = self.store.get('b')
+        self.now += 15
+        self.assertIs(self.store.get('b'), b)
+        self.assertEqual(self.closed, [a])
+        self.assertEqual(len(self.store), 1)
+
+        self.now += 30
+        self.assertEqual(self.store.sweep(), 1)
+        self.assertEqual(self.store.stats()['evicted_ttl'], 2)
+
+    def test_evict_lru_keeps_the_given_stream(self):
+        self.store.get('a')
+        self.store.get('b')
+        self.assertTrue(self.store.evict_lru(keep='a'))
+        self.assertFalse(self.store.evict_lru(keep='a'))
+        self.assertEqual(len(self.store), 1)
+
+    def test_discard_closes_value(self):
+        a = self.store.get('a')
+        self.store.discard('a')
+        self.assertEqual(self.closed, [a])
+        self.assertIsNot(self.store.get('a'), a)
+
+    def test_failing_on_evict_does_not_break_the_store(self):
+        self.store.on_evict = mock.Mock(side_effect=RuntimeError('graph already closed'))
+        self.store.get('a')
+        self.store.discard('a')
+        self.assertEqual(len(self.store), 0)
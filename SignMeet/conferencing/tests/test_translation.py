@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from conferencing.translation import TranslationService, TranslatorPool
+
+
+class FakeTranslator:
+    """Upper-cases each line; `merge_lines` simulates a reply that loses a line break."""
+
+    def __init__(self, calls, merge_lines=False):
+        self.calls = calls
+        self.merge_lines = merge_lines
+
+    def translate(self, text, src, dest):
+        self.calls.append(text)
+        translated = text.upper()
+        if self.merge_lines and '\n' in text:
+            translated = translated.replace('\n', ' ', 1)
+        return SimpleNamespace(text=translated)
+
+
+def make_service(merge_lines=False, max_batch_chars=4500):
+    calls = []
+    pool = TranslatorPool(size=2, factory=lambda: FakeTranslator(calls, merge_lines))
+    return TranslationService(pool=pool, max_batch_chars=max_batch_chars), calls
+
+
+class TranslateManyTests(SimpleTestCase):
+    def test_misses_go_upstream_as_one_batch(self):
+        service, calls = make_service()
+        result = service.translate_many(['hello', 'thank you', 'hello'], dest='hi')
+        self.assertEqual(result, ['HELLO', 'THANK YOU', 'HELLO'])
+        self.assertEqual(calls, ['hello\nthank you'])
+
+    def test_cached_strings_cost_nothing(self):
+        service, calls = make_service()
+        service.translate_many(['hello'], dest='hi')
+        self.assertEqual(service.translate_many(['hello', 'bye'], dest='hi'), ['HELLO', 'BYE'])
+        self.assertEqual(calls, ['hello', 'bye'])
+        stats = service.stats()
+        self.assertEqual((stats['requests'], stats['cache_hits']), (3, 1))
+
+    def test_batches_respect_max_chars(self):
+        service, calls = make_service(max_batch_chars=12)
+        service.translate_many(['aaaa', 'bbbb', 'cccc'], dest='hi')
+        self.assertEqual(calls, ['aaaa\nbbbb', 'cccc'])
+
+    def test_multiline_text_goes_alone(self):
+        service, calls = make_service()
+        self.assertEqual(service.translate_many(['a\nb', 'c'], dest='hi'), ['A\nB', 'C'])
+        self.assertEqual(sorted(calls), ['a\nb', 'c'])
+
+    def test_split_mismatch_falls_back_to_one_call_each(self):
+        service, calls = make_service(merge_lines=True)
+        self.assertEqual(service.translate_many(['one', 'two'], dest='hi'), ['ONE', 'TWO'])
+        self.assertEqual(calls, ['one\ntwo', 'one', 'two'])
+        self.assertEqual(service.stats()['batch_fallbacks'], 1)
+
+    def test_pass_throughs_are_not_cache_hits(self):
+        service, calls = make_service()
+        self.assertEqual(service.translate_many(['Hello', '  '], dest='en', src='en'), ['Hello', '  '])
+        stats = service.stats()
+        self.assertEqual(calls, [])
+        self.assertEqual((stats['requests'], stats['cache_hits'], stats['passthrough']), (0, 0, 2))
+        self.assertEqual(stats['hit_ratio'], 0.0)
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from conferencing import tts
+from conferencing.tts import TTSCache
+
+
+class TTSTestCase(SimpleTestCase):
+    """Runs against a fresh cache in a temporary directory."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache = TTSCache(self.directory, max_memory_bytes=1024, max_disk_bytes=4096)
+        patcher = mock.patch.object(tts, 'tts_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SpeechTests(TTSTestCase):
+    def test_clip_is_cached_under_its_key(self):
+        with mock.patch.object(tts, 'synthesize', return_value=(b'mp3', False)) as synthesize:
+            key, audio, hit, degraded = tts.speech('Hello', 'en', 'en')
+            self.assertEqual((audio, hit, degraded), (b'mp3', False, False))
+            self.assertEqual(tts.speech('Hello', 'en', 'en'), (key, b'mp3', True, False))
+        synthesize.assert_called_once()
+
+    def test_degraded_clip_is_not_cached(self):
+        with mock.patch.object(tts, 'synthesize', return_value=(b'robot', True)):
+            key, audio, hit, degraded = tts.speech('Hello', 'en', 'en')
+        self.assertEqual((audio, hit, degraded), (b'robot', False, True))
+        self.assertNotIn(key, self.cache)
+
+        with mock.patch.object(tts, 'synthesize', return_value=(b'real', False)):
+            self.assertEqual(tts.speech('Hello', 'en', 'en')[1:], (b'real', False, False))
+        self.assertIn(key, self.cache)
+
+
+class TTSCacheTierTests(TTSTestCase):
+    def test_memory_hit(self):
+        self.cache.put('a', b'x' * 100)
+        self.assertEqual(self.cache.get('a'), b'x' * 100)
+        stats = self.cache.stats()
+        self.assertEqual((stats['memory_hits'], stats['disk_hits'], stats['bytes_saved']), (1, 0, 100))
+
+    def test_memory_overflow_is_served_from_disk_and_promoted(self):
+        self.cache.put('a', b'a' * 600)
+        self.cache.put('b', b'b' * 600)  # pushes 'a' out of the 1 KiB memory tier
+        self.assertEqual(self.cache.stats()['memory_entries'], 1)
+        self.assertEqual(self.cache.get('a'), b'a' * 600)
+        self.assertEqual(self.cache.get('a'), b'a' * 600)
+        stats = self.cache.stats()
+        self.assertEqual((stats['disk_hits'], stats['memory_hits']), (1, 1))
+
+    def test_disk_tier_survives_restart(self):
+        self.cache.put('a', b'clip')
+        restarted = TTSCache(self.directory, max_memory_bytes=1024, max_disk_bytes=4096)
+        self.assertIn('a', restarted)
+        self.assertEqual(restarted.get('a'), b'clip')
+
+    def test_disk_cap_evicts_least_recently_used(self):
+        for key in 'abcde':
+            self.cache.put(key, key.encode() * 1000)
+        stats = self.cache.stats()
+        self.assertLessEqual(stats['disk_bytes'], 4096)
+        self.assertNotIn('a', self.cache)
+        self.assertIn('e', self.cache)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['b.mp3', 'c.mp3', 'd.mp3', 'e.mp3'])
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get('nope'))
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_without_directory_only_memory_is_used(self):
+        cache = TTSCache(None, max_memory_bytes=1024)
+        cache.put('a', b'clip')
+        self.assertEqual(cache.get('a'), b'clip')
+        self.assertEqual(cache.stats()['max_disk_bytes'], 0)
+
+
+class TTSCacheExpiryTests(TTSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = 1_000_000.0
+        clock = mock.patch('conferencing.tts.time.time', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        # No memory tier, so every get goes to disk
+        self.cache = TTSCache(self.directory, max_memory_bytes=0, disk_ttl_seconds=60)
+
+    def test_unused_clips_expire(self):
+        self.cache.put('old', b'old')
+        self.now += 50
+        self.cache.put('new', b'new')
+        self.now += 20
+        self.assertEqual(self.cache.get('new'), b'new')
+        self.assertNotIn('old', self.cache)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'old.mp3')))
+        self.assertEqual(self.cache.stats()['disk_expired'], 1)
+
+    def test_hit_refreshes_expiry(self):
+        self.cache.put('a', b'clip')
+        self.now += 50
+        self.cache.get('a')
+        self.now += 50
+        self.assertEqual(self.cache.get('a'), b'clip')
+
+    def test_clips_expired_while_stopped_are_removed_at_startup(self):
+        self.cache.put('a', b'clip')
+        path = os.path.join(self.directory, 'a.mp3')
+        os.utime(path, (self.now, self.now))
+        self.now += 120
+        restarted = TTSCache(self.directory, max_memory_bytes=0, disk_ttl_seconds=60)
+        self.assertNotIn('a', restarted)
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,81 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from conferencing.tts_backends import EspeakBackend, FallbackBackend, StubBackend, TTSBackend, load_backend
+
+
+class FakeBackend(TTSBackend):
+    def __init__(self, name, audio=b'', error=None, delay=0.0):
+        self.name = name
+        self.audio = audio
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    def synthesize(self, text, lang, slow=False):
+        self.calls += 1
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if self.error:
+            raise self.error
+        return self.audio
+
+
+def fallback_backend(primary, fallback):
+    return FallbackBackend(primary, fallback, budget_seconds=0.05, cooldown_seconds=60)
+
+
+class FallbackBackendTests(SimpleTestCase):
+    def test_primary_within_budget(self):
+        backend = fallback_backend(FakeBackend('p', b'real'), FakeBackend('f', b'robot'))
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'real', False))
+
+    def test_slow_primary_falls_back_and_cools_down(self):
+        primary = FakeBackend('p', b'real', delay=0.2)
+        backend = fallback_backend(primary, FakeBackend('f', b'robot'))
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'robot', True))
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'robot', True))
+        self.assertEqual(primary.calls, 1)
+        stats = backend.stats()
+        self.assertTrue(stats['cooling_down'])
+        self.assertEqual(stats['fallbacks'], {'timeout': 1, 'error': 0, 'cooldown': 1})
+
+    def test_broken_fallback_waits_for_slow_primary(self):
+        backend = fallback_backend(FakeBackend('p', b'real', delay=0.2), FakeBackend('f', error=OSError('no espeak')))
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'real', False))
+        self.assertFalse(backend.stats()['cooling_down'])
+
+    def test_broken_fallback_raises_primary_error(self):
+        backend = fallback_backend(FakeBackend('p', error=ValueError('gtts down')), FakeBackend('f', error=OSError('no espeak')))
+        with self.assertRaisesMessage(ValueError, 'gtts down'):
+            backend.synthesize_checked('hi', 'en')
+        self.assertFalse(backend.stats()['cooling_down'])
+
+    def test_fallback_breaking_during_cooldown_retries_primary(self):
+        primary = FakeBackend('p', error=ValueError('gtts down'))
+        fallback = FakeBackend('f', b'robot')
+        backend = fallback_backend(primary, fallback)
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'robot', True))
+
+        primary.error, primary.audio = None, b'real'
+        fallback.error = OSError('espeak gone')
+        self.assertEqual(backend.synthesize_checked('hi', 'en'), (b'real', False))
+        self.assertFalse(backend.stats()['cooling_down'])
+
+
+class LoadBackendTests(SimpleTestCase):
+    def test_unavailable_fallback_is_skipped(self):
+        with mock.patch.object(EspeakBackend, 'available', return_value=False):
+            backend = load_backend('stub', fallback='espeak')
+        self.assertIsInstance(backend, StubBackend)
+
+    def test_available_fallback_wraps_primary(self):
+        backend = load_backend('espeak', fallback='stub', budget_seconds=0.5)
+        self.assertIsInstance(backend, FallbackBackend)
+        self.assertEqual(backend.stats()['fallback'], 'stub')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            load_backend('festival')
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from conferencing import tts, views
+from conferencing.translation import TranslationService, TranslatorPool, translator_factory
+
+from .test_tts import TTSTestCase
+
+
+class AudioResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_real_clip_is_publicly_cacheable(self):
+        response = views._audio_response(self.factory.get('/'), 'abc', b'mp3', hit=True)
+        self.assertEqual(response['ETag'], '"abc"')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+    def test_degraded_clip_is_not_stored_and_has_its_own_etag(self):
+        response = views._audio_response(self.factory.get('/'), 'abc', b'robot', hit=False, degraded=True)
+        self.assertEqual(response['ETag'], '"abc-fallback"')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+    def test_degraded_etag_does_not_revalidate_as_real_clip(self):
+        request = self.factory.get('/', HTTP_IF_NONE_MATCH='"abc-fallback"')
+        self.assertFalse(views._etag_matches(request, '"abc"'))
+
+
+class DynamicTTSTests(TTSTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def _get(self, **params):
+        from asgiref.sync import async_to_sync
+        return async_to_sync(views.generate_dynamic_tts)(self.factory.get('/api/dynamic_tts/', params))
+
+    def test_fallback_clip_is_served_uncacheable(self):
+        with mock.patch.object(tts, 'synthesize', return_value=(b'robot', True)), \
+                mock.patch.object(tts.translations, 'translate_many', side_effect=lambda texts, dest, src: texts):
+            response = self._get(text='Hello', lang='en')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertTrue(response['ETag'].endswith('-fallback"'))
+
+    @override_settings(TTS_BACKENDS={'default': {'backend': 'stub', 'fallback': 'espeak'}})
+    def test_stub_backends_serve_offline(self):
+        offline = TranslationService(pool=TranslatorPool(factory=translator_factory('identity')))
+        with mock.patch.object(tts, 'translations', offline), \
+                mock.patch.dict('sys.modules', {'googletrans': None, 'gtts': None}):
+            response = self._get(text='Hello there. How are you today?', lang='hi', stream='0')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertTrue(response.content.startswith(b'\xff\xf3'))
+
+
+class TTSAudioTests(TTSTestCase):
+    CLIP = bytes(range(200))
+
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.cache.put('k1', self.CLIP)
+
+    def _get(self, **headers):
+        return views.tts_audio(self.factory.get('/api/tts/k1.mp3', headers=headers), 'k1')
+
+    def test_full_clip_counts_all_bytes_saved(self):
+        response = self._get()
+        self.assertEqual((response.status_code, response.content), (200, self.CLIP))
+        self.assertEqual(response['ETag'], '"k1"')
+        self.assertEqual(self.cache.stats()['bytes_saved'], 200)
+
+    def test_range_counts_only_bytes_sent(self):
+        response = self._get(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.CLIP[10:20])
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/200')
+        stats = self.cache.stats()
+        self.assertEqual((stats['memory_hits'], stats['bytes_saved']), (1, 10))
+
+    def test_suffix_and_open_ranges(self):
+        self.assertEqual(self._get(Range='bytes=-5').content, self.CLIP[-5:])
+        self.assertEqual(self._get(Range='bytes=195-').content, self.CLIP[195:])
+        self.assertEqual(self._get(Range='bytes=190-500')['Content-Range'], 'bytes 190-199/200')
+
+    def test_unsatisfiable_range(self):
+        response = self._get(Range='bytes=300-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */200')
+        self.assertEqual(self.cache.stats()['bytes_saved'], 0)
+
+    def test_stale_if_range_and_multi_range_get_whole_clip(self):
+        self.assertEqual(self._get(Range='bytes=0-9', **{'If-Range': '"other"'}).status_code, 200)
+        self.assertEqual(self._get(Range='bytes=0-9,20-29').status_code, 200)
+
+    def test_if_none_match_skips_the_cache(self):
+        response = self._get(**{'If-None-Match': 'W/"k1"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.cache.stats()['requests'], 0)
+
+    def test_evicted_clip_is_404(self):
+        self.assertEqual(views.tts_audio(self.factory.get('/'), 'missing').status_code, 404)
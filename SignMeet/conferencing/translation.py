@@ -0,0 +1,204 @@
+# SignMeet/conferencing/translation.py
+"""
+Cached, batched googletrans access.
+
+    translations.translate("Hello", dest='hi')
+    translations.translate_many(["Hello", "Thank you"], dest='hi')
+
+Results are cached per (text, source, dest) with a TTL, so a caption
+delivered to many listeners is translated once per language. Cache misses
+for one target language are joined with newlines and sent as one upstream
+request (up to `max_batch_chars`), falling back to one request per string
+if the reply does not split back into the same number of lines.
+Translator clients are pooled instead of built per request.
+
+settings.TRANSLATION_BACKEND picks the client: 'googletrans' (the network
+service) or 'identity' (returns text unchanged, for offline development
+and tests).
+"""
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from django.conf import settings
+
+from .caching import TTLCache
+from .metrics import TRANSLATION_CACHE_REQUESTS, track_outbound
+
+logger = logging.getLogger(__name__)
+
+
+def _new_translator():
+    from googletrans import Translator
+    return Translator()
+
+
+class IdentityTranslator:
+    """Same interface as googletrans.Translator; returns the text untranslated."""
+
+    def translate(self, text, src='auto', dest='en'):
+        return SimpleNamespace(text=text)
+
+
+TRANSLATORS = {
+    'googletrans': _new_translator,
+    'identity': IdentityTranslator,
+}
+
+
+def translator_factory(backend):
+    """Client factory for `backend` ('googletrans', 'identity')."""
+    try:
+        return TRANSLATORS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown translation backend '{backend}'. Choose from: {', '.join(TRANSLATORS)}")
+
+
+class TranslatorPool:
+    """Up to `size` Translator clients, built on demand and reused (one per concurrent call)."""
+
+    def __init__(self, size=4, factory=_new_translator):
+        self.size = max(1, int(size))
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                build = self._created < self.size
+                if build:
+                    self._created += 1
+            if build:
+                try:
+                    client = self.factory()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                client = self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+    def stats(self):
+        return {'size': self.size, 'created': self._created, 'idle': self._idle.qsize()}
+
+
+class TranslationService:
+    def __init__(self, pool=None, cache=None, max_batch_chars=4500):
+        self.pool = pool or TranslatorPool()
+        self.cache = cache or TTLCache(max_entries=10000, ttl_seconds=86400)
+        self.max_batch_chars = int(max_batch_chars)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hits = 0
+        self._passthrough = 0
+        self._upstream = 0
+        self._fallbacks = 0
+
+    def translate(self, text, dest, src='auto'):
+        return self.translate_many([text], dest, src)[0]
+
+    def translate_many(self, texts, dest, src='auto'):
+        """Translations of `texts` into `dest`, in order, with at most a few upstream calls."""
+        results = {}
+        missing = []
+        passthrough = set()
+        for text in dict.fromkeys(texts):
+            if not text.strip() or src == dest:
+                # Nothing to translate: not a cache lookup, so not counted as one
+                results[text] = text
+                passthrough.add(text)
+                continue
+            cached = self.cache.get((text, src, dest))
+            if cached is None:
+                missing.append(text)
+            else:
+                results[text] = cached
+
+        pending = set(missing)
+        skipped = sum(1 for text in texts if text in passthrough)
+        lookups = len(texts) - skipped
+        misses = sum(1 for text in texts if text in pending)
+        hits = lookups - misses
+        with self._lock:
+            self._requests += lookups
+            self._hits += hits
+            self._passthrough += skipped
+        TRANSLATION_CACHE_REQUESTS.labels(result='hit').inc(hits)
+        TRANSLATION_CACHE_REQUESTS.labels(result='miss').inc(misses)
+
+        for batch in self._batches(missing):
+            for text, translated in zip(batch, self._translate_batch(batch, dest, src)):
+                self.cache.put((text, src, dest), translated)
+                results[text] = translated
+        return [results[text] for text in texts]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'cache_hits': self._hits,
+                'hit_ratio': round(self._hits / self._requests, 4) if self._requests else 0.0,
+                'passthrough': self._passthrough,
+                'upstream_calls': self._upstream,
+                'batch_fallbacks': self._fallbacks,
+                'cached': len(self.cache),
+                'pool': self.pool.stats(),
+            }
+
+    # --- Internals ---
+    def _batches(self, texts):
+        # Multi-line strings cannot be split back out of a joined reply, so they go alone
+        batch, chars = [], 0
+        for text in texts:
+            if '\n' in text:
+                yield [text]
+                continue
+            if batch and chars + len(text) + 1 > self.max_batch_chars:
+                yield batch
+                batch, chars = [], 0
+            batch.append(text)
+            chars += len(text) + 1
+        if batch:
+            yield batch
+
+    def _call(self, text, dest, src):
+        with self._lock:
+            self._upstream += 1
+        with self.pool.acquire() as translator, track_outbound('googletrans'):
+            return translator.translate(text, src=src, dest=dest).text
+
+    def _translate_batch(self, batch, dest, src):
+        if len(batch) == 1:
+            return [self._call(batch[0], dest, src)]
+        lines = self._call('\n'.join(batch), dest, src).split('\n')
+        if len(lines) == len(batch):
+            return [line.strip() for line in lines]
+        logger.warning("batched translation split mismatch dest=%s sent=%d got=%d", dest, len(batch), len(lines))
+        with self._lock:
+            self._fallbacks += 1
+        return [self._call(text, dest, src) for text in batch]
+
+
+translations = TranslationService(
+    pool=TranslatorPool(
+        size=getattr(settings, 'TRANSLATION_POOL_SIZE', 4),
+        factory=translator_factory(getattr(settings, 'TRANSLATION_BACKEND', 'googletrans')),
+    ),
+    cache=TTLCache(
+        max_entries=getattr(settings, 'TRANSLATION_CACHE_SIZE', 10000),
+        ttl_seconds=getattr(settings, 'TRANSLATION_CACHE_TTL_SECONDS', 86400),
+    ),
+    max_batch_chars=getattr(settings, 'TRANSLATION_MAX_BATCH_CHARS', 4500),
+)
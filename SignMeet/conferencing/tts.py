@@ -0,0 +1,387 @@
+# SignMeet/conferencing/tts.py
+"""
+Text-to-speech for captions, detected signs and bot replies.
+
+    key, audio, hit, degraded = speech("Hello", target_lang='hi')
+
+Traffic is mostly short repeated strings, so the finished MP3 is cached
+under a hash of everything that shapes it (text, source and target
+language, voice parameters): a memory tier for hot clips in front of a
+byte-capped disk tier. Both tiers evict least recently used first. A hit
+skips translation as well as synthesis, and because the key is derived
+from the inputs it doubles as the HTTP ETag. Clips spoken by a fallback
+engine (`degraded`) are never stored under that key, so the real clip
+replaces them once the primary engine is back.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .metrics import TTS_CACHE_BYTES, TTS_CACHE_BYTES_SAVED, TTS_CACHE_REQUESTS
+from .translation import translations
+from .tts_backends import backend_config, backend_for
+
+logger = logging.getLogger(__name__)
+
+
+def tts_cache_key(text, source_lang, target_lang, voice=None):
+    payload = json.dumps([text, source_lang, target_lang, voice or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-tier LRU of MP3 bytes keyed by tts_cache_key().
+
+    The memory tier holds up to `max_memory_bytes`; the disk tier keeps
+    `<key>.mp3` files in `directory` up to `max_disk_bytes` and survives
+    restarts (its LRU order is rebuilt from file mtimes, which hits refresh).
+    Disk clips unused for `disk_ttl_seconds` are deleted (None keeps them
+    until evicted). A disk hit is promoted to memory. `directory=None`
+    disables the disk tier.
+    """
+
+    def __init__(self, directory=None, max_memory_bytes=32 * 1024 * 1024, max_disk_bytes=512 * 1024 * 1024,
+                 disk_ttl_seconds=None):
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.disk_ttl_seconds = float(disk_ttl_seconds) if disk_ttl_seconds else None
+        self.directory = directory
+
+        self._memory = OrderedDict()  # key -> bytes
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # key -> (size, last used as a Unix time, like the file mtime)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = {'memory': 0, 'disk': 0}
+        self._misses = 0
+        self._bytes_saved = 0
+        self._expired = 0
+
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self._load_disk_index()
+            except OSError as e:
+                logger.warning("TTS disk cache disabled dir=%s error=%s", directory, e)
+                self.directory = None
+
+        TTS_CACHE_BYTES.labels(tier='memory').set_function(lambda: self._memory_bytes)
+        TTS_CACHE_BYTES.labels(tier='disk').set_function(lambda: self._disk_bytes)
+
+    # --- Public API ---
+    def get(self, key, count_bytes=True):
+        """
+        Cached MP3 bytes for `key`, or None. A hit adds the clip's size to
+        `bytes_saved`; with count_bytes=False the caller adds what it
+        actually sends instead (add_bytes_saved), e.g. one byte range.
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._record_hit('memory', len(data) if count_bytes else 0)
+                return data
+            on_disk = key in self._disk
+
+        data = self._read_disk(key) if on_disk else None
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                TTS_CACHE_REQUESTS.labels(result='miss').inc()
+                return None
+            self._record_hit('disk', len(data) if count_bytes else 0)
+            self._store_memory(key, data)
+        return data
+
+    def add_bytes_saved(self, size):
+        with self._lock:
+            self._bytes_saved += size
+        TTS_CACHE_BYTES_SAVED.inc(size)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def put(self, key, data):
+        with self._lock:
+            self._store_memory(key, data)
+        self._write_disk(key, data)
+
+    def stats(self):
+        with self._lock:
+            hits = self._hits['memory'] + self._hits['disk']
+            requests = hits + self._misses
+            return {
+                'requests': requests,
+                'memory_hits': self._hits['memory'],
+                'disk_hits': self._hits['disk'],
+                'misses': self._misses,
+                'hit_ratio': round(hits / requests, 4) if requests else 0.0,
+                'bytes_saved': self._bytes_saved,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes if self.directory else 0,
+                'disk_ttl_seconds': self.disk_ttl_seconds,
+                'disk_expired': self._expired,
+            }
+
+    # --- Internals ---
+    def _record_hit(self, tier, size):
+        self._hits[tier] += 1
+        self._bytes_saved += size
+        TTS_CACHE_REQUESTS.labels(result=f'{tier}_hit').inc()
+        if size:
+            TTS_CACHE_BYTES_SAVED.inc(size)
+
+    def _store_memory(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.mp3')
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.mp3'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._disk[key] = (size, mtime)
+            self._disk_bytes += size
+        # Clips may have expired while stopped, or the cap may have been lowered
+        self._remove_files(self._evict_disk())
+
+    def _read_disk(self, key):
+        with self._lock:
+            stale = self._evict_disk()
+            on_disk = key in self._disk
+        self._remove_files(stale)
+        if not on_disk:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # persist recency for the next startup
+        except OSError:
+            with self._lock:
+                entry = self._disk.pop(key, None)
+                if entry is not None:
+                    self._disk_bytes -= entry[0]
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk[key] = (len(data), time.time())
+                self._disk.move_to_end(key)
+        return data
+
+    def _write_disk(self, key, data):
+        if not self.directory or len(data) > self.max_disk_bytes:
+            return
+        tmp_path = None
+        try:
+            # Write-then-rename, so a reader never sees a partial clip
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning("TTS disk cache write failed key=%s error=%s", key[:12], e)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            old = self._disk.pop(key, None)
+            if old is not None:
+                self._disk_bytes -= old[0]
+            self._disk[key] = (len(data), time.time())
+            self._disk_bytes += len(data)
+            evicted = self._evict_disk()
+        self._remove_files(evicted)
+
+    def _evict_disk(self):
+        """Drop expired, then least recently used, entries from the index; returns their keys."""
+        evicted = []
+        if self.disk_ttl_seconds is not None:
+            # Entries are kept in last-used order, so expired ones sit at the front
+            cutoff = time.time() - self.disk_ttl_seconds
+            while self._disk and next(iter(self._disk.values()))[1] < cutoff:
+                key, (size, _) = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self._expired += 1
+                evicted.append(key)
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, (size, _) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(key)
+        return evicted
+
+    def _remove_files(self, keys):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+tts_cache = TTSCache(
+    directory=getattr(settings, 'TTS_CACHE_DIR', None),
+    max_memory_bytes=getattr(settings, 'TTS_CACHE_MEMORY_BYTES', 32 * 1024 * 1024),
+    max_disk_bytes=getattr(settings, 'TTS_CACHE_DISK_BYTES', 512 * 1024 * 1024),
+    disk_ttl_seconds=getattr(settings, 'TTS_CACHE_DISK_TTL_SECONDS', None),
+)
+
+
+def synthesize(text, lang, slow=False):
+    """
+    (mp3 bytes, degraded) for `text` spoken in `lang` by the backend
+    configured for that language (conferencing.tts_backends). Degraded
+    clips come from a fallback engine and are not cached.
+    """
+    return backend_for(lang).synthesize_checked(text, lang, slow)
+
+
+# Sentence chunks are synthesized on a shared pool; each request keeps at
+# most TTS_CHUNK_PARALLELISM of its chunks in flight.
+CHUNK_CHARS = getattr(settings, 'TTS_CHUNK_CHARS', 200)
+CHUNK_PARALLELISM = getattr(settings, 'TTS_CHUNK_PARALLELISM', 3)
+_synth_pool = ThreadPoolExecutor(max_workers=getattr(settings, 'TTS_SYNTH_WORKERS', 8), thread_name_prefix='tts')
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;।。！？])\s+')
+
+
+def split_sentences(text, max_chars=CHUNK_CHARS):
+    """
+    Speakable chunks at sentence boundaries. The first sentence stays on its
+    own so audio can start early; later ones are merged up to `max_chars`,
+    and a longer sentence is cut at word boundaries.
+    """
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks = pieces[:1]
+    for piece in pieces[1:]:
+        if len(chunks) > 1 and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+
+def speech_key(text, target_lang='en', source_lang='auto', slow=False):
+    engine = backend_config(target_lang)['backend']
+    return tts_cache_key(text, source_lang, target_lang, {'engine': engine, 'slow': slow})
+
+
+def _chunk_audio(sentence, lang, slow):
+    """(mp3 bytes, degraded) for one chunk; chunks are cached on their own too (replies share sentences)."""
+    key = speech_key(sentence, lang, lang, slow)
+    audio = tts_cache.get(key)
+    if audio is not None:
+        return audio, False
+    audio, degraded = synthesize(sentence, lang, slow=slow)
+    if not degraded:
+        tts_cache.put(key, audio)
+    return audio, degraded
+
+
+def _chunk_futures(sentences, lang, slow, parallelism=CHUNK_PARALLELISM):
+    """Futures of each chunk's MP3, in order, with at most `parallelism` submitted ahead."""
+    pending = deque()
+    try:
+        for sentence in sentences:
+            pending.append(_synth_pool.submit(_chunk_audio, sentence, lang, slow))
+            if len(pending) >= parallelism:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _spoken_chunks(text, target_lang, source_lang):
+    # One batched translation call for every chunk
+    return translations.translate_many(split_sentences(text), dest=target_lang, src=source_lang)
+
+
+def speech(text, target_lang='en', source_lang='auto', slow=False, count_bytes=True):
+    """
+    (key, mp3 bytes, cache hit, degraded) for `text` spoken in `target_lang`,
+    translated first unless `source_lang == target_lang`. Multi-sentence
+    text is synthesized chunk by chunk in parallel; MP3 frames concatenate,
+    so the joined chunks play as one clip. `count_bytes` is passed to
+    TTSCache.get().
+    """
+    key = speech_key(text, target_lang, source_lang, slow)
+    audio = tts_cache.get(key, count_bytes=count_bytes)
+    if audio is not None:
+        logger.debug("tts lang=%s chars=%d cache_hit=True", target_lang, len(text))
+        return key, audio, True, False
+
+    spoken = _spoken_chunks(text, target_lang, source_lang)
+    if len(spoken) == 1:
+        audio, degraded = synthesize(spoken[0], target_lang, slow=slow)
+    else:
+        chunks = [future.result() for future in _chunk_futures(spoken, target_lang, slow)]
+        audio = b''.join(chunk for chunk, _ in chunks)
+        degraded = any(chunk_degraded for _, chunk_degraded in chunks)
+    if not degraded:
+        tts_cache.put(key, audio)
+    logger.debug("tts lang=%s chars=%d cache_hit=False degraded=%s", target_lang, len(text), degraded)
+    return key, audio, False, degraded
+
+
+async def stream_speech(text, target_lang='en', source_lang='auto', slow=False):
+    """
+    Async generator of the same MP3 bytes speech() returns, one sentence
+    chunk at a time, each yielded as soon as it and every earlier chunk are
+    ready. The whole clip is cached once complete (unless a fallback engine
+    spoke part of it). The caller checks the cache for the full text first.
+    """
+    loop = asyncio.get_running_loop()
+    key = speech_key(text, target_lang, source_lang, slow)
+    spoken = await loop.run_in_executor(_synth_pool, _spoken_chunks, text, target_lang, source_lang)
+    futures = _chunk_futures(spoken, target_lang, slow)
+    parts, degraded = [], False
+    try:
+        for future in futures:
+            data, chunk_degraded = await asyncio.wrap_future(future)
+            degraded = degraded or chunk_degraded
+            parts.append(data)
+            yield data
+    finally:
+        futures.close()
+    if not degraded:
+        await loop.run_in_executor(_synth_pool, tts_cache.put, key, b''.join(parts))
@@ -0,0 +1,251 @@
+# SignMeet/conferencing/tts_backends.py
+"""
+Text-to-speech backends behind one interface:
+
+    backend = load_backend('espeak')
+    mp3 = backend.synthesize("Hello", 'en')      # MP3 bytes
+
+Backends are picked per language from settings.TTS_BACKENDS (see
+`backend_for(lang)`). Every backend returns MP3, so clips from different
+engines cache, stream and concatenate the same way. Engines are imported
+lazily, so only the selected ones have to be installed.
+
+    'gtts'    Google Translate TTS over the network (the original engine)
+    'espeak'  espeak-ng in a local subprocess, encoded to MP3 with lameenc
+    'stub'    silent MP3 sized to the text, for tests and offline development
+"""
+import importlib.util
+import io
+import logging
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from .metrics import TTS_FALLBACKS, track_outbound
+
+logger = logging.getLogger(__name__)
+
+
+class TTSBackend:
+    """Base class: `synthesize(text, lang, slow)` returns MP3 bytes."""
+
+    name = None
+
+    def synthesize(self, text, lang, slow=False):
+        raise NotImplementedError
+
+    def synthesize_checked(self, text, lang, slow=False):
+        """(mp3 bytes, degraded): degraded is True when a fallback engine answered."""
+        return self.synthesize(text, lang, slow), False
+
+    def available(self):
+        """Whether the engine's dependencies are installed (checked before using it as a fallback)."""
+        return True
+
+    def stats(self):
+        return {'backend': self.name}
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+
+class GTTSBackend(TTSBackend):
+    name = 'gtts'
+
+    def __init__(self, timeout=10.0, **options):
+        self.timeout = timeout
+
+    def available(self):
+        return importlib.util.find_spec('gtts') is not None
+
+    def synthesize(self, text, lang, slow=False):
+        from gtts import gTTS
+        mp3_fp = io.BytesIO()
+        tts = gTTS(text=text, lang=lang, slow=slow, timeout=self.timeout)
+        with track_outbound('gtts'):
+            tts.write_to_fp(mp3_fp)
+        return mp3_fp.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """
+    espeak-ng, no network. Its WAV output is encoded to MP3 in-process with
+    lameenc. Voices are named after the language code (zh -> cmn).
+    """
+
+    name = 'espeak'
+    VOICES = {'zh': 'cmn', 'zh-cn': 'cmn', 'zh-tw': 'cmn'}
+
+    def __init__(self, executable='espeak-ng', words_per_minute=160, bitrate=48, **options):
+        self.executable = executable
+        self.words_per_minute = words_per_minute
+        self.bitrate = bitrate
+
+    def available(self):
+        return shutil.which(self.executable) is not None and importlib.util.find_spec('lameenc') is not None
+
+    def voice(self, lang):
+        lang = lang.lower()
+        return self.VOICES.get(lang, lang.split('-')[0])
+
+    def synthesize(self, text, lang, slow=False):
+        speed = int(self.words_per_minute * (0.7 if slow else 1.0))
+        wav = subprocess.run(
+            [self.executable, '--stdout', '-v', self.voice(lang), '-s', str(speed), text],
+            capture_output=True, check=True, timeout=30,
+        ).stdout
+        return self._encode_mp3(wav)
+
+    def _encode_mp3(self, wav_bytes):
+        import lameenc
+        with wave.open(io.BytesIO(wav_bytes)) as wav:
+            pcm = wav.readframes(wav.getnframes())
+            encoder = lameenc.Encoder()
+            encoder.set_in_sample_rate(wav.getframerate())
+            encoder.set_channels(wav.getnchannels())
+            encoder.set_bit_rate(self.bitrate)
+            encoder.set_quality(7)  # fast; speech does not need more
+        return bytes(encoder.encode(pcm) + encoder.flush())
+
+
+class StubBackend(TTSBackend):
+    """Silent MPEG-2 Layer III frames (24 kHz mono), about `ms_per_char` per character."""
+
+    name = 'stub'
+    # 32 kbps, 24 kHz, mono, no CRC: 96-byte frames of 576 samples (24 ms)
+    FRAME = b'\xff\xf3\x44\xc0' + bytes(92)
+
+    def __init__(self, ms_per_char=60, **options):
+        self.ms_per_char = ms_per_char
+
+    def synthesize(self, text, lang, slow=False):
+        duration_ms = max(1, len(text)) * self.ms_per_char * (1.5 if slow else 1.0)
+        return self.FRAME * max(1, int(duration_ms // 24))
+
+
+class FallbackBackend(TTSBackend):
+    """
+    `primary`, but switch to `fallback` when it fails or takes longer than
+    `budget_seconds`. After a miss the fallback answered, the primary is
+    skipped for `cooldown_seconds`, so a dead network costs one budget, not
+    one per clip; a late primary result is discarded. If the fallback fails
+    too, the caller gets what the primary alone would have given (its late
+    result or its error) and no cooldown starts.
+    """
+
+    def __init__(self, primary, fallback, budget_seconds=1.5, cooldown_seconds=30.0, max_pending=8):
+        self.primary = primary
+        self.fallback = fallback
+        self.budget_seconds = float(budget_seconds)
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.name = primary.name
+        self._pool = ThreadPoolExecutor(max_workers=max_pending, thread_name_prefix=f'tts-{primary.name}')
+        self._lock = threading.Lock()
+        self._skip_until = 0.0
+        self._fallbacks = {'timeout': 0, 'error': 0, 'cooldown': 0}
+
+    def synthesize(self, text, lang, slow=False):
+        return self.synthesize_checked(text, lang, slow)[0]
+
+    def synthesize_checked(self, text, lang, slow=False):
+        if time.monotonic() < self._skip_until:
+            try:
+                return self._fall_back('cooldown', text, lang, slow)
+            except Exception:
+                # The fallback broke as well: stop skipping the primary
+                with self._lock:
+                    self._skip_until = 0.0
+        future = self._pool.submit(self.primary.synthesize, text, lang, slow)
+        try:
+            return future.result(timeout=self.budget_seconds), False
+        except FutureTimeout:
+            logger.warning("TTS primary over budget backend=%s budget_s=%s lang=%s",
+                           self.primary.name, self.budget_seconds, lang)
+            return self._fall_back('timeout', text, lang, slow, primary=future)
+        except Exception as e:
+            logger.warning("TTS primary failed backend=%s lang=%s error=%s", self.primary.name, lang, e)
+            return self._fall_back('error', text, lang, slow, primary=future)
+
+    def _fall_back(self, reason, text, lang, slow, primary=None):
+        try:
+            audio = self.fallback.synthesize(text, lang, slow)
+        except Exception as e:
+            logger.warning("TTS fallback failed backend=%s reason=%s error=%s", self.fallback.name, reason, e)
+            if primary is None:
+                raise
+            # As if there were no fallback: wait for the primary, or raise its error
+            return primary.result(), False
+        with self._lock:
+            self._fallbacks[reason] += 1
+            if reason != 'cooldown':
+                self._skip_until = time.monotonic() + self.cooldown_seconds
+        TTS_FALLBACKS.labels(backend=self.primary.name, reason=reason).inc()
+        return audio, True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.primary.name,
+                'fallback': self.fallback.name,
+                'budget_seconds': self.budget_seconds,
+                'cooling_down': time.monotonic() < self._skip_until,
+                'fallbacks': dict(self._fallbacks),
+            }
+
+
+BACKENDS = {
+    'gtts': GTTSBackend,
+    'espeak': EspeakBackend,
+    'stub': StubBackend,
+}
+
+
+def load_backend(backend, fallback=None, budget_seconds=1.5, cooldown_seconds=30.0, **options):
+    """
+    Build the backend for `backend` ('gtts', 'espeak', 'stub'), wrapped in a
+    FallbackBackend if `fallback` is set and its dependencies are installed.
+    """
+    try:
+        backend_cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    instance = backend_cls(**options)
+    if fallback and fallback != backend:
+        fallback_backend = load_backend(fallback)
+        if fallback_backend.available():
+            return FallbackBackend(instance, fallback_backend, budget_seconds, cooldown_seconds)
+        logger.warning("TTS fallback unavailable, using %s alone fallback=%s", backend, fallback)
+    return instance
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def backend_config(lang):
+    """settings.TTS_BACKENDS[lang] (or its base language, e.g. 'pt' for 'pt-BR'), else ['default']."""
+    from django.conf import settings
+    configured = getattr(settings, 'TTS_BACKENDS', {})
+    default = {'backend': 'gtts'}
+    lang = lang.lower()
+    return dict(configured.get(lang) or configured.get(lang.split('-')[0]) or configured.get('default') or default)
+
+
+def backend_for(lang):
+    """The (cached) backend instance configured for `lang`."""
+    config = backend_config(lang)
+    key = repr(sorted(config.items()))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = load_backend(**config)
+        return backend
+
+
+def backend_stats():
+    with _backends_lock:
+        return [backend.stats() for backend in _backends.values()]
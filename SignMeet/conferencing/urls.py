@@ -9,6 +9,16 @@ urlpatterns = [
 
     # --- Add this new path for the chatbot ---
     path('chat/send_message/', views.sense_chat_message, name='sense_chat_message'),
+    path('chat/stream/', views.sense_chat_stream, name='sense_chat_stream'),
+    path('chat/stats/', views.sense_chat_stats, name='sense_chat_stats'),
     path('api/dynamic_tts/', views.generate_dynamic_tts, name='api_dynamic_tts'),
+    path('api/process_caption/', views.process_caption, name='process_caption'),
+    path('api/translate/', views.translate_texts, name='api_translate'),
+    path('api/tts/stats/', views.tts_stats, name='tts_stats'),
+    path('api/tts/<str:key>.mp3', views.tts_audio, name='tts_audio'),
     path('detect_sign/', views.detect_sign, name='detect_sign'),
+    path('detect_sign/frame/', views.detect_sign_frame, name='detect_sign_frame'),
+    path('detect_sign/stats/', views.detect_sign_stats, name='detect_sign_stats'),
+    path('healthz/ready', views.healthz_ready, name='healthz_ready'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -2,19 +2,34 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from agora_token_builder import RtcTokenBuilder
-import time, random, json, os
+import time, random, json, os, base64
 from dotenv import load_dotenv
-import google.generativeai as genai
-from django.http import HttpRequest, HttpResponse
-from gtts import gTTS
-from googletrans import Translator
-import io, tempfile
-import base64
-import numpy as np
-from PIL import Image
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import img_to_array
-import mediapipe as mp
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.conf import settings
+from django.urls import reverse
+import logging
+from asgiref.sync import sync_to_async
+from . import metrics
+from .metrics import (
+    CHAT_ERRORS, CHAT_FIRST_TOKEN_SECONDS, CHAT_REPLY_SECONDS, TTS_FIRST_BYTE_SECONDS, SIGN_ERRORS, SIGN_PREDICTIONS, SIGN_REQUEST_SECONDS,
+    observe_latency, track_outbound,
+)
+from .batching import BatchQueueFull
+from .decoding import FrameDecodeError, decode_data_url, decode_image_bytes, decode_stats
+from .streams import StreamStore
+from .smoothing import SignDecoder
+from .gating import FrameChangeGate, GateStats
+from . import tts
+from .translation import translations
+from .rooms import participant_name, room_broadcaster
+from .tts_backends import backend_stats
+from .chat import ChatBusy, ChatSessionStore, ChatTimeout, UpstreamLimiter
+from .caching import TTLCache
+from .faq import FaqAnswerer, KnowledgeIndex
+from .services import hand_trackers, inference_service_enabled, readiness, registry
+from .inference_service import InferenceServiceBusy, InferenceServiceError
+
+logger = logging.getLogger(__name__)
 
 # --- Load environment variables ---
 load_dotenv()
@@ -23,11 +38,9 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if not GEMINI_API_KEY:
-    print("❌ GEMINI_API_KEY not found in environment.")
+    logger.error("GEMINI_API_KEY not found in environment")
 else:
-    print("✅ Gemini API key loaded successfully.")
-
-genai.configure(api_key=GEMINI_API_KEY)
+    logger.info("Gemini API key loaded")
 
 # --- Bot instructions (CLEANED UP) ---
 SENSE_BOT_INSTRUCTIONS = """
@@ -112,18 +125,63 @@ Your job is to answer user questions about SENSE.
 ---
 """
 
-# --- Initialize Gemini Model ---
-try:
-    sense_model = genai.GenerativeModel(
+# --- Gemini model (built on first use or during warm-up) ---
+def _load_gemini():
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(
         model_name="gemini-1.5-flash",  # Using 1.5-flash
         system_instruction=SENSE_BOT_INSTRUCTIONS
     )
-    chat_session = sense_model.start_chat(history=[])
-    print("✅ Gemini SENSE Bot initialized successfully.")
-except Exception as e:
-    print(f"❌ Error initializing Gemini: {e}")
-    sense_model = None
-    chat_session = None
+
+
+registry.register('gemini', _load_gemini)
+
+# Repeat and clearly-matching questions are answered without a Gemini call
+faq = FaqAnswerer(
+    KnowledgeIndex.from_instructions(SENSE_BOT_INSTRUCTIONS),
+    min_score=getattr(settings, 'SENSE_FAQ_MIN_SCORE', 0.6),
+    min_margin=getattr(settings, 'SENSE_FAQ_MIN_MARGIN', 0.08),
+    cache=TTLCache(
+        max_entries=getattr(settings, 'SENSE_CHAT_CACHE_SIZE', 2048),
+        ttl_seconds=getattr(settings, 'SENSE_CHAT_CACHE_TTL_SECONDS', 3600),
+    ),
+) if getattr(settings, 'SENSE_FAQ_ENABLED', True) else None
+
+# One bounded conversation per user instead of a single shared chat session
+chat_sessions = ChatSessionStore(
+    max_sessions=getattr(settings, 'SENSE_CHAT_MAX_SESSIONS', 1000),
+    ttl_seconds=getattr(settings, 'SENSE_CHAT_SESSION_TTL_SECONDS', 1800),
+    max_turns=getattr(settings, 'SENSE_CHAT_MAX_TURNS', 10),
+    max_tokens=getattr(settings, 'SENSE_CHAT_MAX_HISTORY_TOKENS', 2000),
+    max_total_chars=getattr(settings, 'SENSE_CHAT_MAX_TOTAL_CHARS', 4_000_000),
+    faq=faq,
+    limiter=UpstreamLimiter(
+        max_inflight=getattr(settings, 'SENSE_CHAT_MAX_INFLIGHT', 8),
+        queue_timeout=getattr(settings, 'SENSE_CHAT_QUEUE_TIMEOUT_SECONDS', 0.5),
+        timeout=getattr(settings, 'SENSE_CHAT_TIMEOUT_SECONDS', 20.0),
+        retry_after=getattr(settings, 'SENSE_CHAT_RETRY_AFTER_SECONDS', 2),
+    ),
+)
+
+
+def _chat_session_id(request, data):
+    """
+    History key owned by the caller: the user's pk when signed in, else the
+    Django session key. An explicit id (header or JSON body) only selects one
+    of the caller's own conversations, so it cannot reach another's history.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        owner = f"user-{user.pk}"
+    else:
+        if request.session.session_key is None:
+            request.session.save()
+        owner = request.session.session_key
+    client_id = request.headers.get('X-Chat-Session-Id') or data.get('session_id')
+    if client_id:
+        return f"{owner}:{str(client_id)[:64]}"
+    return owner
 
 
 # --- Basic Views ---
@@ -158,288 +216,578 @@ def get_agora_token(request):
 
 
 # --- Chatbot endpoint ---
-@csrf_exempt
-def sense_chat_message(request):
+def _busy_response(error):
+    response = JsonResponse({'error': str(error)}, status=503)
+    response['Retry-After'] = str(error.retry_after)
+    return response
+
+
+async def _chat_request(request):
+    """
+    Shared request handling for both chat endpoints: returns
+    (session_id, message, model, None) or (..., error response).
+    """
     if request.method != 'POST':
-        return JsonResponse({'error': 'Invalid request method.'}, status=405)
+        return None, None, None, JsonResponse({'error': 'Invalid request method.'}, status=405)
 
-    if not chat_session:
-        print("❌ Chat session is not initialized.")
-        return JsonResponse({'error': 'Gemini model not initialized.'}, status=500)
+    # A first call may import and configure the client; keep that off the event loop
+    sense_model = await sync_to_async(registry.get, thread_sensitive=False)('gemini')
+    if not sense_model:
+        logger.error("Gemini model is not initialized")
+        return None, None, None, JsonResponse({'error': 'Gemini model not initialized.'}, status=500)
 
     try:
         data = json.loads(request.body)
-        user_message = data.get('message')
-        print("📩 User message:", user_message)
+    except ValueError:
+        return None, None, None, JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    user_message = data.get('message')
+    logger.debug("chat message received chars=%d", len(user_message or ''))
+    if not user_message:
+        return None, None, None, JsonResponse({'error': 'No message provided.'}, status=400)
 
-        if not user_message:
-            return JsonResponse({'error': 'No message provided.'}, status=400)
+    session_id = await sync_to_async(_chat_session_id)(request, data)
+    return session_id, user_message, sense_model, None
 
-        # --- Add this debug ---
-        print("🚀 Sending message to Gemini...")
-        response = chat_session.send_message(user_message)
-        print("✅ Gemini response received.")
 
-        return JsonResponse({'reply': response.text})
+@csrf_exempt
+@observe_latency(CHAT_REPLY_SECONDS.labels(endpoint='send_message'))
+async def sense_chat_message(request):
+    """
+    POST /chat/send_message/ - one JSON reply. Async, so a slow Gemini call
+    holds a coroutine rather than a worker thread; saturated upstream slots
+    give a fast 503 with Retry-After and a missed deadline a 504.
+    """
+    session_id, user_message, sense_model, error = await _chat_request(request)
+    if error is not None:
+        return error
 
+    try:
+        reply = await chat_sessions.send(session_id, user_message, sense_model)
+        return JsonResponse({'reply': reply})
+    except ChatBusy as e:
+        logger.warning("chat rejected reason=busy retry_after=%s", e.retry_after)
+        return _busy_response(e)
+    except ChatTimeout as e:
+        logger.warning("chat failed reason=timeout error=%s", e)
+        return JsonResponse({'error': str(e)}, status=504)
     except Exception as e:
-        import traceback
-        print("❌ Gemini API Error:", e)
-        traceback.print_exc()
+        CHAT_ERRORS.labels(reason='upstream').inc()
+        logger.exception("Gemini API error")
         return JsonResponse({'error': str(e)}, status=500)
+
+
+def _sse(data, event=None):
+    prefix = f"event: {event}\n" if event else ''
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+async def _chat_event_stream(first, chunks, started):
+    """
+    SSE body: one `data: {"delta": ...}` event per reply chunk (starting
+    with the already received `first`), then `event: done` with the full
+    reply (or `event: error`).
+    """
+    parts = []
+    try:
+        if first:
+            parts.append(first)
+            yield _sse({'delta': first})
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield _sse({'delta': chunk})
+        CHAT_REPLY_SECONDS.labels(endpoint='stream').observe(time.perf_counter() - started)
+        yield _sse({'reply': ''.join(parts)}, event='done')
+    except (ChatBusy, ChatTimeout) as e:
+        logger.warning("chat stream failed error=%s", e)
+        yield _sse({'error': str(e)}, event='error')
+    except Exception as e:
+        CHAT_ERRORS.labels(reason='upstream').inc()
+        logger.exception("Gemini streaming error")
+        yield _sse({'error': str(e)}, event='error')
+    finally:
+        # Releases the session lock and upstream slot if the client went away mid-reply
+        await chunks.aclose()
+
+
+@csrf_exempt
+async def sense_chat_stream(request):
+    """
+    POST /chat/stream/ - same body as /chat/send_message/, but the reply is
+    streamed as Server-Sent Events while Gemini generates it. Needs the ASGI
+    server to actually stream (WSGI would buffer the whole body).
+    """
+    started = time.perf_counter()
+    session_id, user_message, sense_model, error = await _chat_request(request)
+    if error is not None:
+        return error
+
+    chunks = chat_sessions.stream(session_id, user_message, sense_model)
+    try:
+        # Pull the first chunk before answering, so saturation is still a plain 503
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except ChatBusy as e:
+        logger.warning("chat rejected reason=busy retry_after=%s", e.retry_after)
+        return _busy_response(e)
+    except ChatTimeout as e:
+        logger.warning("chat failed reason=timeout error=%s", e)
+        return JsonResponse({'error': str(e)}, status=504)
+    except Exception as e:
+        CHAT_ERRORS.labels(reason='upstream').inc()
+        logger.exception("Gemini streaming error")
+        return JsonResponse({'error': str(e)}, status=500)
+    CHAT_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started)
+
+    response = StreamingHttpResponse(
+        _chat_event_stream(first, chunks, started), content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # keep nginx from buffering the events
+    return response
+
+
+def sense_chat_stats(request):
+    """GET /chat/stats/ - chat sessions plus FAQ cache/index hit ratio."""
+    return JsonResponse(chat_sessions.stats())
     
 
+def _etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    return any(tag.strip().removeprefix('W/') in (etag, '*') for tag in header.split(','))
+
+
+def _byte_range(request, size, etag):
+    """
+    (start, end) inclusive for a single-range `Range: bytes=...` header,
+    None to send the whole body, or 'invalid' for an unsatisfiable range.
+    Multi-range requests and stale If-Range validators get the whole body.
+    """
+    header = request.headers.get('Range', '')
+    if not header.startswith('bytes=') or ',' in header:
+        return None
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range != etag:
+        return None
+    first, _, last = header[len('bytes='):].strip().partition('-')
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        return 'invalid'
+    return start, end
+
+
+def _audio_response(request, key, audio=None, hit=None, degraded=False):
+    """
+    MP3 response with ETag = the content key. A matching If-None-Match gets
+    a 304 without touching the cache: the key already pins the audio's inputs.
+    Single byte ranges are answered with 206 (seeking in <audio> elements).
+    A `degraded` clip (spoken by a fallback engine) gets its own ETag and
+    no-store, so no browser or proxy keeps it in place of the real clip.
+    For a cache hit, the bytes actually sent count as saved, so a seek
+    counts only its range (callers fetch with count_bytes=False).
+    """
+    etag = f'"{key}-fallback"' if degraded else f'"{key}"'
+    if _etag_matches(request, etag):
+        response = HttpResponse(status=304)
+    else:
+        byte_range = _byte_range(request, len(audio), etag)
+        if byte_range == 'invalid':
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{len(audio)}'
+            return response
+        if byte_range is None:
+            response = HttpResponse(audio, content_type='audio/mpeg')
+        else:
+            start, end = byte_range
+            response = HttpResponse(audio[start:end + 1], content_type='audio/mpeg', status=206)
+            response['Content-Range'] = f'bytes {start}-{end}/{len(audio)}'
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = 'inline; filename="speech.mp3"'
+        if hit is not None:
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+        if hit:
+            tts.tts_cache.add_bytes_saved(len(response.content))
+    response['ETag'] = etag
+    if degraded:
+        response['Cache-Control'] = 'no-store'
+    else:
+        response['Cache-Control'] = f"public, max-age={getattr(settings, 'TTS_HTTP_MAX_AGE_SECONDS', 86400)}"
+    return response
+
+
+@csrf_exempt
 def process_caption(request):
-    import json
-    data = json.loads(request.body)
+    """
+    POST {"text": ...} -> {"audio_url": ...} for the spoken caption, served
+    from the TTS store (no temp file per request). Clips up to
+    TTS_INLINE_MAX_BYTES also come back inline as "audio_data" (a data: URL),
+    saving the client a second round trip. With "room" the caption text is
+    also broadcast to the room's sockets.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method.'}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
     text = data.get("text", "")
+    if not text:
+        return JsonResponse({'error': 'No text provided.'}, status=400)
+
+    room, user = _room_target(request, data)
+    if room:
+        room_broadcaster.publish(room, 'caption', user, text)
+
+    try:
+        key, audio, _, _ = tts.speech(text, target_lang="en", source_lang="en")
+    except Exception as e:
+        logger.exception("caption TTS failed")
+        return JsonResponse({'error': str(e)}, status=500)
+
+    result = {}
+    stored = key in tts.tts_cache
+    if stored:
+        result['audio_url'] = reverse('tts_audio', args=[key])
+    # Clips from a fallback engine are not stored, so they always travel inline
+    if not stored or len(audio) <= getattr(settings, 'TTS_INLINE_MAX_BYTES', 16 * 1024):
+        result['audio_data'] = 'data:audio/mpeg;base64,' + base64.b64encode(audio).decode('ascii')
+    return JsonResponse(result)
+
+
+def tts_audio(request, key):
+    """GET /api/tts/<key>.mp3 - a clip from the TTS store, with Range support (404 once evicted)."""
+    if _etag_matches(request, f'"{key}"'):
+        return _audio_response(request, key)
+    audio = tts.tts_cache.get(key, count_bytes=False)
+    if audio is None:
+        return HttpResponse("Audio not found", status=404)
+    return _audio_response(request, key, audio, hit=True)
+
+
+def tts_stats(request):
+    """GET /api/tts/stats/ - TTS and translation cache hit ratios, bytes saved, upstream calls, fallbacks."""
+    return JsonResponse({
+        **tts.tts_cache.stats(),
+        'translation': translations.stats(),
+        'backends': backend_stats(),
+    })
+
+
+@csrf_exempt
+def translate_texts(request):
+    """
+    POST /api/translate/ {"texts": [...], "dest": "hi", "src": "auto"}
+    -> {"translations": [...]}, in order. Cached strings cost nothing and the
+    rest go upstream in as few calls as possible.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method.'}, status=405)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    texts, dest = data.get('texts'), data.get('dest')
+    if not dest or not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return JsonResponse({'error': "Provide 'dest' and a list of strings in 'texts'."}, status=400)
 
-    # Example: convert text to speech dynamically
-    tts = gTTS(text, lang="en")
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-        tts.save(tmp.name)
-        return JsonResponse({"audio_url": "/media/" + os.path.basename(tmp.name)})
+    try:
+        return JsonResponse({'translations': translations.translate_many(texts, dest, data.get('src') or 'auto')})
+    except Exception as e:
+        logger.exception("translation failed dest=%s", dest)
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+async def _timed_audio_stream(first, chunks, started):
+    TTS_FIRST_BYTE_SECONDS.labels(mode='streamed').observe(time.perf_counter() - started)
+    yield first
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception:
+        # Headers are sent; the client sees a truncated clip
+        logger.exception("TTS streaming failed mid-clip")
+    finally:
+        await chunks.aclose()
 
 
-def generate_dynamic_tts(request):
+async def generate_dynamic_tts(request):
     """
     GET /api/dynamic_tts/?text=Hello&lang=hi
     or via POST form with 'text' and 'lang'
+
+    Text with several sentences is streamed: chunks are synthesized in
+    parallel and sent in order as they finish (add stream=0 to get the
+    whole clip at once). Cached clips are always sent whole. A streamed clip
+    may turn out to be partly spoken by a fallback engine after its headers
+    are sent, so it is not HTTP-cacheable; the next request gets the stored
+    clip with its ETag.
     """
+    started = time.perf_counter()
     text = request.GET.get('text') or request.POST.get('text')
     lang = request.GET.get('lang') or request.POST.get('lang') or 'en'
 
     if not text:
         return HttpResponse("No text provided", status=400)
 
+    key = tts.speech_key(text, target_lang=lang)
+    if _etag_matches(request, f'"{key}"'):
+        return _audio_response(request, key)
+
+    stream = (request.GET.get('stream') or request.POST.get('stream')) != '0'
     try:
-        # 1️⃣ Translate to target language
-        translator = Translator()
-        translated = translator.translate(text, dest=lang)
-        translated_text = translated.text
-
-        # 2️⃣ Generate speech from translated text
-        mp3_fp = io.BytesIO()
-        tts = gTTS(text=translated_text, lang=lang, slow=False)
-        tts.write_to_fp(mp3_fp)
-        mp3_fp.seek(0)
-
-        # 3️⃣ Return the audio stream
-        response = HttpResponse(mp3_fp.read(), content_type='audio/mpeg')
-        response['Content-Disposition'] = 'inline; filename="speech.mp3"'
-        return response
+        if stream and len(tts.split_sentences(text)) > 1:
+            audio = await sync_to_async(tts.tts_cache.get, thread_sensitive=False)(key, count_bytes=False)
+            if audio is None:
+                chunks = tts.stream_speech(text, target_lang=lang)
+                # First chunk before the headers, so an early failure is still a 500
+                first = await chunks.__anext__()
+                response = StreamingHttpResponse(
+                    _timed_audio_stream(first, chunks, started), content_type='audio/mpeg',
+                )
+                response['Content-Disposition'] = 'inline; filename="speech.mp3"'
+                response['Cache-Control'] = 'no-store'
+                response['X-Cache'] = 'MISS'
+                return response
+            hit, degraded = True, False
+        else:
+            # Translate to the target language and synthesize, unless cached
+            key, audio, hit, degraded = await sync_to_async(tts.speech, thread_sensitive=False)(
+                text, target_lang=lang, count_bytes=False,
+            )
+        TTS_FIRST_BYTE_SECONDS.labels(mode='buffered').observe(time.perf_counter() - started)
+        return _audio_response(request, key, audio, hit, degraded)
 
     except Exception as e:
+        logger.exception("TTS failed lang=%s", lang)
         return HttpResponse(f"Error: {e}", status=500)
 
 
-# Load model once globally
-MODEL_PATH = "ml_models/best_sign_model.h5"
-try:
-    classifier_model = load_model(MODEL_PATH)
-    print(f"✅ Sign classifier model loaded successfully from {MODEL_PATH}")
-except Exception as e:
-    print(f"❌ ERROR: Could not load sign classifier model from {MODEL_PATH}. Error: {e}")
-    classifier_model = None
-
-# Load MediaPipe Hand Detector Model
-try:
-    mp_hands = mp.solutions.hands
-    # Initialize with static_image_mode=True for processing individual images
-    # max_num_hands=1 because we only care about one sign at a time
-    hand_detector = mp_hands.Hands(
-        static_image_mode=True, 
-        max_num_hands=1, 
-        min_detection_confidence=0.5
+# Server-side temporal smoothing: one vote/hysteresis decoder per stream, so
+# the client only appends letters the server marks as stable.
+sign_decoders = StreamStore(
+    factory=lambda: SignDecoder(
+        window=getattr(settings, 'SIGN_DECODER_WINDOW', 6),
+        min_votes=getattr(settings, 'SIGN_DECODER_MIN_VOTES', 4),
+        min_confidence=getattr(settings, 'SIGN_DECODER_MIN_CONFIDENCE', 60.0),
+        idle_frames=getattr(settings, 'SIGN_DECODER_IDLE_FRAMES', 4),
+    ),
+    max_streams=getattr(settings, 'SIGN_TRACKER_MAX_STREAMS', 256),
+    ttl_seconds=getattr(settings, 'SIGN_TRACKER_TTL_SECONDS', 30),
+    name='sign_decoders',
+)
+
+# Frame-change gating: a stream frame that barely differs from the last
+# classified one reuses that result without touching MediaPipe or the model.
+frame_gate_stats = GateStats(name='http_streams')
+frame_gates = StreamStore(
+    factory=lambda: FrameChangeGate(
+        threshold=getattr(settings, 'SIGN_FRAME_DIFF_THRESHOLD', 3.0),
+        max_age=getattr(settings, 'SIGN_FRAME_CACHE_MAX_AGE_SECONDS', 2.0),
+        stats=frame_gate_stats,
+    ),
+    max_streams=getattr(settings, 'SIGN_TRACKER_MAX_STREAMS', 256),
+    ttl_seconds=getattr(settings, 'SIGN_TRACKER_TTL_SECONDS', 30),
+    name='frame_gates',
+)
+
+# Large uploads are JPEG-decoded at reduced scale down to this shorter side
+DECODE_MIN_SIDE = getattr(settings, 'SIGN_DECODE_MIN_SIDE', 320)
+
+# --- Sign detection views ---
+def _stream_id(request):
+    """Client stream id (header, query or form field); None means single-image mode."""
+    return (
+        request.headers.get('X-Stream-Id')
+        or request.GET.get('stream_id')
+        or request.POST.get('stream_id')
+        or None
     )
-    print("✅ MediaPipe hand detector loaded successfully.")
-except Exception as e:
-    print(f"❌ ERROR: Could not load MediaPipe hands model. Error: {e}")
-    hand_detector = None
-
-CLASS_NAMES = [
-    '1', '2', '3', '4', '5', '6', '7', '8', '9',
-    'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J',
-    'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T',
-    'U', 'V', 'W', 'X', 'Y', 'Z'
-]
+
+
+def _room_target(request, data=None, stream_id=None):
+    """
+    (room, participant) to share results with; room (header, query, form or
+    JSON field) None means don't. The participant is the signed-in user or a
+    guest id from the session (else the stream id), never client-supplied.
+    """
+    data = data or {}
+    room = (
+        request.headers.get('X-Sign-Room')
+        or request.GET.get('room')
+        or request.POST.get('room')
+        or data.get('room')
+        or None
+    )
+    session = getattr(request, 'session', None)
+    participant = participant_name(
+        getattr(request, 'user', None), getattr(session, 'session_key', None), stream_id,
+    )
+    return room, participant
+
+
+def _sign_models_loaded():
+    if inference_service_enabled():
+        return registry.get('inference_service') is not None
+    return registry.get('sign_recognizer') is not None
+
+
+def _classify_frame(frame_rgb, stream_id=None):
+    """_detect_sign_in_frame, in the inference worker pool when it is enabled."""
+    if inference_service_enabled():
+        return registry.get('inference_service').run('sign', frame_rgb, stream_id)
+    return _detect_sign_in_frame(frame_rgb, stream_id)
+
+
+def _detect_sign_in_frame(frame_rgb, stream_id=None):
+    """
+    Hand detection + classification on a decoded RGB frame, through the shared
+    SignRecognizer pipeline (ml_models/pipeline.py). Returns the result dict.
+    """
+    return registry.get('sign_recognizer').recognize(frame_rgb, stream_id)
+
+
+def _sign_response(frame_rgb, stream_id=None, room=None, user=None):
+    """
+    Detect the sign in one frame. Streams (frames sent with a stream id) are
+    first checked against their FrameChangeGate (`cached` in the response),
+    then go through their SignDecoder, which adds `emit` (the letter to
+    append, or None) and `state` ('idle' / 'pending' / 'holding'). With a
+    `room`, each emitted letter is also broadcast to the room's sockets as `user`.
+    """
+    try:
+        if stream_id:
+            with frame_gates.acquire(stream_id) as gate:
+                result, cached = gate.run(
+                    frame_rgb, lambda frame: _classify_frame(frame, stream_id)
+                )
+            # Copy: the gate keeps the original dict as its cached result
+            result = dict(result, cached=cached)
+        else:
+            result = _classify_frame(frame_rgb)
+    except (BatchQueueFull, InferenceServiceBusy):
+        SIGN_ERRORS.labels(source='http', reason='busy').inc()
+        return JsonResponse({'error': 'Sign classifier is busy, try again'}, status=503)
+    except InferenceServiceError as e:
+        SIGN_ERRORS.labels(source='http', reason='inference_service').inc()
+        return JsonResponse({'error': f'Inference service unavailable: {e}'}, status=503)
+
+    SIGN_PREDICTIONS.labels(pipeline='http', label=result['label']).inc()
+    if stream_id and sign_decoders is not None:
+        with sign_decoders.acquire(stream_id) as decoder:
+            result.update(decoder.update(result['label'], result['confidence']))
+        if room and result.get('emit'):
+            room_broadcaster.publish(room, 'sign', user, result['emit'])
+    logger.debug("sign frame stream=%s label=%s confidence=%s cached=%s",
+                 stream_id, result['label'], result['confidence'], result.get('cached'))
+    return JsonResponse(result)
+
 
 @csrf_exempt
+@observe_latency(SIGN_REQUEST_SECONDS.labels(endpoint='detect_sign'))
 def detect_sign(request):
+    """Legacy form upload: `image` is a canvas.toDataURL('image/jpeg') string."""
     if request.method == 'POST':
-        if not classifier_model or not hand_detector:
-                 return JsonResponse({'error': 'Models not loaded on server'}, status=500)
-                 
+        # Check if models are loaded (loads them on the first request)
+        if not _sign_models_loaded():
+            return JsonResponse({'error': 'Models not loaded on server'}, status=500)
+
         image_data = request.POST.get('image')
         if not image_data:
             return JsonResponse({'error': 'No image received'}, status=400)
 
         try:
-            # --- Decode image ---
-            _, imgstr = image_data.split(';base64,')
-            img_bytes = base64.b64decode(imgstr)
-            original_pil_image = Image.open(io.BytesIO(img_bytes)).convert('RGB')
-            frame_rgb = np.array(original_pil_image)
-
-            # --- STEP 1: DETECT HAND ---
-            results = hand_detector.process(frame_rgb)
-
-            if not results.multi_hand_landmarks:
-                return JsonResponse({'label': 'No Hand', 'confidence': 0})
-
-            # --- Hand IS found, get landmarks ---
-            hand_landmarks = results.multi_hand_landmarks[0]
-            img_height, img_width, _ = frame_rgb.shape
-
-            # --- ❌ REMOVED FIST CHECK ---
-            # We no longer check for 'SPACE' here.
-
-            # --- Proceed to Keras model ---
-            
-            # (Calculate bounding box)
-            x_coords = [landmark.x * img_width for landmark in hand_landmarks.landmark]
-            y_coords = [landmark.y * img_height for landmark in hand_landmarks.landmark]
-            
-            x_min = int(min(x_coords))
-            x_max = int(max(x_coords))
-            y_min = int(min(y_coords))
-            y_max = int(max(y_coords))
-
-            padding = 20
-            x_min = max(0, x_min - padding)
-            y_min = max(0, y_min - padding)
-            x_max = min(img_width, x_max + padding)
-            y_max = min(img_height, y_max + padding)
-
-            # --- Crop, Squarify, and Classify ---
-            cropped_hand_img = original_pil_image.crop((x_min, y_min, x_max, y_max))
-            square_hand_img = squarify_image(cropped_hand_img)
-            image_to_predict = square_hand_img.resize((224, 224))
-            
-            img_array = img_to_array(image_to_predict)
-            img_array = np.expand_dims(img_array / 255.0, axis=0)
-
-            # Predict
-            preds = classifier_model.predict(img_array)
-            class_index = np.argmax(preds[0])
-            confidence = float(np.max(preds[0]))
-            
-            # Confidence threshold
-            if confidence < 0.6: # 60% threshold
-                 return JsonResponse({'label': 'Unknown', 'confidence': 0})
-                 
-            predicted_label = CLASS_NAMES[class_index]
-
-            return JsonResponse({
-                'label': predicted_label,
-                'confidence': round(confidence * 100, 2)
-            })
-        
+            frame_rgb = decode_data_url(image_data, DECODE_MIN_SIDE)
+        except FrameDecodeError as e:
+            SIGN_ERRORS.labels(source='http', reason='decode').inc()
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            stream_id = _stream_id(request)
+            return _sign_response(frame_rgb, stream_id, *_room_target(request, stream_id=stream_id))
         except Exception as e:
-            import traceback
-            print(f"Error during prediction: {e}")
-            traceback.print_exc()
+            SIGN_ERRORS.labels(source='http', reason='exception').inc()
+            logger.exception("error during sign prediction")
             return JsonResponse({'error': str(e)}, status=500)
 
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
-# --- ⭐️ 3. HELPER FUNCTION TO PAD IMAGE TO A SQUARE ⭐️ ---
-def squarify_image(pil_img):
-    """Pads a PIL image to be square."""
-    # Get the larger dimension
-    width, height = pil_img.size
-    new_size = max(width, height)
-    
-    # Create a new square background image (black)
-    new_im = Image.new("RGB", (new_size, new_size), (0, 0, 0))
-    
-    # Paste the original image into the center of the square background
-    new_im.paste(pil_img, ((new_size - width) // 2, (new_size - height) // 2))
-    return new_im
-
 
-# --- ⭐️ 4. UPDATED DETECT_SIGN VIEW ⭐️ ---
 @csrf_exempt
-def detect_sign(request):
-    if request.method == 'POST':
-        # Check if models are loaded
-        if not classifier_model or not hand_detector:
-             return JsonResponse({'error': 'Models not loaded on server'}, status=500)
-             
-        image_data = request.POST.get('image')
-        if not image_data:
-            return JsonResponse({'error': 'No image received'}, status=400)
+@observe_latency(SIGN_REQUEST_SECONDS.labels(endpoint='detect_sign_frame'))
+def detect_sign_frame(request):
+    """
+    Binary upload: the request body is the raw JPEG/WebP frame
+    (e.g. fetch(url, {body: blob})), or a multipart form with a `frame` file.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+
+    if not _sign_models_loaded():
+        return JsonResponse({'error': 'Models not loaded on server'}, status=500)
+
+    upload = request.FILES.get('frame')
+    frame_bytes = upload.read() if upload else request.body
+    if not frame_bytes:
+        return JsonResponse({'error': 'No image received'}, status=400)
+
+    try:
+        frame_rgb = decode_image_bytes(frame_bytes, DECODE_MIN_SIDE)
+    except FrameDecodeError as e:
+        SIGN_ERRORS.labels(source='http', reason='decode').inc()
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        stream_id = _stream_id(request)
+        return _sign_response(frame_rgb, stream_id, *_room_target(request, stream_id=stream_id))
+    except Exception as e:
+        SIGN_ERRORS.labels(source='http', reason='exception').inc()
+        logger.exception("error during sign prediction")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+def detect_sign_stats(request):
+    """GET /detect_sign/stats/ - batching configuration and counters."""
+    classifier_scheduler = registry.peek('sign_classifier')
+    inference_client = registry.peek('inference_service')
+    if not classifier_scheduler and not inference_client:
+        return JsonResponse({'error': 'Models not loaded on server'}, status=500)
+    landmark_classifier = registry.peek('landmark_classifier')
+    recognizer = registry.peek('sign_recognizer')
+    return JsonResponse({
+        'batching': classifier_scheduler.stats() if classifier_scheduler else None,
+        'inference_service': inference_client.stats() if inference_client else None,
+        'decode': decode_stats(),
+        'hand_trackers': hand_trackers.stats(),
+        'landmark_fast_path': landmark_classifier.stats() if landmark_classifier else None,
+        'sign_decoders': sign_decoders.stats(),
+        'frame_gate': frame_gate_stats.stats(),
+        'pipeline': recognizer.stats() if recognizer else None,
+        'rooms': room_broadcaster.stats(),
+    })
+
+
+def healthz_ready(request):
+    """
+    GET /healthz/ready - 200 once every model in settings.SIGN_READY_MODELS is
+    loaded and warmed (or every inference worker reports so), else 503. Never
+    triggers a load itself; the body lists each registered model's state and
+    load / warm-up latency.
+    """
+    ready, required = readiness()
+    return JsonResponse(
+        {'ready': ready, 'required': required, 'models': registry.status()},
+        status=200 if ready else 503,
+    )
 
-        try:
-            # --- Decode image from Base64 ---
-            _, imgstr = image_data.split(';base64,')
-            img_bytes = base64.b64decode(imgstr)
-            # original_pil_image is the 224x224 image from the canvas
-            original_pil_image = Image.open(io.BytesIO(img_bytes)).convert('RGB')
-            
-            # Convert PIL image to NumPy array for MediaPipe
-            # MediaPipe expects RGB images, which .convert('RGB') provides
-            frame_rgb = np.array(original_pil_image)
-
-            # --- STEP 1: DETECT HAND ---
-            results = hand_detector.process(frame_rgb)
-
-            # If no hands are found, return a specific response
-            if not results.multi_hand_landmarks:
-                return JsonResponse({'label': 'No Hand', 'confidence': 0})
-
-            # --- Hand IS found, calculate bounding box ---
-            hand_landmarks = results.multi_hand_landmarks[0]
-            
-            # Get image dimensions
-            img_height, img_width, _ = frame_rgb.shape
-
-            # Find min/max x and y coordinates from landmarks
-            x_coords = [landmark.x * img_width for landmark in hand_landmarks.landmark]
-            y_coords = [landmark.y * img_height for landmark in hand_landmarks.landmark]
-            
-            x_min = int(min(x_coords))
-            x_max = int(max(x_coords))
-            y_min = int(min(y_coords))
-            y_max = int(max(y_coords))
-
-            # Add padding to the bounding box (e.g., 20 pixels)
-            padding = 20
-            x_min = max(0, x_min - padding)
-            y_min = max(0, y_min - padding)
-            x_max = min(img_width, x_max + padding)
-            y_max = min(img_height, y_max + padding)
-
-            # --- Crop the *original PIL image* to the bounding box ---
-            cropped_hand_img = original_pil_image.crop((x_min, y_min, x_max, y_max))
-            
-            # --- "Squarify" the cropped hand image ---
-            square_hand_img = squarify_image(cropped_hand_img)
-
-            # --- STEP 2: CLASSIFY SIGN ---
-            
-            # Resize this new *square hand image* to what the classifier expects
-            image_to_predict = square_hand_img.resize((224, 224))
-            
-            # Preprocess for Keras model
-            img_array = img_to_array(image_to_predict)
-            img_array = np.expand_dims(img_array / 255.0, axis=0) # (1, 224, 224, 3)
-
-            # Predict
-            preds = classifier_model.predict(img_array)
-            class_index = np.argmax(preds[0])
-            confidence = float(np.max(preds[0]))
-            predicted_label = CLASS_NAMES[class_index]
-
-            return JsonResponse({
-                'label': predicted_label,
-                'confidence': round(confidence * 100, 2)
-            })
-        
-        except Exception as e:
-            import traceback
-            print(f"Error during prediction: {e}")
-            traceback.print_exc()
-            return JsonResponse({'error': str(e)}, status=500)
 
-    return JsonResponse({'error': 'Invalid request'}, status=400)
\ No newline at end of file
+def metrics_view(request):
+    """GET /metrics - Prometheus text exposition of conferencing.metrics."""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,18 @@
+# signmeet/ml_models/asl_detection/architectures.py
+import os
+
+WLASL_NUM_CLASSES = 29
+
+
+def build_mobilenet_v2(weights_path, num_classes=WLASL_NUM_CLASSES):
+    """Eager MobileNetV2 with the ASL head, loaded from the training .pth."""
+    import torch
+    import torch.nn as nn
+    import torchvision.models as models
+
+    net = models.mobilenet_v2(pretrained=False)
+    net.classifier[1] = nn.Linear(net.classifier[1].in_features, num_classes)
+    if not os.path.exists(weights_path):
+        raise FileNotFoundError(f"Model file not found at {weights_path}")
+    net.load_state_dict(torch.load(weights_path, map_location=torch.device('cpu')))
+    return net.eval()
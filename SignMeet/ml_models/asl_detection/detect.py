@@ -1,9 +1,9 @@
 # signmeet/ml_models/asl_detection/detect.py
+import logging
 import os
 import sys
 import cv2
 import numpy as np
-import tensorflow as tf
 
 # Suppress TensorFlow warnings
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
@@ -12,62 +12,70 @@ os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '../../..'))  # Adjust to SignMeet root
 sys.path.append(project_root)
-from ml_models.asl_detection.utils import preprocess_frame
+from ml_models.engines import configured_engine
+from ml_models.pipeline import SignRecognizer, Top1
+from ml_models.preprocessing import to_unit_float
 
-# Path to your trained model
+# Path to your trained model (backend from settings.SIGN_MODEL_ENGINES['asl_digits'])
 MODEL_PATH = os.path.join(project_root, 'signmeet/ml_models/asl_detection/asl_model2.h5')
+logger = logging.getLogger(__name__)
+
 try:
-    model = tf.keras.models.load_model(MODEL_PATH)
-    print("Model loaded successfully from", MODEL_PATH)
+    model = configured_engine('asl_digits', {'backend': 'keras', 'path': MODEL_PATH})
+    logger.info("model loaded engine=%r", model)
 except Exception as e:
-    print(f"Failed to load model: {e}")
+    logger.error("failed to load model error=%s", e)
     model = None
 
 # Classes for ASL digits and letters
 ASL_CLASSES = ['1', '2', '3', '4', '5', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z']
 
+def _decode(bytes_data):
+    frame = cv2.imdecode(np.frombuffer(bytes_data, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError(f"Failed to decode image. Byte data length: {len(bytes_data)}")
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+def _preprocess(frame_rgb):
+    # 64x64 RGB in [0, 1], as in utils.preprocess_frame
+    return to_unit_float(cv2.resize(frame_rgb, (64, 64)))
+
+# Shared pipeline (ml_models/pipeline.py): decode -> 64x64 -> Keras classifier
+recognizer = None
+if model is not None:
+    recognizer = SignRecognizer(
+        decode=_decode,
+        preprocess=_preprocess,
+        classify=model.predict_batch,
+        postprocess=Top1(ASL_CLASSES),
+        name='asl_digits',
+    )
+
 def detect_signs(frame):
-    if model is None:
-        print("Model not loaded. Returning '[None]'")
+    """Classify a BGR frame (as read by cv2.imread)."""
+    if recognizer is None:
+        logger.warning("model not loaded, returning '[None]'")
         return "[None]"
 
     try:
-        processed_frame = preprocess_frame(frame)
-        processed_frame = np.expand_dims(processed_frame, axis=0)
-        predictions = model.predict(processed_frame, verbose=0)
-        predicted_class_idx = np.argmax(predictions[0])
-        if 0 <= predicted_class_idx < len(ASL_CLASSES):
-            translation = ASL_CLASSES[predicted_class_idx]
-        else:
-            translation = "[Unknown]"
-        print(f"Predicted class index: {predicted_class_idx}, Translation: {translation}")
+        translation = recognizer.recognize(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))['label']
+        logger.debug("translation=%s", translation)
         return translation
     except Exception as e:
-        print(f"Error during detection: {e}")
+        logger.exception("error during detection")
         return "[Error]"
 
 def detect_signs_from_bytes(bytes_data):
-    if model is None:
+    if recognizer is None:
         return "[None]"
-    
+    if len(bytes_data) == 0:
+        logger.warning("empty byte data received")
+        return "[Error]"
+
     try:
-        # Convert bytes to NumPy array
-        nparr = np.frombuffer(bytes_data, np.uint8)
-        if len(nparr) == 0:
-            print("Empty byte data received")
-            return "[Error]"
-        
-        # Decode the image
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if frame is None:
-            print(f"Failed to decode image. Byte data length: {len(bytes_data)}")
-            return "[Error]"
-        
-        # Debug: Check frame shape
-        print(f"Decoded frame shape: {frame.shape}")
-        return detect_signs(frame)
+        return recognizer.recognize(bytes_data)['label']
     except Exception as e:
-        print(f"Error during byte decoding: {e}")
+        logger.exception("error during detection")
         return "[Error]"
 
 if __name__ == "__main__":
@@ -1,79 +1,77 @@
+import logging
 import os
 import sys
-import torch
-import torch.nn as nn
-import torchvision.models as models
 import numpy as np
 import cv2
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(script_dir)
+# SignMeet root, for the shared ml_models.preprocessing module
+sys.path.append(os.path.abspath(os.path.join(script_dir, '../..')))
 
-# Load MobileNetV2
-model = models.mobilenet_v2(pretrained=False)
-num_classes = 29
-model.classifier[1] = nn.Linear(model.classifier[1].in_features, num_classes)
-model.eval()
+from ml_models.preprocessing import imagenet_chw
+from ml_models.engines import TorchModuleEngine, engine_config, load_engine
+from ml_models.pipeline import SignRecognizer, Top1, raw_frame_decoder
+from ml_models.asl_detection.architectures import WLASL_NUM_CLASSES, build_mobilenet_v2
 
 MODEL_PATH = os.path.join(script_dir, 'mobilenetv2_asl_trained_improved.pth')
-if os.path.exists(MODEL_PATH):
-    model.load_state_dict(torch.load(MODEL_PATH, map_location=torch.device('cpu')))
-    print(f"MobileNetV2 ASL model loaded from {MODEL_PATH}")
-    
+num_classes = WLASL_NUM_CLASSES
+
+# Backend comes from settings.SIGN_MODEL_ENGINES['wlasl'] ('pytorch' = eager .pth,
+# or an exported 'torchscript' / 'onnx' / 'tflite' artifact, see export_models)
+ENGINE_CONFIG = engine_config('wlasl', {'backend': 'pytorch', 'path': MODEL_PATH})
+if ENGINE_CONFIG['backend'] == 'pytorch':
+    # Load MobileNetV2
+    model = build_mobilenet_v2(ENGINE_CONFIG.get('path', MODEL_PATH))
+    engine = TorchModuleEngine(model, path=ENGINE_CONFIG.get('path', MODEL_PATH))
 else:
-    raise FileNotFoundError(f"Model file not found at {MODEL_PATH}")
+    model = None
+    engine = load_engine(**ENGINE_CONFIG)
+logger = logging.getLogger(__name__)
+logger.info("MobileNetV2 ASL model loaded engine=%r", engine)
 
 # ASL Alphabet classes
 ASL_CLASSES = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 
                'N', 'O', 'P', 'Q', 'R', 'S', 'T', 'U', 'V', 'W', 'X', 'Y', 'Z', 
                'nothing', 'space']
 
-def preprocess_frame(frame):
-    print(f"Input frame shape: {frame.shape}")
-    # Match dataset resolution and preprocessing
-    frame_resized = cv2.resize(frame, (224, 224), interpolation=cv2.INTER_AREA)
-    print(f"Resized frame shape: {frame_resized.shape}")
-    # Exact normalization as training (ImageNet stats)
-    mean = np.array([0.485, 0.456, 0.406])
-    std = np.array([0.229, 0.224, 0.225])
-    frame_normalized = (frame_resized.astype(np.float32) / 255.0 - mean) / std
-    print(f"Normalized frame shape: {frame_normalized.shape}")
-    frame_tensor = torch.from_numpy(frame_normalized).permute(2, 0, 1).unsqueeze(0).to(torch.float32)
-    print(f"Tensor shape before return: {frame_tensor.shape}")
-    return frame_tensor
+# decode -> ImageNet float32 CHW (dataset resolution and stats, into a reusable
+# buffer) -> MobileNetV2 -> softmax, through the shared pipeline in
+# ml_models/pipeline.py. No hand detector: the client sends the crop.
+recognizer = SignRecognizer(
+    decode=raw_frame_decoder((229, 229, 3)),
+    preprocess=lambda frame: imagenet_chw(frame, size=224),
+    classify=engine.predict_batch,
+    postprocess=Top1(ASL_CLASSES, threshold=0.6, below="Uncertain", softmax=True),
+    name='wlasl',
+)
 
 def detect_sign(frame):
     try:
-        with torch.no_grad():
-            input_tensor = preprocess_frame(frame)
-            print(f"Input tensor shape to model: {input_tensor.shape}")
-            output = model(input_tensor)
-            probabilities = torch.softmax(output, dim=1)
-            predicted_class_idx = torch.argmax(output, dim=1).item()
-            confidence = probabilities[0, predicted_class_idx].item()
-            translation = ASL_CLASSES[predicted_class_idx] if confidence > 0.6 else "Uncertain"
-            print(f"Predicted class index: {predicted_class_idx}, Translation: {translation}, Confidence: {confidence:.2f}, Output shape: {output.shape}")
-            return translation
+        return recognizer.recognize(frame)['label']
     except Exception as e:
-        print(f"Error during detection: {e}")
+        logger.exception("error during detection")
         return "[Error]"
 
-def detect_signs_from_bytes(bytes_data):
+def detect_signs_from_bytes(bytes_data, gate=None):
+    """
+    Classify a raw 229x229x3 frame. `gate` is an optional per-stream
+    change detector (conferencing.gating.FrameChangeGate): unchanged frames
+    reuse the previous translation without running the model.
+    """
     try:
-        nparr = np.frombuffer(bytes_data, np.uint8)
-        print(f"Decoded array shape: {nparr.shape if nparr.shape else 'None (flat array)'}, Total bytes: {len(nparr)}")
-        expected_bytes = 229 * 229 * 3
-        if len(nparr) != expected_bytes:
-            print(f"Invalid data length: {len(nparr)}, expected {expected_bytes}")
-            return "[Error]"
-
-        frame = nparr.reshape(229, 229, 3)
-        print(f"Reshaped frame shape: {frame.shape}")
-        return detect_sign(frame)
+        frame = recognizer.decode(bytes_data)
     except Exception as e:
-        print(f"Error during byte processing: {e}")
+        logger.warning("invalid frame error=%s", e)
         return "[Error]"
 
+    if gate is None:
+        return detect_sign(frame)
+    translation, _ = gate.run(frame, detect_sign)
+    if translation == "[Error]":
+        gate.reset()
+    return translation
+
 if __name__ == "__main__":
     test_image_path = os.path.join(os.path.dirname(__file__), 'test_image.jpg')
     test_frame = cv2.imread(test_image_path)
@@ -0,0 +1,200 @@
+# SignMeet/ml_models/engines.py
+"""
+Inference engine backends behind one interface:
+
+    engine = load_engine('onnx', 'ml_models/best_sign_model.onnx')
+    probs = engine.predict_batch(batch)   # np.ndarray in, np.ndarray out
+
+Every runtime is imported lazily, so only the selected backend has to be
+installed. Per-model backends are configured in settings.SIGN_MODEL_ENGINES
+and resolved with `configured_engine(name, default)`.
+"""
+import os
+import threading
+
+import numpy as np
+
+
+class InferenceEngine:
+    """Base class: `predict_batch` takes and returns a batch-first np.ndarray."""
+
+    backend = None
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def predict_batch(self, batch):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.path or ''}>"
+
+
+class KerasEngine(InferenceEngine):
+    """.h5 / .keras model through Keras `predict_on_batch`."""
+
+    backend = 'keras'
+
+    def __init__(self, path, **options):
+        super().__init__(path)
+        from tensorflow.keras.models import load_model
+        self.model = load_model(path, compile=False)
+
+    def predict_batch(self, batch):
+        return np.asarray(self.model.predict_on_batch(batch))
+
+
+class SavedModelEngine(InferenceEngine):
+    """TensorFlow SavedModel directory, calling its serving signature directly."""
+
+    backend = 'savedmodel'
+
+    def __init__(self, path, signature='serving_default', **options):
+        super().__init__(path)
+        import tensorflow as tf
+        self._tf = tf
+        self.model = tf.saved_model.load(path)
+        self.fn = self.model.signatures[signature]
+        self.input_name = next(iter(self.fn.structured_input_signature[1]))
+
+    def predict_batch(self, batch):
+        outputs = self.fn(**{self.input_name: self._tf.constant(batch, dtype=self._tf.float32)})
+        return next(iter(outputs.values())).numpy()
+
+
+class TFLiteEngine(InferenceEngine):
+    """
+    .tflite flatbuffer. Float models use the default XNNPACK delegate;
+    INT8 models are (de)quantized here using the tensors' scale/zero point.
+    The interpreter is not thread-safe, so calls are serialized.
+    """
+
+    backend = 'tflite'
+
+    def __init__(self, path, num_threads=None, **options):
+        super().__init__(path)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads or os.cpu_count())
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch = int(self.input['shape'][0])
+        self._lock = threading.Lock()
+
+    def predict_batch(self, batch):
+        with self._lock:
+            return self._invoke(batch)
+
+    def _invoke(self, batch):
+        if batch.shape[0] != self._batch:
+            self.interpreter.resize_tensor_input(self.input['index'], batch.shape)
+            self.interpreter.allocate_tensors()
+            self.input = self.interpreter.get_input_details()[0]
+            self.output = self.interpreter.get_output_details()[0]
+            self._batch = batch.shape[0]
+
+        scale, zero_point = self.input['quantization']
+        if scale:
+            info = np.iinfo(self.input['dtype'])
+            batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max)
+        self.interpreter.set_tensor(self.input['index'], batch.astype(self.input['dtype'], copy=False))
+        self.interpreter.invoke()
+
+        result = self.interpreter.get_tensor(self.output['index'])
+        scale, zero_point = self.output['quantization']
+        if scale:
+            result = (result.astype(np.float32) - zero_point) * scale
+        return result
+
+
+class OnnxEngine(InferenceEngine):
+    """.onnx model on ONNX Runtime's CPU execution provider."""
+
+    backend = 'onnx'
+
+    def __init__(self, path, num_threads=None, **options):
+        super().__init__(path)
+        import onnxruntime as ort
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, session_options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_batch(self, batch):
+        return self.session.run(None, {self.input_name: batch.astype(np.float32, copy=False)})[0]
+
+
+class TorchScriptEngine(InferenceEngine):
+    """TorchScript archive (`torch.jit.save`) run under `torch.inference_mode`."""
+
+    backend = 'torchscript'
+
+    def __init__(self, path, num_threads=None, **options):
+        super().__init__(path)
+        import torch
+        self._torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.model = torch.jit.load(path, map_location='cpu').eval()
+
+    def predict_batch(self, batch):
+        with self._torch.inference_mode():
+            return self.model(self._torch.from_numpy(np.ascontiguousarray(batch, dtype=np.float32))).numpy()
+
+
+class TorchModuleEngine(InferenceEngine):
+    """Wraps an already-built eager `torch.nn.Module` (the legacy .pth path)."""
+
+    backend = 'pytorch'
+
+    def __init__(self, module, path=None):
+        super().__init__(path)
+        import torch
+        self._torch = torch
+        self.model = module.eval()
+
+    def predict_batch(self, batch):
+        with self._torch.inference_mode():
+            return self.model(self._torch.from_numpy(np.ascontiguousarray(batch, dtype=np.float32))).numpy()
+
+
+BACKENDS = {
+    'keras': KerasEngine,
+    'savedmodel': SavedModelEngine,
+    'tflite': TFLiteEngine,
+    'onnx': OnnxEngine,
+    'torchscript': TorchScriptEngine,
+}
+
+
+def load_engine(backend, path, **options):
+    """Build the engine for `backend` ('keras', 'savedmodel', 'tflite', 'onnx', 'torchscript')."""
+    try:
+        engine_cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown inference backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    return engine_cls(path, **options)
+
+
+def engine_config(name, default):
+    """settings.SIGN_MODEL_ENGINES[name] when Django is configured, else `default`."""
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return dict(getattr(settings, 'SIGN_MODEL_ENGINES', {}).get(name) or default)
+    except ImportError:
+        pass
+    return dict(default)
+
+
+def configured_engine(name, default):
+    """Load the engine configured for model `name` (see engine_config)."""
+    return load_engine(**engine_config(name, default))
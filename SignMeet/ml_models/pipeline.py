@@ -0,0 +1,191 @@
+# SignMeet/ml_models/pipeline.py
+"""
+One sign-recognition pipeline for every model in the project:
+
+    decode -> hand detect -> (fast path) -> crop -> preprocess -> classify -> postprocess
+
+Each stage is a plain callable passed to SignRecognizer, so a model swaps a
+stage instead of re-implementing the whole path:
+
+    decode(data) -> uint8 RGB frame            (skipped for np.ndarray input)
+    detect_hand(frame, stream_id) -> (21, 3) landmarks, or None for "no hand"
+    fast_path(points) -> result dict, or None to continue to the classifier
+    crop(frame, points) -> uint8 image          (whole frame when no detector)
+    preprocess(image) -> float32 sample         (no batch axis)
+    classify(batch) -> (N, classes) scores
+    postprocess(scores, result) -> result dict with 'label' and 'confidence'
+
+Optional stages may be None. `recognize_batch(frames)` runs the per-frame
+stages frame by frame and the classifier once on the stacked batch.
+`observer(name, stage, seconds)`, if set, receives every stage timing
+(conferencing feeds it into its /metrics histograms).
+"""
+import threading
+import time
+
+import numpy as np
+
+from ml_models.preprocessing import crop_square_resize, landmark_bbox
+
+STAGES = ('decode', 'detect_hand', 'fast_path', 'crop', 'preprocess', 'classify', 'postprocess')
+
+NO_HAND = 'No Hand'
+
+
+class SignRecognizer:
+    def __init__(self, preprocess, classify, postprocess, decode=None, detect_hand=None,
+                 fast_path=None, crop=None, name='sign', observer=None):
+        self.decode = decode
+        self.detect_hand = detect_hand
+        self.fast_path = fast_path
+        self.crop = crop
+        self.preprocess = preprocess
+        self.classify = classify
+        self.postprocess = postprocess
+        self.name = name
+        self.observer = observer
+
+        self._stats_lock = threading.Lock()
+        self._stage_calls = dict.fromkeys(STAGES, 0)
+        self._stage_seconds = dict.fromkeys(STAGES, 0.0)
+
+    def _timed(self, stage, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._stage_calls[stage] += 1
+                self._stage_seconds[stage] += elapsed
+            if self.observer is not None:
+                self.observer(self.name, stage, elapsed)
+
+    # --- Per-frame stages (everything before the classifier) ---
+    def _prepare(self, data, stream_id):
+        """Returns (result, None) when done early, or (partial result, sample)."""
+        frame = data
+        if self.decode is not None and not isinstance(data, np.ndarray):
+            frame = self._timed('decode', self.decode, data)
+
+        points = None
+        if self.detect_hand is not None:
+            points = self._timed('detect_hand', self.detect_hand, frame, stream_id)
+            if points is None:
+                return {'label': NO_HAND, 'confidence': 0}, None
+
+            if self.fast_path is not None:
+                result = self._timed('fast_path', self.fast_path, points)
+                if result is not None:
+                    return result, None
+
+        image = frame
+        if self.crop is not None:
+            image = self._timed('crop', self.crop, frame, points)
+        sample = self._timed('preprocess', self.preprocess, image)
+        return {}, sample
+
+    # --- Public API ---
+    def recognize(self, data, stream_id=None):
+        """Run one frame (encoded bytes or a decoded RGB array) through every stage."""
+        result, sample = self._prepare(data, stream_id)
+        if sample is None:
+            return result
+        scores = self._timed('classify', self.classify, sample[np.newaxis])[0]
+        return self._timed('postprocess', self.postprocess, scores, result)
+
+    def recognize_batch(self, frames, stream_ids=None):
+        """
+        Recognize several frames with a single classify call. Returns one
+        result dict per frame, in order.
+        """
+        stream_ids = stream_ids or [None] * len(frames)
+        results = [None] * len(frames)
+        pending, batch = [], None
+        for i, (data, stream_id) in enumerate(zip(frames, stream_ids)):
+            result, sample = self._prepare(data, stream_id)
+            if sample is None:
+                results[i] = result
+                continue
+            if batch is None:
+                batch = np.empty((len(frames),) + sample.shape, dtype=sample.dtype)
+            # Copy now: preprocess reuses its output buffer on the next frame
+            batch[len(pending)] = sample
+            pending.append((i, result))
+
+        if pending:
+            scores = self._timed('classify', self.classify, batch[:len(pending)])
+            for (i, result), row in zip(pending, scores):
+                results[i] = self._timed('postprocess', self.postprocess, row, result)
+        return results
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'name': self.name,
+                'stages': {
+                    stage: {
+                        'calls': self._stage_calls[stage],
+                        'avg_ms': round(self._stage_seconds[stage] * 1000.0 / self._stage_calls[stage], 3)
+                        if self._stage_calls[stage] else 0.0,
+                    }
+                    for stage in STAGES
+                    if getattr(self, stage) is not None
+                },
+            }
+
+
+# --- Reusable stages ---
+def raw_frame_decoder(shape):
+    """decode stage for raw uint8 pixel buffers of a fixed shape (e.g. 229x229x3)."""
+    expected = int(np.prod(shape))
+
+    def decode(data):
+        frame = np.frombuffer(data, np.uint8)
+        if frame.size != expected:
+            raise ValueError(f"Invalid data length: {frame.size}, expected {expected}")
+        return frame.reshape(shape)
+
+    return decode
+
+
+class LandmarkCrop:
+    """crop stage: padded landmark bounding box, squared and resized."""
+
+    def __init__(self, size=224, padding=20):
+        self.size = size
+        self.padding = padding
+
+    def __call__(self, frame, points):
+        height, width = frame.shape[:2]
+        bbox = landmark_bbox(points, width, height, padding=self.padding)
+        return crop_square_resize(frame, bbox, size=self.size)
+
+
+class Top1:
+    """
+    postprocess stage: best class and its confidence in percent. With
+    `softmax=True` the scores are logits. Below `threshold` (0-1) the label
+    becomes `below`.
+    """
+
+    def __init__(self, classes, threshold=None, below='Unknown', softmax=False, **extra):
+        self.classes = list(classes)
+        self.threshold = threshold
+        self.below = below
+        self.softmax = softmax
+        self.extra = extra
+
+    def __call__(self, scores, result):
+        scores = np.asarray(scores, dtype=np.float32)
+        if self.softmax:
+            scores = np.exp(scores - scores.max())
+            scores /= scores.sum()
+        index = int(np.argmax(scores))
+        confidence = float(scores[index])
+        if self.threshold is not None and confidence < self.threshold:
+            label = self.below
+        else:
+            label = self.classes[index]
+        result.update(self.extra, label=label, confidence=round(confidence * 100, 2))
+        return result
@@ -0,0 +1,139 @@
+# SignMeet/ml_models/preprocessing.py
+"""
+Shared frame preprocessing for the sign classifiers.
+
+Everything works on uint8 RGB (or BGR) NumPy frames and writes into
+per-thread buffers that are reused across calls, so a returned array is only
+valid until the next call of the same function on the same thread. Copy it
+if it has to outlive the request.
+"""
+import threading
+
+import cv2
+import numpy as np
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# x_norm = x * scale + bias  ==  (x / 255 - mean) / std, folded once in float32
+_IMAGENET_SCALE = (1.0 / (255.0 * IMAGENET_STD)).astype(np.float32)
+_IMAGENET_BIAS = (-IMAGENET_MEAN / IMAGENET_STD).astype(np.float32)
+_INV_255 = np.float32(1.0 / 255.0)
+
+_local = threading.local()
+
+
+def _buffer(name, shape, dtype):
+    buffers = getattr(_local, 'buffers', None)
+    if buffers is None:
+        buffers = _local.buffers = {}
+    buf = buffers.get(name)
+    if buf is None or buf.shape != shape or buf.dtype != dtype:
+        buf = buffers[name] = np.empty(shape, dtype=dtype)
+    return buf
+
+
+def landmark_bbox(points, width, height, padding=20):
+    """
+    Pixel bounding box (x_min, y_min, x_max, y_max) around normalized
+    landmarks, padded and clipped to the frame. `points` is an (N, 2+) array
+    of MediaPipe x/y coordinates in [0, 1].
+    """
+    xy = np.asarray(points, dtype=np.float32)[:, :2] * np.array([width, height], dtype=np.float32)
+    x_min, y_min = xy.min(axis=0).astype(int)
+    x_max, y_max = xy.max(axis=0).astype(int)
+    return (
+        max(0, x_min - padding),
+        max(0, y_min - padding),
+        min(width, x_max + padding),
+        min(height, y_max + padding),
+    )
+
+
+def crop_square_resize(frame, bbox, size=224):
+    """
+    Crop `bbox` out of `frame`, pad it to a centred square with black bars
+    (same layout as the old PIL squarify_image) and resize to size x size.
+    The crop is a view; padding only happens when the box is not square.
+    Returns a uint8 (size, size, C) buffer.
+    """
+    x_min, y_min, x_max, y_max = bbox
+    crop = frame[y_min:y_max, x_min:x_max]
+    height, width = crop.shape[:2]
+    if height == 0 or width == 0:
+        raise ValueError(f"Empty crop for bounding box {bbox}")
+
+    if width != height:
+        side = max(width, height)
+        left = (side - width) // 2
+        top = (side - height) // 2
+        crop = cv2.copyMakeBorder(
+            crop, top, side - height - top, left, side - width - left,
+            cv2.BORDER_CONSTANT, value=0,
+        )
+
+    out = _buffer('square', (size, size) + crop.shape[2:], np.uint8)
+    interpolation = cv2.INTER_AREA if crop.shape[0] > size else cv2.INTER_LINEAR
+    cv2.resize(crop, (size, size), dst=out, interpolation=interpolation)
+    return out
+
+
+def to_unit_float(image):
+    """uint8 HWC image -> float32 HWC in [0, 1] (Keras classifier input)."""
+    out = _buffer('unit_float', image.shape, np.float32)
+    np.multiply(image, _INV_255, out=out)
+    return out
+
+
+def imagenet_chw(frame, size=224):
+    """
+    Resize a uint8 HWC frame and apply ImageNet mean/std in float32, written
+    channel-first into a reusable (3, size, size) buffer (PyTorch input).
+    """
+    if frame.shape[0] != size or frame.shape[1] != size:
+        resized = _buffer('imagenet_resized', (size, size, 3), np.uint8)
+        cv2.resize(frame, (size, size), dst=resized, interpolation=cv2.INTER_AREA)
+    else:
+        resized = frame
+    out = _buffer('imagenet_chw', (3, size, size), np.float32)
+    for c in range(3):
+        np.multiply(resized[:, :, c], _IMAGENET_SCALE[c], out=out[c])
+        out[c] += _IMAGENET_BIAS[c]
+    return out
+
+
+def reduced_decode_flag(width, height, min_side):
+    """
+    cv2.imdecode flag that lets libjpeg decode at 1/2, 1/4 or 1/8 scale while
+    keeping the shorter side at least `min_side` pixels.
+    """
+    shorter = min(width, height)
+    for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+        if shorter // factor >= min_side:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def jpeg_size(data):
+    """(width, height) from a JPEG's SOF header without decoding, or None."""
+    view = memoryview(data)
+    if len(view) < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return None
+    i = 2
+    while i + 9 < len(view):
+        if view[i] != 0xFF:
+            return None
+        marker = view[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        length = (view[i + 2] << 8) | view[i + 3]
+        # SOF0..SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = (view[i + 5] << 8) | view[i + 6]
+            width = (view[i + 7] << 8) | view[i + 8]
+            return width, height
+        i += 2 + length
+    return None